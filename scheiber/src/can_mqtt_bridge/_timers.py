@@ -0,0 +1,80 @@
+"""
+Shared background scheduler for short bridge timeouts.
+
+Entities need one-shot delayed callbacks (e.g. the retained-state probe
+timeout). Instead of starting a threading.Timer thread per entity, all
+callbacks run on a single daemon thread driven by sched.scheduler.
+"""
+
+import logging
+import sched
+import threading
+import time
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+_wakeup = threading.Event()
+_lock = threading.Lock()
+_thread: Optional[threading.Thread] = None
+
+
+def _delay(timeout: float) -> None:
+    """Sleep until the next event is due or a new event is scheduled."""
+    if _wakeup.wait(timeout):
+        _wakeup.clear()
+
+
+_scheduler = sched.scheduler(time.monotonic, _delay)
+
+
+def _run() -> None:
+    while True:
+        _scheduler.run()
+        _wakeup.wait()
+        _wakeup.clear()
+
+
+def _call(fn: Callable[..., Any], args: tuple) -> None:
+    try:
+        fn(*args)
+    except Exception as e:
+        logger.error(f"Error in scheduled callback {fn!r}: {e}", exc_info=True)
+
+
+def schedule(delay: float, fn: Callable[..., Any], *args: Any) -> sched.Event:
+    """
+    Run a callback on the shared scheduler thread after a delay.
+
+    Args:
+        delay: Delay in seconds
+        fn: Callback to run
+        *args: Arguments passed to the callback
+
+    Returns:
+        Scheduler event, usable with cancel()
+    """
+    global _thread
+
+    event = _scheduler.enter(delay, 0, _call, (fn, args))
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(
+                target=_run, name="mqtt-bridge-timers", daemon=True
+            )
+            _thread.start()
+    _wakeup.set()
+    return event
+
+
+def cancel(event: sched.Event) -> None:
+    """
+    Cancel a scheduled callback if it has not run yet.
+
+    Args:
+        event: Event returned by schedule()
+    """
+    try:
+        _scheduler.cancel(event)
+    except ValueError:
+        pass
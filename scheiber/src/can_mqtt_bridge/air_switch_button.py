@@ -9,12 +9,16 @@ topic carrying a JSON `{"event_type": "press"}` payload every time the
 physical button is pressed.
 """
 
-import json
 import logging
 
 import paho.mqtt.client as mqtt
 
 from .discovery_name import format_discovery_name
+from .entity_logging import entity_logger
+from .payloads import HA_DEVICE, encode_json
+from .topics import build_output_topics
+
+logger = logging.getLogger(__name__)
 
 
 class MQTTAirSwitchButton:
@@ -28,7 +32,7 @@ class MQTTAirSwitchButton:
         mqtt_client: mqtt.Client,
         mqtt_topic_prefix: str = "homeassistant",
     ):
-        self.logger = logging.getLogger(f"{__name__}.{hardware_button.entity_id}")
+        self.logger = entity_logger(logger, hardware_button.entity_id)
         self.hardware_button = hardware_button
         self.mqtt_client = mqtt_client
         self.mqtt_topic_prefix = mqtt_topic_prefix
@@ -40,17 +44,18 @@ class MQTTAirSwitchButton:
         self.entity_id = hardware_button.entity_id
         self.discovery_name = format_discovery_name(self.entity_id)
 
-        base_topic = (
-            f"{mqtt_topic_prefix}/scheiber/air_switch/"
-            f"{identity_slug}/btn{hardware_button.button_index}"
+        topics = build_output_topics(
+            mqtt_topic_prefix,
+            "event",
+            "air_switch",
+            identity_slug,
+            f"btn{hardware_button.button_index}",
+            self.entity_id,
         )
-        self.config_topic = f"{mqtt_topic_prefix}/event/{self.entity_id}/config"
-        self.state_topic = f"{base_topic}/state"
-        self.availability_topic = f"{base_topic}/availability"
-
-        hardware_button.subscribe(self._on_hardware_event)
+        self.config_topic = topics.config
+        self.state_topic = topics.state
+        self.availability_topic = topics.availability
 
-    def publish_discovery(self):
         discovery_config = {
             "name": self.discovery_name,
             "unique_id": self.unique_id,
@@ -58,20 +63,20 @@ class MQTTAirSwitchButton:
             "event_types": self.EVENT_TYPES,
             "device_class": "button",
             "availability_topic": self.availability_topic,
-            "device": {
-                "identifiers": ["scheiber_system"],
-                "name": "Scheiber",
-                "model": "Marine Lighting Control System",
-                "manufacturer": "Scheiber",
-            },
+            "device": HA_DEVICE,
         }
+        self._discovery_payload = encode_json(discovery_config)
+
+        hardware_button.subscribe(self._on_hardware_event)
+
+    def publish_discovery(self):
         self.mqtt_client.publish(
-            self.config_topic, json.dumps(discovery_config), retain=True, qos=1
+            self.config_topic, self._discovery_payload, retain=True, qos=1
         )
 
     def publish_availability(self, available: bool = True):
         payload = "online" if available else "offline"
-        self.mqtt_client.publish(self.availability_topic, payload, retain=True, qos=1)
+        self.mqtt_client.publish(self.availability_topic, payload, retain=True, qos=0)
 
     def subscribe_to_commands(self):
         """Air Switch buttons are incoming-only; there is no command topic."""
@@ -93,8 +98,8 @@ class MQTTAirSwitchButton:
             return
         self.mqtt_client.publish(
             self.state_topic,
-            json.dumps({"event_type": event_type}),
+            encode_json({"event_type": event_type}),
             retain=False,
             qos=1,
         )
-        self.logger.debug(f"Published {event_type} event")
+        self.logger.debug("Published %s event", event_type)
@@ -0,0 +1,87 @@
+"""
+Publish batching for the MQTT bridge.
+
+Startup publishes discovery, availability and initial state for every entity.
+Instead of interleaving those publishes with entity construction, the bridge
+records them and sends them back-to-back once all entities are set up.
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Optional, Tuple
+
+import paho.mqtt.client as mqtt
+
+
+class MqttBatcher:
+    """
+    MQTT client proxy that can hold back publishes and send them as one burst.
+
+    Entities use the batcher exactly like a paho client. While a batch is
+    open, publish calls are recorded; closing the batch replays them in order.
+    Batches may nest or overlap across threads; publishes are sent when the
+    outermost batch closes. All other client attributes are forwarded
+    unchanged.
+    """
+
+    def __init__(self, client: mqtt.Client):
+        """
+        Initialize the batcher.
+
+        Args:
+            client: MQTT client instance to forward to
+        """
+        self._client = client
+        self._lock = threading.Lock()
+        self._pending: Optional[List[Tuple[tuple, dict]]] = None
+        self._depth = 0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+    def publish(self, *args, **kwargs) -> Optional[mqtt.MQTTMessageInfo]:
+        """
+        Publish a message, or record it while a batch is open.
+
+        Returns:
+            MQTTMessageInfo when published directly, None when recorded
+        """
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((args, kwargs))
+                return None
+        return self._client.publish(*args, **kwargs)
+
+    @contextmanager
+    def batch(self) -> Iterator["MqttBatcher"]:
+        """Record publishes for the duration of the block, then flush them."""
+        with self._lock:
+            self._depth += 1
+            if self._pending is None:
+                self._pending = []
+        try:
+            yield self
+        finally:
+            pending = None
+            with self._lock:
+                self._depth -= 1
+                if self._depth == 0:
+                    pending, self._pending = self._pending, None
+            self._send(pending)
+
+    def flush(self) -> int:
+        """
+        Send all recorded publishes and stop recording.
+
+        Returns:
+            Number of messages published
+        """
+        with self._lock:
+            pending, self._pending = self._pending, None
+        return self._send(pending)
+
+    def _send(self, pending: Optional[List[Tuple[tuple, dict]]]) -> int:
+        """Publish recorded messages in order and return how many were sent."""
+        for args, kwargs in pending or ():
+            self._client.publish(*args, **kwargs)
+        return len(pending or ())
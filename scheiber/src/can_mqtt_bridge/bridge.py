@@ -4,12 +4,13 @@ MQTT Bridge implementation for Home Assistant integration.
 Bridges Scheiber CAN devices to Home Assistant via MQTT Discovery.
 """
 
-import json
 import logging
 
 # Add parent directory to path for scheiber module
 import sys
 import threading
+from collections import defaultdict
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -20,13 +21,20 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from scheiber import ScheiberSystem, create_scheiber_system
 
 from .air_switch_button import MQTTAirSwitchButton
+from .batch import MqttBatcher
 from .button import MQTTButton
 from .light import MQTTLight
 from .logical_entity import MQTTLogicalButton, MQTTLogicalLight, MQTTLogicalSwitch
+from .payloads import encode_json
 from .sensor import MQTTSensor
 from .switch import MQTTSwitch
 
 
+def _device_type(device) -> str:
+    """Return the interned device type ("bloc9", "bloc7", ...) of a device."""
+    return sys.intern(device.__class__.__name__.lower().replace("device", ""))
+
+
 class MQTTBridge:
     """
     MQTT Bridge for Home Assistant integration.
@@ -39,6 +47,11 @@ class MQTTBridge:
     - Clean shutdown
     """
 
+    # paho's default in-flight window, and the one used for publish bursts so
+    # QoS 1 discovery messages do not wait for PUBACKs in groups of 20
+    MAX_INFLIGHT_MESSAGES = 20
+    BURST_MAX_INFLIGHT_MESSAGES = 1000
+
     def __init__(
         self,
         can_interface: str,
@@ -69,8 +82,17 @@ class MQTTBridge:
         """
         self.logger = logging.getLogger(__name__)
         self.mqtt_topic_prefix = mqtt_topic_prefix
+        self.can_stats_topic = f"{mqtt_topic_prefix}/scheiber/can/stats/state"
+        # Home Assistant birth/last-will topic
+        self.ha_status_topic = f"{mqtt_topic_prefix}/status"
         self.read_only = read_only
         self._running = False
+        # Set once start() has built every entity; HA status messages arrive
+        # on the network thread and must not see a half-built entity list
+        self._entities_ready = False
+        # Nesting depth of _publish_burst, which may also run on that thread
+        self._burst_lock = threading.Lock()
+        self._burst_depth = 0
 
         # Create Scheiber system
         self.logger.info("Creating Scheiber system...")
@@ -99,8 +121,13 @@ class MQTTBridge:
             self.logger.error(f"Failed to connect to MQTT broker: {e}")
             raise
 
+        # Entities publish through the batcher so startup can send in one burst
+        self._publisher = MqttBatcher(self.mqtt_client)
+
         # Track MQTT entities (lights and switches)
         self._mqtt_entities: List[Any] = []
+        # Command topic -> entity, for O(1) message dispatch
+        self._command_entities: Dict[str, Any] = {}
 
     def start(self):
         """Start the bridge."""
@@ -111,10 +138,12 @@ class MQTTBridge:
         self.logger.info("Starting MQTT bridge...")
 
         devices = self.system.get_all_devices()
-        self._setup_bloc9_outputs(devices)
-        for device in devices:
-            self._setup_sensor_device(device)
-        self._setup_air_switch_buttons(devices)
+        with self._publish_burst():
+            self._setup_bloc9_outputs(devices)
+            for device in devices:
+                self._setup_sensor_device(device)
+            self._setup_air_switch_buttons(devices)
+        self._entities_ready = True
 
         # Subscribe to CAN statistics
         self.system.subscribe_to_stats(self._on_can_stats)
@@ -141,21 +170,41 @@ class MQTTBridge:
 
         self.logger.info("MQTT bridge stopped")
 
+    @contextmanager
+    def _publish_burst(self):
+        """Batch publishes and widen the in-flight window while they are sent."""
+        with self._burst_lock:
+            self._burst_depth += 1
+            if self._burst_depth == 1:
+                self.mqtt_client.max_inflight_messages_set(
+                    self.BURST_MAX_INFLIGHT_MESSAGES
+                )
+        try:
+            with self._publisher.batch():
+                yield
+        finally:
+            with self._burst_lock:
+                self._burst_depth -= 1
+                if self._burst_depth == 0:
+                    self.mqtt_client.max_inflight_messages_set(
+                        self.MAX_INFLIGHT_MESSAGES
+                    )
+
     def _setup_bloc9_outputs(self, devices):
         """Create MQTT entities for direct and logical Bloc9 outputs."""
-        light_entries: Dict[str, List[Dict[str, Any]]] = {}
-        switch_entries: Dict[str, List[Dict[str, Any]]] = {}
-        pulse_entries: Dict[str, List[Dict[str, Any]]] = {}
+        light_entries: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        switch_entries: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        pulse_entries: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
 
         for device in devices:
-            device_type = device.__class__.__name__.lower().replace("device", "")
+            device_type = _device_type(device)
             device_id = device.device_id
             segment_id = getattr(device, "segment_id", 0)
             if not isinstance(segment_id, int):
                 segment_id = 0
 
             for hardware_light in getattr(device, "get_lights", lambda: [])():
-                light_entries.setdefault(hardware_light.entity_id, []).append(
+                light_entries[hardware_light.entity_id].append(
                     {
                         "hardware": hardware_light,
                         "device_type": device_type,
@@ -165,7 +214,7 @@ class MQTTBridge:
                 )
 
             for hardware_switch in getattr(device, "get_switches", lambda: [])():
-                switch_entries.setdefault(hardware_switch.entity_id, []).append(
+                switch_entries[hardware_switch.entity_id].append(
                     {
                         "hardware": hardware_switch,
                         "device_type": device_type,
@@ -175,7 +224,7 @@ class MQTTBridge:
                 )
 
             for hardware_pulse in getattr(device, "get_pulses", lambda: [])():
-                pulse_entries.setdefault(hardware_pulse.entity_id, []).append(
+                pulse_entries[hardware_pulse.entity_id].append(
                     {
                         "hardware": hardware_pulse,
                         "device_type": device_type,
@@ -188,7 +237,7 @@ class MQTTBridge:
             if len(entries) > 1:
                 mqtt_light = MQTTLogicalLight(
                     hardware_lights=[entry["hardware"] for entry in entries],
-                    mqtt_client=self.mqtt_client,
+                    mqtt_client=self._publisher,
                     mqtt_topic_prefix=self.mqtt_topic_prefix,
                     read_only=self.read_only,
                 )
@@ -202,7 +251,7 @@ class MQTTBridge:
                     device_type=entry["device_type"],
                     device_id=entry["device_id"],
                     segment_id=entry["segment_id"],
-                    mqtt_client=self.mqtt_client,
+                    mqtt_client=self._publisher,
                     mqtt_topic_prefix=self.mqtt_topic_prefix,
                     read_only=self.read_only,
                 )
@@ -210,13 +259,13 @@ class MQTTBridge:
             mqtt_light.publish_availability(True)
             mqtt_light.subscribe_to_commands()
             mqtt_light.publish_initial_state()
-            self._mqtt_entities.append(mqtt_light)
+            self._register_entity(mqtt_light)
 
         for entity_id, entries in switch_entries.items():
             if len(entries) > 1:
                 mqtt_switch = MQTTLogicalSwitch(
                     hardware_switches=[entry["hardware"] for entry in entries],
-                    mqtt_client=self.mqtt_client,
+                    mqtt_client=self._publisher,
                     mqtt_topic_prefix=self.mqtt_topic_prefix,
                     read_only=self.read_only,
                 )
@@ -230,7 +279,7 @@ class MQTTBridge:
                     device_type=entry["device_type"],
                     device_id=entry["device_id"],
                     segment_id=entry["segment_id"],
-                    mqtt_client=self.mqtt_client,
+                    mqtt_client=self._publisher,
                     mqtt_topic_prefix=self.mqtt_topic_prefix,
                     read_only=self.read_only,
                 )
@@ -238,13 +287,13 @@ class MQTTBridge:
             mqtt_switch.publish_availability(True)
             mqtt_switch.subscribe_to_commands()
             mqtt_switch.publish_initial_state()
-            self._mqtt_entities.append(mqtt_switch)
+            self._register_entity(mqtt_switch)
 
         for entity_id, entries in pulse_entries.items():
             if len(entries) > 1:
                 mqtt_button = MQTTLogicalButton(
                     hardware_pulses=[entry["hardware"] for entry in entries],
-                    mqtt_client=self.mqtt_client,
+                    mqtt_client=self._publisher,
                     mqtt_topic_prefix=self.mqtt_topic_prefix,
                     read_only=self.read_only,
                 )
@@ -258,7 +307,7 @@ class MQTTBridge:
                     device_type=entry["device_type"],
                     device_id=entry["device_id"],
                     segment_id=entry["segment_id"],
-                    mqtt_client=self.mqtt_client,
+                    mqtt_client=self._publisher,
                     mqtt_topic_prefix=self.mqtt_topic_prefix,
                     read_only=self.read_only,
                 )
@@ -266,11 +315,18 @@ class MQTTBridge:
             mqtt_button.publish_availability(True)
             mqtt_button.subscribe_to_commands()
             mqtt_button.publish_initial_state()
-            self._mqtt_entities.append(mqtt_button)
+            self._register_entity(mqtt_button)
+
+    def _register_entity(self, entity):
+        """Track an MQTT entity and index it by its command topic."""
+        self._mqtt_entities.append(entity)
+        command_topic = getattr(entity, "command_topic", None)
+        if command_topic:
+            self._command_entities[command_topic] = entity
 
     def _setup_sensor_device(self, device):
         """Setup MQTT sensors for a single device."""
-        device_type = device.__class__.__name__.lower().replace("device", "")
+        device_type = _device_type(device)
         device_id = device.device_id
         segment_id = getattr(device, "segment_id", 0)
         if not isinstance(segment_id, int):
@@ -290,14 +346,14 @@ class MQTTBridge:
                 device_type=device_type,
                 device_id=device_id,
                 segment_id=segment_id,
-                mqtt_client=self.mqtt_client,
+                mqtt_client=self._publisher,
                 mqtt_topic_prefix=self.mqtt_topic_prefix,
             )
             mqtt_sensor.publish_discovery()
             mqtt_sensor.publish_availability(True)
             mqtt_sensor.subscribe_to_updates()
             mqtt_sensor.publish_state()
-            self._mqtt_entities.append(mqtt_sensor)
+            self._register_entity(mqtt_sensor)
 
     def _setup_air_switch_buttons(self, devices):
         """Create MQTT event entities for configured wireless Air Switch buttons."""
@@ -307,12 +363,12 @@ class MQTTBridge:
             )():
                 mqtt_button = MQTTAirSwitchButton(
                     hardware_button=hardware_button,
-                    mqtt_client=self.mqtt_client,
+                    mqtt_client=self._publisher,
                     mqtt_topic_prefix=self.mqtt_topic_prefix,
                 )
                 mqtt_button.publish_discovery()
                 mqtt_button.publish_availability(True)
-                self._mqtt_entities.append(mqtt_button)
+                self._register_entity(mqtt_button)
                 self.logger.info(
                     f"Setting up MQTT Air Switch button {hardware_button.entity_id}"
                 )
@@ -322,13 +378,40 @@ class MQTTBridge:
         if rc == 0:
             self.logger.info("Connected to MQTT broker")
 
-            # Resubscribe to all command topics if reconnecting
-            for entity in self._mqtt_entities:
-                entity.subscribe_to_commands()
-                self.logger.debug(f"Resubscribed to {entity.unique_id}")
+            # Republish discovery whenever Home Assistant comes back online
+            client.message_callback_add(self.ha_status_topic, self._on_ha_status)
+            client.subscribe(self.ha_status_topic)
+
+            # Resubscribe to all command topics if reconnecting, in a single
+            # SUBSCRIBE packet rather than one round trip per entity
+            if self._command_entities:
+                client.subscribe([(topic, 0) for topic in self._command_entities])
+                self.logger.debug(
+                    f"Resubscribed to {len(self._command_entities)} command topics"
+                )
         else:
             self.logger.error(f"Failed to connect to MQTT broker: {rc}")
 
+    def _on_ha_status(self, client, userdata, msg):
+        """
+        Handle Home Assistant status (birth) messages.
+
+        Args:
+            client: MQTT client
+            userdata: User data
+            msg: MQTT message
+        """
+        if msg.payload.strip() == b"online" and self._running and self._entities_ready:
+            self.logger.info("Home Assistant is online, republishing discovery")
+            self.republish_all_discovery()
+
+    def republish_all_discovery(self):
+        """Republish discovery and availability of all entities in one burst."""
+        with self._publish_burst():
+            for entity in self._mqtt_entities:
+                entity.publish_discovery()
+                entity.publish_availability(True)
+
     def _on_mqtt_message(self, client, userdata, msg):
         """
         Handle incoming MQTT messages (commands from Home Assistant).
@@ -339,21 +422,20 @@ class MQTTBridge:
             msg: MQTT message
         """
         topic = msg.topic
-        payload = msg.payload.decode("utf-8")
-        is_retained = msg.retain
-        timestamp = msg.timestamp
 
-        self.logger.debug(f"MQTT message: {topic} = {payload} (retained={is_retained})")
+        # Find the entity that handles this topic before touching the payload
+        entity = self._command_entities.get(topic)
+        if entity is None:
+            self.logger.warning("No entity found for topic: %s", topic)
+            return
 
-        # Find the entity that handles this topic
-        for entity in self._mqtt_entities:
-            if entity.matches_topic(topic):
-                entity.handle_command(
-                    payload, is_retained=is_retained, timestamp=timestamp
-                )
-                return
+        payload = msg.payload.decode("utf-8")
+        is_retained = msg.retain
+        self.logger.debug(
+            "MQTT message: %s = %s (retained=%s)", topic, payload, is_retained
+        )
 
-        self.logger.warning(f"No entity found for topic: {topic}")
+        entity.handle_command(payload, is_retained=is_retained)
 
     def _on_can_stats(self, stats: Dict[str, Any]):
         """
@@ -363,15 +445,15 @@ class MQTTBridge:
             stats: Statistics dictionary
         """
         self.logger.debug(
-            f"CAN Stats: {stats['messages_received']} rx, "
-            f"{stats['messages_sent']} tx, "
-            f"{stats['unique_ids']} unique IDs"
+            "CAN Stats: %s rx, %s tx, %s unique IDs",
+            stats["messages_received"],
+            stats["messages_sent"],
+            stats["unique_ids"],
         )
 
         # Publish stats to MQTT
         try:
-            topic = f"{self.mqtt_topic_prefix}/scheiber/can/stats/state"
-            payload = json.dumps(stats)
-            self.mqtt_client.publish(topic, payload, retain=False)
+            payload = encode_json(stats)
+            self.mqtt_client.publish(self.can_stats_topic, payload, retain=False)
         except Exception as e:
             self.logger.error(f"Failed to publish CAN stats to MQTT: {e}")
@@ -2,14 +2,16 @@
 Button entity for momentary Bloc9 pulse outputs.
 """
 
-import json
 import logging
-import time
-from typing import Optional
 
 import paho.mqtt.client as mqtt
 
 from .discovery_name import format_discovery_name
+from .entity_logging import entity_logger
+from .payloads import HA_DEVICE, encode_json
+from .topics import build_output_topics
+
+logger = logging.getLogger(__name__)
 
 
 class MQTTButton:
@@ -25,7 +27,7 @@ class MQTTButton:
         mqtt_topic_prefix: str = "homeassistant",
         read_only: bool = False,
     ):
-        self.logger = logging.getLogger(f"{__name__}.{hardware_pulse.entity_id}")
+        self.logger = entity_logger(logger, hardware_pulse.entity_id)
         self.hardware_pulse = hardware_pulse
         self.device_type = device_type
         self.device_id = device_id
@@ -41,34 +43,36 @@ class MQTTButton:
         self.unique_id = f"scheiber_{device_type}_{self.device_slug}_{self.switch_name}"
         self.entity_id = hardware_pulse.entity_id
         self.discovery_name = format_discovery_name(self.entity_id)
-        base_topic = (
-            f"{mqtt_topic_prefix}/scheiber/{device_type}/{self.device_slug}/{self.switch_name}"
+        topics = build_output_topics(
+            mqtt_topic_prefix,
+            "button",
+            device_type,
+            self.device_slug,
+            self.switch_name,
+            self.entity_id,
         )
-        self.config_topic = f"{mqtt_topic_prefix}/button/{self.entity_id}/config"
-        self.availability_topic = f"{base_topic}/availability"
-        self.command_topic = f"{base_topic}/set"
+        self.config_topic = topics.config
+        self.availability_topic = topics.availability
+        self.command_topic = topics.command
 
-    def publish_discovery(self):
         discovery_config = {
             "name": self.discovery_name,
             "unique_id": self.unique_id,
             "command_topic": self.command_topic,
             "payload_press": "PRESS",
             "availability_topic": self.availability_topic,
-            "device": {
-                "identifiers": ["scheiber_system"],
-                "name": "Scheiber",
-                "model": "Marine Lighting Control System",
-                "manufacturer": "Scheiber",
-            },
+            "device": HA_DEVICE,
         }
+        self._discovery_payload = encode_json(discovery_config)
+
+    def publish_discovery(self):
         self.mqtt_client.publish(
-            self.config_topic, json.dumps(discovery_config), retain=True, qos=1
+            self.config_topic, self._discovery_payload, retain=True, qos=1
         )
 
     def publish_availability(self, available: bool = True):
         payload = "online" if available else "offline"
-        self.mqtt_client.publish(self.availability_topic, payload, retain=True, qos=1)
+        self.mqtt_client.publish(self.availability_topic, payload, retain=True, qos=0)
 
     def subscribe_to_commands(self):
         self.mqtt_client.subscribe(self.command_topic)
@@ -76,25 +80,20 @@ class MQTTButton:
     def publish_initial_state(self):
         """Buttons are stateless and do not publish state."""
 
-    def handle_command(
-        self, payload: str, is_retained: bool = False, timestamp: Optional[float] = None
-    ):
+    def handle_command(self, payload: str, is_retained: bool = False):
         if self.read_only:
             self.logger.debug("Ignoring command (read-only mode)")
             return
 
-        if is_retained and timestamp is not None:
-            message_age = time.time() - timestamp
-            if message_age > 300:
-                self.mqtt_client.publish(self.command_topic, None, retain=True)
-                return
+        if is_retained:
+            # A retained command may be arbitrarily stale; clear it unexecuted
+            self.mqtt_client.publish(self.command_topic, None, retain=True)
+            return
 
         try:
             self.hardware_pulse.press()
-            if is_retained:
-                self.mqtt_client.publish(self.command_topic, None, retain=True)
         except Exception as exc:
             self.logger.error(f"Error handling button press: {exc}")
 
     def matches_topic(self, topic: str) -> bool:
-        return topic == self.command_topic
+        return topic is self.command_topic or topic == self.command_topic
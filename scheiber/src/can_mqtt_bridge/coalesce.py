@@ -0,0 +1,63 @@
+"""
+Coalescing of bursty state publishes.
+
+Some hardware (e.g. Bloc7 voltage and level sensors) reports a new value with
+almost every CAN frame. Home Assistant only needs the latest retained value, so
+updates are collected for a short window and only the last one per entity is
+published.
+"""
+
+import logging
+import threading
+from typing import Callable, Dict, Hashable
+
+from . import _timers
+
+logger = logging.getLogger(__name__)
+
+
+class PublishCoalescer:
+    """
+    Collect publish callbacks per key and run only the latest one per window.
+
+    A flush is scheduled on the shared timer thread when the first update of a
+    window arrives; all keys submitted before it runs are flushed together.
+    """
+
+    def __init__(self, interval: float = 0.05):
+        """
+        Initialize the coalescer.
+
+        Args:
+            interval: Coalescing window in seconds
+        """
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._pending: Dict[Hashable, Callable[[], None]] = {}
+        self._flush_scheduled = False
+
+    def submit(self, key: Hashable, publish: Callable[[], None]) -> None:
+        """
+        Schedule a publish, replacing any pending publish for the same key.
+
+        Args:
+            key: Identity of the entity being published
+            publish: Callback performing the publish
+        """
+        with self._lock:
+            self._pending[key] = publish
+            if not self._flush_scheduled:
+                self._flush_scheduled = True
+                _timers.schedule(self.interval, self.flush)
+
+    def flush(self) -> None:
+        """Run all pending publishes now."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._flush_scheduled = False
+
+        for publish in pending.values():
+            try:
+                publish()
+            except Exception as e:
+                logger.error(f"Error publishing coalesced state: {e}")
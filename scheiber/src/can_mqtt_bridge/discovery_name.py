@@ -2,10 +2,26 @@
 Helpers for Home Assistant MQTT discovery naming.
 """
 
-import re
+from functools import lru_cache
+
+# Hyphens separate words like underscores do
+_SEPARATOR_TABLE = str.maketrans("-", "_")
+
+# Only spaces are replaced, so existing unique IDs and topics stay unchanged
+_SLUG_TABLE = str.maketrans(" ", "_")
 
 
 def format_discovery_name(entity_id: str) -> str:
     """Convert an entity/topic slug into a human-readable discovery name."""
-    parts = [part for part in re.split(r"[_-]+", entity_id.strip()) if part]
+    parts = [
+        part
+        for part in entity_id.strip().translate(_SEPARATOR_TABLE).split("_")
+        if part
+    ]
     return " ".join(part.capitalize() for part in parts)
+
+
+@lru_cache(maxsize=None)
+def slugify_name(name: str) -> str:
+    """Convert a configured display name into its lowercase topic slug."""
+    return name.lower().translate(_SLUG_TABLE)
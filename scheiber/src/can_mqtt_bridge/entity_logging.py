@@ -0,0 +1,33 @@
+"""
+Per-entity logging for bridge entities.
+
+Entities share their module's logger instead of each registering its own
+``module.entity_id`` logger; the entity ID is prefixed to every message.
+"""
+
+import logging
+from typing import Any, MutableMapping, Tuple
+
+
+class EntityLoggerAdapter(logging.LoggerAdapter):
+    """Logger adapter that prefixes messages with ``[entity_id]``."""
+
+    def process(
+        self, msg: Any, kwargs: MutableMapping[str, Any]
+    ) -> Tuple[Any, MutableMapping[str, Any]]:
+        kwargs.setdefault("extra", self.extra)
+        return f"[{self.extra['entity']}] {msg}", kwargs
+
+
+def entity_logger(logger: logging.Logger, entity_id: str) -> EntityLoggerAdapter:
+    """
+    Create a logger for one entity on top of a shared module logger.
+
+    Args:
+        logger: Module logger the records are emitted through
+        entity_id: Entity ID prefixed to every message
+
+    Returns:
+        EntityLoggerAdapter for the entity
+    """
+    return EntityLoggerAdapter(logger, {"entity": entity_id})
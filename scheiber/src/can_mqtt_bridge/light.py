@@ -6,14 +6,104 @@ Handles MQTT discovery, state publishing, and command handling for lights.
 
 import json
 import logging
-import time
-from typing import Any, Callable, Dict, Optional
+import re
+import weakref
+from typing import Any, Callable, Dict, Optional, Tuple
 
 import paho.mqtt.client as mqtt
 from paho.mqtt.packettypes import PacketTypes
 from paho.mqtt.properties import Properties
 
+from . import _timers
 from .discovery_name import format_discovery_name
+from .entity_logging import entity_logger
+from .payloads import (
+    HA_DEVICE,
+    LIGHT_DISCOVERY_FEATURES,
+    STATE_NAMES,
+    encode_json,
+    parse_light_command,
+)
+from .topics import build_output_topics
+
+logger = logging.getLogger(__name__)
+
+# Retained state payloads are produced by _publish_state, so the two fields we
+# need can be read with byte-level searches instead of a full JSON parse.
+_STATE_RE = re.compile(rb'"state":\s*"(ON|OFF)"')
+_BRIGHTNESS_RE = re.compile(rb'"brightness":\s*(\d+)')
+
+
+def _parse_retained_state(payload: bytes) -> Tuple[bool, int]:
+    """
+    Extract on/off state and brightness from a retained JSON state payload.
+
+    Args:
+        payload: Raw retained payload as received from the broker
+
+    Returns:
+        Tuple of (is_on, brightness)
+    """
+    state_match = _STATE_RE.search(payload)
+    if state_match is None:
+        # Not in the format we publish, fall back to a real JSON parse
+        mqtt_state = json.loads(payload)
+        return mqtt_state.get("state") == "ON", mqtt_state.get("brightness", 0)
+
+    brightness_match = _BRIGHTNESS_RE.search(payload)
+    brightness = int(brightness_match.group(1)) if brightness_match else 0
+    return state_match.group(1) == b"ON", brightness
+
+
+def _weak_observer(
+    method: Callable[[Dict[str, Any]], None],
+) -> Callable[[Dict[str, Any]], None]:
+    """
+    Wrap a bound method as an observer callback that does not keep its owner alive.
+
+    Args:
+        method: Bound method to call on state changes
+
+    Returns:
+        Callback forwarding to the method while its owner still exists
+    """
+    method_ref = weakref.WeakMethod(method)
+
+    def observer(state: Dict[str, Any]):
+        bound_method = method_ref()
+        if bound_method is not None:
+            bound_method(state)
+
+    return observer
+
+
+def _initial_state_timeout(light_ref: "weakref.ReferenceType[MQTTLight]"):
+    """
+    Publish hardware state if no retained state arrived before the timeout.
+
+    Args:
+        light_ref: Weak reference to the light, so the pending timer does not
+            keep it alive
+    """
+    light = light_ref()
+    if light is None:
+        return
+    if light._initial_state_published or not light._checking_initial_state:
+        return
+
+    light._checking_initial_state = False
+    hw_state = light._pending_hw_state
+    light.logger.info(
+        "No retained state found after timeout, publishing initial "
+        "state: state=%s, brightness=%s",
+        "ON" if hw_state["state"] else "OFF",
+        hw_state["brightness"],
+    )
+    light._publish_state(hw_state)
+    light._initial_state_published = True
+    # Clean up
+    light.mqtt_client.message_callback_remove(light.state_topic)
+    light.mqtt_client.unsubscribe(light.state_topic)
 
 
 class MQTTLight:
@@ -49,7 +139,7 @@ class MQTTLight:
             mqtt_topic_prefix: MQTT topic prefix
             read_only: Read-only mode (no commands)
         """
-        self.logger = logging.getLogger(f"{__name__}.{hardware_light.entity_id}")
+        self.logger = entity_logger(logger, hardware_light.entity_id)
         self.hardware_light = hardware_light
         self.device_type = device_type
         self.device_id = device_id
@@ -68,23 +158,19 @@ class MQTTLight:
         self.discovery_name = format_discovery_name(self.entity_id)
 
         # Generate topics (v5 schema)
-        base_topic = f"{mqtt_topic_prefix}/scheiber/{device_type}/{self.device_slug}/{self.switch_name}"
-        self.config_topic = f"{mqtt_topic_prefix}/light/{self.entity_id}/config"
-        self.state_topic = f"{base_topic}/state"
-        self.availability_topic = f"{base_topic}/availability"
-        self.command_topic = f"{base_topic}/set"
-
-        # Track MQTT state for comparison
-        self._mqtt_state: Optional[Dict[str, Any]] = None
-        self._mqtt_state_timestamp: Optional[float] = None
-        self._initial_state_published = False
-        self._checking_initial_state = False
-
-        # Subscribe to hardware state changes
-        hardware_light.subscribe(self._on_hardware_state_change)
+        topics = build_output_topics(
+            mqtt_topic_prefix,
+            "light",
+            device_type,
+            self.device_slug,
+            self.switch_name,
+            self.entity_id,
+        )
+        self.config_topic = topics.config
+        self.state_topic = topics.state
+        self.availability_topic = topics.availability
+        self.command_topic = topics.command
 
-    def publish_discovery(self):
-        """Publish Home Assistant MQTT Discovery config."""
         discovery_config = {
             "name": self.discovery_name,
             "unique_id": self.unique_id,
@@ -92,51 +178,43 @@ class MQTTLight:
             "command_topic": self.command_topic,
             "availability_topic": self.availability_topic,
             "optimistic": False,
-            "device": {
-                "identifiers": ["scheiber_system"],
-                "name": "Scheiber",
-                "model": "Marine Lighting Control System",
-                "manufacturer": "Scheiber",
-            },
-            "schema": "json",
-            "brightness": True,
-            "supported_color_modes": ["brightness"],
-            "brightness_scale": 255,
-            "flash": True,
-            "flash_time_short": 2,
-            "flash_time_long": 10,
-            "effect": True,
-            "effect_list": [
-                "linear",
-                "ease_in_sine",
-                "ease_out_sine",
-                "ease_in_out_sine",
-                "ease_in_quad",
-                "ease_out_quad",
-                "ease_in_out_quad",
-                "ease_in_cubic",
-                "ease_out_cubic",
-                "ease_in_out_cubic",
-                "ease_in_quart",
-                "ease_out_quart",
-                "ease_in_out_quart",
-            ],
+            "device": HA_DEVICE,
+            **LIGHT_DISCOVERY_FEATURES,
         }
+        self._discovery_payload = encode_json(discovery_config)
+
+        # Track MQTT state for comparison
+        self._mqtt_state: Optional[Dict[str, Any]] = None
+        self._mqtt_state_timestamp: Optional[float] = None
+        self._initial_state_published = False
+        self._checking_initial_state = False
+        # Last retained state payload, so repeats are not sent to the broker
+        self._last_state_payload: Optional[bytes] = None
+        # Whether the broker is known to hold a retained command for us
+        self._has_retained_cmd = False
+
+        # Subscribe to hardware state changes. The hardware only holds a weak
+        # reference to this entity and drops the observer once it is collected.
+        self._hardware_observer = _weak_observer(self._on_hardware_state_change)
+        hardware_light.subscribe(self._hardware_observer)
+        weakref.finalize(self, hardware_light.unsubscribe, self._hardware_observer)
 
+    def publish_discovery(self):
+        """Publish Home Assistant MQTT Discovery config."""
         self.mqtt_client.publish(
-            self.config_topic, json.dumps(discovery_config), retain=True, qos=1
+            self.config_topic, self._discovery_payload, retain=True, qos=1
         )
-        self.logger.debug(f"Published discovery config")
+        self.logger.debug("Published discovery config")
 
     def publish_availability(self, available: bool = True):
         """Publish availability status."""
         payload = "online" if available else "offline"
-        self.mqtt_client.publish(self.availability_topic, payload, retain=True, qos=1)
+        self.mqtt_client.publish(self.availability_topic, payload, retain=True, qos=0)
 
     def subscribe_to_commands(self):
         """Subscribe to command topic."""
         self.mqtt_client.subscribe(self.command_topic)
-        self.logger.debug(f"Subscribed to commands at {self.command_topic}")
+        self.logger.debug("Subscribed to commands at %s", self.command_topic)
 
     def publish_initial_state(self):
         """Publish initial state from hardware if needed."""
@@ -159,27 +237,10 @@ class MQTTLight:
             self.state_topic, self._on_initial_state_message
         )
         self.mqtt_client.subscribe(self.state_topic)
-        self.logger.debug(f"Subscribed to {self.state_topic} to check retained state")
+        self.logger.debug("Subscribed to %s to check retained state", self.state_topic)
 
-        # Set timeout to publish anyway if no retained message
-        def timeout_handler():
-            if not self._initial_state_published and self._checking_initial_state:
-                self._checking_initial_state = False
-                self.logger.info(
-                    f"No retained state found after timeout, publishing initial state: "
-                    f"state={'ON' if hw_on else 'OFF'}, brightness={hw_brightness}"
-                )
-                self._publish_state(self._pending_hw_state)
-                self._initial_state_published = True
-                # Clean up
-                self.mqtt_client.message_callback_remove(self.state_topic)
-                self.mqtt_client.unsubscribe(self.state_topic)
-
-        # Timeout after 2 seconds
-        threading = __import__("threading")
-        timer = threading.Timer(2.0, timeout_handler)
-        timer.daemon = True
-        timer.start()
+        # Set timeout to publish anyway if no retained message (2 seconds)
+        _timers.schedule(2.0, _initial_state_timeout, weakref.ref(self))
 
     def _on_initial_state_message(self, client, userdata, message):
         """Handle initial state topic message during subscription check."""
@@ -205,67 +266,71 @@ class MQTTLight:
         try:
             # Parse retained message
             if message.payload:
-                mqtt_state = json.loads(message.payload.decode())
-                mqtt_on = mqtt_state.get("state") == "ON"
-                mqtt_brightness = mqtt_state.get("brightness", 0)
-
-                # Check message age
-                message_age = None
-                if hasattr(message, "timestamp") and message.timestamp:
-                    message_age = time.time() - message.timestamp
+                mqtt_on, mqtt_brightness = _parse_retained_state(message.payload)
 
                 # Compare states
-                state_matches = hw_on == mqtt_on and hw_brightness == mqtt_brightness
-                is_old = message_age is not None and message_age > 60
+                state_matches = (hw_on, hw_brightness) == (mqtt_on, mqtt_brightness)
 
-                if state_matches and not is_old:
+                if state_matches:
+                    # The broker already holds this state; remember it so the
+                    # next identical hardware update is not republished
+                    self._last_state_payload = self._state_payload(hw_state)
                     self.logger.info(
-                        f"Retained state matches hardware (state={'ON' if hw_on else 'OFF'}, "
-                        f"brightness={hw_brightness}), skipping initial publish"
+                        "Retained state matches hardware (state=%s, brightness=%s), "
+                        "skipping initial publish",
+                        "ON" if hw_on else "OFF",
+                        hw_brightness,
                     )
                 else:
-                    if not state_matches:
-                        self.logger.info(
-                            f"Retained state differs from hardware. "
-                            f"MQTT: state={'ON' if mqtt_on else 'OFF'}, brightness={mqtt_brightness}; "
-                            f"Hardware: state={'ON' if hw_on else 'OFF'}, brightness={hw_brightness}. "
-                            f"Publishing hardware state."
-                        )
-                    elif is_old:
-                        self.logger.info(
-                            f"Retained state is old ({message_age:.1f}s), "
-                            f"publishing fresh hardware state: state={'ON' if hw_on else 'OFF'}, brightness={hw_brightness}"
-                        )
+                    self.logger.info(
+                        "Retained state differs from hardware. MQTT: state=%s, "
+                        "brightness=%s; Hardware: state=%s, brightness=%s. Publishing "
+                        "hardware state.",
+                        "ON" if mqtt_on else "OFF",
+                        mqtt_brightness,
+                        "ON" if hw_on else "OFF",
+                        hw_brightness,
+                    )
                     self._publish_state(hw_state)
             else:
                 # No retained message
                 self.logger.info(
-                    f"No retained state found, publishing initial state: "
-                    f"state={'ON' if hw_on else 'OFF'}, brightness={hw_brightness}"
+                    "No retained state found, publishing initial state: state=%s, "
+                    "brightness=%s",
+                    "ON" if hw_on else "OFF",
+                    hw_brightness,
                 )
                 self._publish_state(hw_state)
 
         except Exception as e:
             self.logger.warning(
-                f"Error checking retained state: {e}, publishing anyway"
+                "Error checking retained state: %s, publishing anyway", e
             )
             self._publish_state(hw_state)
 
         finally:
             self._initial_state_published = True
 
-    def _publish_state(self, state_dict: Dict[str, Any]):
-        """Publish state to MQTT."""
+    @staticmethod
+    def _state_payload(state_dict: Dict[str, Any]) -> Optional[bytes]:
+        """Encode a hardware state dict as a JSON state payload."""
         json_state = {}
         if "state" in state_dict:
-            json_state["state"] = "ON" if state_dict["state"] else "OFF"
+            json_state["state"] = STATE_NAMES[bool(state_dict["state"])]
         if "brightness" in state_dict:
             json_state["brightness"] = state_dict["brightness"]
+        return encode_json(json_state) if json_state else None
 
-        if json_state:
-            payload = json.dumps(json_state)
-            self.mqtt_client.publish(self.state_topic, payload, retain=True, qos=1)
-            self.logger.info(f"Published state to {self.state_topic}: {payload}")
+    def _publish_state(self, state_dict: Dict[str, Any]):
+        """Publish state to MQTT, unless it is what was published last."""
+        payload = self._state_payload(state_dict)
+        if payload is None or payload == self._last_state_payload:
+            return
+        self._last_state_payload = payload
+        self.mqtt_client.publish(self.state_topic, payload, retain=True, qos=0)
+        self.logger.info(
+            "Published state to %s: %s", self.state_topic, payload.decode()
+        )
 
     def _on_hardware_state_change(self, state_dict: Dict[str, Any]):
         """
@@ -276,39 +341,33 @@ class MQTTLight:
         """
         self._publish_state(state_dict)
 
-    def handle_command(
-        self, payload: str, is_retained: bool = False, timestamp: Optional[float] = None
-    ):
+    def handle_command(self, payload: str, is_retained: bool = False):
         """
         Handle incoming MQTT command.
 
         Args:
             payload: JSON command payload
             is_retained: Whether this is a retained message
-            timestamp: Message timestamp (for age checking)
         """
         if self.read_only:
             self.logger.debug("Ignoring command (read-only mode)")
             return
 
-        # Check for old retained messages (>5 minutes)
-        if is_retained and timestamp is not None:
-            message_age = time.time() - timestamp
-            if message_age > 300:  # 5 minutes
-                self.logger.info(
-                    f"Ignoring old retained command (age: {message_age:.1f}s)"
-                )
-                # Clear the old retained message
-                self.mqtt_client.publish(self.command_topic, None, retain=True)
-                return
+        if not payload:
+            # Empty payload is the broker echoing a cleared retained command
+            self._has_retained_cmd = False
+            return
+
+        if is_retained:
+            # MQTT 3.1.1 carries no publish time and paho stamps messages on
+            # receipt, so a retained command may be arbitrarily stale
+            self._has_retained_cmd = True
+            self.logger.info("Ignoring retained command")
+            self._clear_retained_command()
+            return
 
         try:
-            # Parse JSON command
-            try:
-                command = json.loads(payload)
-            except json.JSONDecodeError:
-                # Simple ON/OFF command
-                command = {"state": payload}
+            command = parse_light_command(payload)
 
             state = command.get("state", "ON")
             brightness = command.get("brightness")
@@ -320,7 +379,7 @@ class MQTTLight:
             if flash:
                 # Flash effect
                 count = 3 if flash == "short" else 5
-                self.logger.info(f"Flashing {count} times")
+                self.logger.info("Flashing %s times", count)
                 self.hardware_light.flash(count=count)
             elif transition:
                 # Fade transition with optional easing effect
@@ -331,18 +390,20 @@ class MQTTLight:
                 )
                 duration = transition
                 easing = effect if effect else self.hardware_light._default_easing
-                self.logger.info(f"Fading to {target} over {duration}s with {easing}")
+                self.logger.info(
+                    "Fading to %s over %ss with %s", target, duration, easing
+                )
                 self.hardware_light.fade_to(target, duration=duration, easing=easing)
             elif brightness is not None or effect:
                 # Set brightness with optional effect (used as transition easing)
                 if effect and brightness is not None:
                     self.logger.info(
-                        f"Setting brightness to {brightness} with effect {effect}"
+                        "Setting brightness to %s with effect %s", brightness, effect
                     )
                 elif effect:
-                    self.logger.info(f"Setting default effect to {effect}")
+                    self.logger.info("Setting default effect to %s", effect)
                 elif brightness is not None:
-                    self.logger.info(f"Setting brightness to {brightness}")
+                    self.logger.info("Setting brightness to %s", brightness)
 
                 self.hardware_light.set(
                     state=state == "ON",
@@ -352,16 +413,20 @@ class MQTTLight:
             else:
                 # Simple ON/OFF
                 target = 255 if state == "ON" else 0
-                self.logger.info(f"Setting to {state}")
+                self.logger.info("Setting to %s", state)
                 self.hardware_light.set_brightness(target)
 
-            # Clear retained command after successful execution
-            if is_retained:
-                self.logger.debug("Clearing retained command")
-                self.mqtt_client.publish(self.command_topic, None, retain=True)
-
         except Exception as e:
-            self.logger.error(f"Error handling command: {e}")
+            self.logger.error("Error handling command: %s", e)
+
+    def _clear_retained_command(self):
+        """Clear the retained command on the broker, at most once per command."""
+        if not self._has_retained_cmd:
+            return
+
+        self._has_retained_cmd = False
+        self.logger.debug("Clearing retained command")
+        self.mqtt_client.publish(self.command_topic, None, retain=True)
 
     def matches_topic(self, topic: str) -> bool:
         """
@@ -373,4 +438,4 @@ class MQTTLight:
         Returns:
             True if this light handles the topic
         """
-        return topic == self.command_topic
+        return topic is self.command_topic or topic == self.command_topic
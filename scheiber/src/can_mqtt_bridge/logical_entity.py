@@ -2,14 +2,25 @@
 
 from __future__ import annotations
 
-import json
 import logging
-import time
 from typing import Any, Dict, List, Optional
 
 import paho.mqtt.client as mqtt
 
 from .discovery_name import format_discovery_name
+from .entity_logging import entity_logger
+from .payloads import (
+    HA_DEVICE,
+    LIGHT_DISCOVERY_FEATURES,
+    STATE_NAMES,
+    STATE_PAYLOADS,
+    encode_json,
+    parse_light_command,
+    parse_switch_command,
+)
+from .topics import build_output_topics
+
+logger = logging.getLogger(__name__)
 
 
 class MQTTLogicalLight:
@@ -29,17 +40,21 @@ class MQTTLogicalLight:
         self.entity_id = self.hardware_lights[0].entity_id
         self.discovery_name = format_discovery_name(self.entity_id)
         self.unique_id = f"scheiber_logical_light_{self.entity_id}"
-        base_topic = f"{mqtt_topic_prefix}/scheiber/logical/light/{self.entity_id}"
-        self.config_topic = f"{mqtt_topic_prefix}/light/{self.entity_id}/config"
-        self.state_topic = f"{base_topic}/state"
-        self.availability_topic = f"{base_topic}/availability"
-        self.command_topic = f"{base_topic}/set"
-        self.logger = logging.getLogger(f"{__name__}.{self.entity_id}")
-
-        for hardware_light in self.hardware_lights:
-            hardware_light.subscribe(self._on_hardware_state_change)
+        topics = build_output_topics(
+            mqtt_topic_prefix,
+            "light",
+            "logical",
+            "light",
+            self.entity_id,
+            self.entity_id,
+        )
+        self.config_topic = topics.config
+        self.state_topic = topics.state
+        self.availability_topic = topics.availability
+        self.command_topic = topics.command
+        self.logger = entity_logger(logger, self.entity_id)
+        self._last_state_payload: Optional[bytes] = None
 
-    def publish_discovery(self):
         discovery_config = {
             "name": self.discovery_name,
             "unique_id": self.unique_id,
@@ -47,43 +62,22 @@ class MQTTLogicalLight:
             "command_topic": self.command_topic,
             "availability_topic": self.availability_topic,
             "optimistic": False,
-            "device": {
-                "identifiers": ["scheiber_system"],
-                "name": "Scheiber",
-                "model": "Marine Lighting Control System",
-                "manufacturer": "Scheiber",
-            },
-            "schema": "json",
-            "brightness": True,
-            "supported_color_modes": ["brightness"],
-            "brightness_scale": 255,
-            "flash": True,
-            "flash_time_short": 2,
-            "flash_time_long": 10,
-            "effect": True,
-            "effect_list": [
-                "linear",
-                "ease_in_sine",
-                "ease_out_sine",
-                "ease_in_out_sine",
-                "ease_in_quad",
-                "ease_out_quad",
-                "ease_in_out_quad",
-                "ease_in_cubic",
-                "ease_out_cubic",
-                "ease_in_out_cubic",
-                "ease_in_quart",
-                "ease_out_quart",
-                "ease_in_out_quart",
-            ],
+            "device": HA_DEVICE,
+            **LIGHT_DISCOVERY_FEATURES,
         }
+        self._discovery_payload = encode_json(discovery_config)
+
+        for hardware_light in self.hardware_lights:
+            hardware_light.subscribe(self._on_hardware_state_change)
+
+    def publish_discovery(self):
         self.mqtt_client.publish(
-            self.config_topic, json.dumps(discovery_config), retain=True, qos=1
+            self.config_topic, self._discovery_payload, retain=True, qos=1
         )
 
     def publish_availability(self, available: bool = True):
         payload = "online" if available else "offline"
-        self.mqtt_client.publish(self.availability_topic, payload, retain=True, qos=1)
+        self.mqtt_client.publish(self.availability_topic, payload, retain=True, qos=0)
 
     def subscribe_to_commands(self):
         self.mqtt_client.subscribe(self.command_topic)
@@ -103,35 +97,33 @@ class MQTTLogicalLight:
         }
 
     def _publish_state(self, state_dict: Dict[str, Any]):
-        payload = json.dumps(
+        payload = encode_json(
             {
-                "state": "ON" if state_dict.get("state") else "OFF",
+                "state": STATE_NAMES[bool(state_dict.get("state"))],
                 "brightness": int(state_dict.get("brightness", 0)),
             }
         )
-        self.mqtt_client.publish(self.state_topic, payload, retain=True, qos=1)
+        # A member changing does not always change the aggregate
+        if payload == self._last_state_payload:
+            return
+        self._last_state_payload = payload
+        self.mqtt_client.publish(self.state_topic, payload, retain=True, qos=0)
 
     def _on_hardware_state_change(self, _state_dict: Dict[str, Any]):
         self._publish_state(self._aggregate_state())
 
-    def handle_command(
-        self, payload: str, is_retained: bool = False, timestamp: Optional[float] = None
-    ):
+    def handle_command(self, payload: str, is_retained: bool = False):
         if self.read_only:
             self.logger.debug("Ignoring command (read-only mode)")
             return
 
-        if is_retained and timestamp is not None:
-            message_age = time.time() - timestamp
-            if message_age > 300:
-                self.mqtt_client.publish(self.command_topic, None, retain=True)
-                return
+        if is_retained:
+            # A retained command may be arbitrarily stale; clear it unexecuted
+            self.mqtt_client.publish(self.command_topic, None, retain=True)
+            return
 
         try:
-            try:
-                command = json.loads(payload)
-            except json.JSONDecodeError:
-                command = {"state": payload}
+            command = parse_light_command(payload)
 
             state = command.get("state", "ON")
             brightness = command.get("brightness")
@@ -159,13 +151,11 @@ class MQTTLogicalLight:
                 else:
                     hardware_light.set_brightness(255 if state == "ON" else 0)
 
-            if is_retained:
-                self.mqtt_client.publish(self.command_topic, None, retain=True)
         except Exception as exc:
             self.logger.error(f"Error handling logical light command: {exc}")
 
     def matches_topic(self, topic: str) -> bool:
-        return topic == self.command_topic
+        return topic is self.command_topic or topic == self.command_topic
 
 
 class MQTTLogicalSwitch:
@@ -185,17 +175,21 @@ class MQTTLogicalSwitch:
         self.entity_id = self.hardware_switches[0].entity_id
         self.discovery_name = format_discovery_name(self.entity_id)
         self.unique_id = f"scheiber_logical_switch_{self.entity_id}"
-        base_topic = f"{mqtt_topic_prefix}/scheiber/logical/switch/{self.entity_id}"
-        self.config_topic = f"{mqtt_topic_prefix}/switch/{self.entity_id}/config"
-        self.state_topic = f"{base_topic}/state"
-        self.availability_topic = f"{base_topic}/availability"
-        self.command_topic = f"{base_topic}/set"
-        self.logger = logging.getLogger(f"{__name__}.{self.entity_id}")
-
-        for hardware_switch in self.hardware_switches:
-            hardware_switch.subscribe(self._on_hardware_state_change)
+        topics = build_output_topics(
+            mqtt_topic_prefix,
+            "switch",
+            "logical",
+            "switch",
+            self.entity_id,
+            self.entity_id,
+        )
+        self.config_topic = topics.config
+        self.state_topic = topics.state
+        self.availability_topic = topics.availability
+        self.command_topic = topics.command
+        self.logger = entity_logger(logger, self.entity_id)
+        self._last_state_payload: Optional[bytes] = None
 
-    def publish_discovery(self):
         discovery_config = {
             "name": self.discovery_name,
             "unique_id": self.unique_id,
@@ -208,60 +202,59 @@ class MQTTLogicalSwitch:
             "payload_off": "OFF",
             "state_on": "ON",
             "state_off": "OFF",
-            "device": {
-                "identifiers": ["scheiber_system"],
-                "name": "Scheiber",
-                "model": "Marine Lighting Control System",
-                "manufacturer": "Scheiber",
-            },
+            "device": HA_DEVICE,
         }
+        self._discovery_payload = encode_json(discovery_config)
+
+        for hardware_switch in self.hardware_switches:
+            hardware_switch.subscribe(self._on_hardware_state_change)
+
+    def publish_discovery(self):
         self.mqtt_client.publish(
-            self.config_topic, json.dumps(discovery_config), retain=True, qos=1
+            self.config_topic, self._discovery_payload, retain=True, qos=1
         )
 
     def publish_availability(self, available: bool = True):
         payload = "online" if available else "offline"
-        self.mqtt_client.publish(self.availability_topic, payload, retain=True, qos=1)
+        self.mqtt_client.publish(self.availability_topic, payload, retain=True, qos=0)
 
     def subscribe_to_commands(self):
         self.mqtt_client.subscribe(self.command_topic)
 
     def publish_initial_state(self):
-        self._publish_state("ON" if self._aggregate_state() else "OFF")
+        self._publish_state(STATE_PAYLOADS[self._aggregate_state()])
 
     def _aggregate_state(self) -> bool:
         return any(member.get_state() for member in self.hardware_switches)
 
-    def _publish_state(self, payload: str):
-        self.mqtt_client.publish(self.state_topic, payload, retain=True, qos=1)
+    def _publish_state(self, payload: bytes):
+        if payload == self._last_state_payload:
+            return
+        self._last_state_payload = payload
+        self.mqtt_client.publish(self.state_topic, payload, retain=True, qos=0)
 
     def _on_hardware_state_change(self, _state_dict: Dict[str, Any]):
-        self._publish_state("ON" if self._aggregate_state() else "OFF")
+        self._publish_state(STATE_PAYLOADS[self._aggregate_state()])
 
-    def handle_command(
-        self, payload: str, is_retained: bool = False, timestamp: Optional[float] = None
-    ):
+    def handle_command(self, payload: str, is_retained: bool = False):
         if self.read_only:
             self.logger.debug("Ignoring command (read-only mode)")
             return
 
-        if is_retained and timestamp is not None:
-            message_age = time.time() - timestamp
-            if message_age > 300:
-                self.mqtt_client.publish(self.command_topic, None, retain=True)
-                return
+        if is_retained:
+            # A retained command may be arbitrarily stale; clear it unexecuted
+            self.mqtt_client.publish(self.command_topic, None, retain=True)
+            return
 
         try:
-            state_bool = payload.strip().upper() == "ON"
+            state_bool = parse_switch_command(payload)
             for hardware_switch in self.hardware_switches:
                 hardware_switch.set(state_bool)
-            if is_retained:
-                self.mqtt_client.publish(self.command_topic, None, retain=True)
         except Exception as exc:
             self.logger.error(f"Error handling logical switch command: {exc}")
 
     def matches_topic(self, topic: str) -> bool:
-        return topic == self.command_topic
+        return topic is self.command_topic or topic == self.command_topic
 
 
 class MQTTLogicalButton:
@@ -281,33 +274,37 @@ class MQTTLogicalButton:
         self.entity_id = self.hardware_pulses[0].entity_id
         self.discovery_name = format_discovery_name(self.entity_id)
         self.unique_id = f"scheiber_logical_button_{self.entity_id}"
-        base_topic = f"{mqtt_topic_prefix}/scheiber/logical/button/{self.entity_id}"
-        self.config_topic = f"{mqtt_topic_prefix}/button/{self.entity_id}/config"
-        self.availability_topic = f"{base_topic}/availability"
-        self.command_topic = f"{base_topic}/set"
-        self.logger = logging.getLogger(f"{__name__}.{self.entity_id}")
+        topics = build_output_topics(
+            mqtt_topic_prefix,
+            "button",
+            "logical",
+            "button",
+            self.entity_id,
+            self.entity_id,
+        )
+        self.config_topic = topics.config
+        self.availability_topic = topics.availability
+        self.command_topic = topics.command
+        self.logger = entity_logger(logger, self.entity_id)
 
-    def publish_discovery(self):
         discovery_config = {
             "name": self.discovery_name,
             "unique_id": self.unique_id,
             "command_topic": self.command_topic,
             "payload_press": "PRESS",
             "availability_topic": self.availability_topic,
-            "device": {
-                "identifiers": ["scheiber_system"],
-                "name": "Scheiber",
-                "model": "Marine Lighting Control System",
-                "manufacturer": "Scheiber",
-            },
+            "device": HA_DEVICE,
         }
+        self._discovery_payload = encode_json(discovery_config)
+
+    def publish_discovery(self):
         self.mqtt_client.publish(
-            self.config_topic, json.dumps(discovery_config), retain=True, qos=1
+            self.config_topic, self._discovery_payload, retain=True, qos=1
         )
 
     def publish_availability(self, available: bool = True):
         payload = "online" if available else "offline"
-        self.mqtt_client.publish(self.availability_topic, payload, retain=True, qos=1)
+        self.mqtt_client.publish(self.availability_topic, payload, retain=True, qos=0)
 
     def subscribe_to_commands(self):
         self.mqtt_client.subscribe(self.command_topic)
@@ -315,26 +312,21 @@ class MQTTLogicalButton:
     def publish_initial_state(self):
         """Buttons are stateless and do not publish state."""
 
-    def handle_command(
-        self, payload: str, is_retained: bool = False, timestamp: Optional[float] = None
-    ):
+    def handle_command(self, payload: str, is_retained: bool = False):
         if self.read_only:
             self.logger.debug("Ignoring command (read-only mode)")
             return
 
-        if is_retained and timestamp is not None:
-            message_age = time.time() - timestamp
-            if message_age > 300:
-                self.mqtt_client.publish(self.command_topic, None, retain=True)
-                return
+        if is_retained:
+            # A retained command may be arbitrarily stale; clear it unexecuted
+            self.mqtt_client.publish(self.command_topic, None, retain=True)
+            return
 
         try:
             for hardware_pulse in self.hardware_pulses:
                 hardware_pulse.press()
-            if is_retained:
-                self.mqtt_client.publish(self.command_topic, None, retain=True)
         except Exception as exc:
             self.logger.error(f"Error handling logical button press: {exc}")
 
     def matches_topic(self, topic: str) -> bool:
-        return topic == self.command_topic
+        return topic is self.command_topic or topic == self.command_topic
@@ -0,0 +1,111 @@
+"""
+Shared MQTT payload constants and serialization for bridge entities.
+"""
+
+import json
+from typing import Any, Dict
+
+# Home Assistant device all bridge entities belong to. Shared, never mutate.
+HA_DEVICE = {
+    "identifiers": ["scheiber_system"],
+    "name": "Scheiber",
+    "model": "Marine Lighting Control System",
+    "manufacturer": "Scheiber",
+}
+
+# Light features advertised in discovery, the same for every light. Shared,
+# never mutate.
+LIGHT_DISCOVERY_FEATURES = {
+    "schema": "json",
+    "brightness": True,
+    "supported_color_modes": ["brightness"],
+    "brightness_scale": 255,
+    "flash": True,
+    "flash_time_short": 2,
+    "flash_time_long": 10,
+    "effect": True,
+    "effect_list": [
+        "linear",
+        "ease_in_sine",
+        "ease_out_sine",
+        "ease_in_out_sine",
+        "ease_in_quad",
+        "ease_out_quad",
+        "ease_in_out_quad",
+        "ease_in_cubic",
+        "ease_out_cubic",
+        "ease_in_out_cubic",
+        "ease_in_quart",
+        "ease_out_quart",
+        "ease_in_out_quart",
+    ],
+}
+
+# Availability payloads, pre-encoded so paho does not re-encode them per publish
+AVAILABILITY_ONLINE = b"online"
+AVAILABILITY_OFFLINE = b"offline"
+# Indexed by bool(available)
+AVAILABILITY_PAYLOADS = (AVAILABILITY_OFFLINE, AVAILABILITY_ONLINE)
+
+# Plain switch state payloads
+STATE_ON = b"ON"
+STATE_OFF = b"OFF"
+# Indexed by bool(state)
+STATE_PAYLOADS = (STATE_OFF, STATE_ON)
+# JSON "state" values, indexed by bool(state)
+STATE_NAMES = ("OFF", "ON")
+# Exact command payloads -> requested state, for a single hashed lookup
+_COMMAND_STATES = {name: bool(index) for index, name in enumerate(STATE_NAMES)}
+
+
+def encode_json(data: Any) -> bytes:
+    """
+    Serialize a payload to UTF-8 encoded JSON, ready to hand to paho.
+
+    Args:
+        data: JSON-serializable payload
+
+    Returns:
+        Encoded JSON payload
+    """
+    return json.dumps(data).encode("utf-8")
+
+
+def parse_light_command(payload: str) -> Dict[str, Any]:
+    """
+    Parse a light command payload into a JSON schema command.
+
+    Plain ON/OFF payloads skip the JSON parser. Anything that is not valid
+    JSON is treated as a plain state value.
+
+    Args:
+        payload: Decoded command payload
+
+    Returns:
+        Command dict, at least carrying the requested "state" when plain
+    """
+    if payload in _COMMAND_STATES:
+        return {"state": payload}
+    try:
+        return json.loads(payload)
+    except json.JSONDecodeError:
+        return {"state": payload}
+
+
+def parse_switch_command(payload: str) -> bool:
+    """
+    Parse a switch command payload into the requested state.
+
+    Exact ON/OFF payloads, which Home Assistant sends, are matched without
+    normalizing the string; anything else is compared case-insensitively.
+
+    Args:
+        payload: Decoded command payload
+
+    Returns:
+        True if the command asks for ON
+    """
+    state = _COMMAND_STATES.get(payload)
+    if state is None:
+        state = payload.strip().upper() == "ON"
+    return state
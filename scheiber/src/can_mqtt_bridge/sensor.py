@@ -2,13 +2,21 @@
 MQTT Bridge for Scheiber sensor entities.
 """
 
-import json
 import logging
-from typing import Any
+from typing import Any, Dict, Optional
 
 import paho.mqtt.client as mqtt
 
-from .discovery_name import format_discovery_name
+from .coalesce import PublishCoalescer
+from .discovery_name import format_discovery_name, slugify_name
+from .entity_logging import entity_logger
+from .payloads import AVAILABILITY_PAYLOADS, HA_DEVICE, encode_json
+from .topics import build_output_topics
+
+logger = logging.getLogger(__name__)
+
+# Shared by all sensors so a burst of CAN updates yields one publish per window
+_state_coalescer = PublishCoalescer(interval=0.05)
 
 
 class MQTTSensor:
@@ -21,6 +29,24 @@ class MQTTSensor:
     - Availability management
     """
 
+    __slots__ = (
+        "logger",
+        "sensor",
+        "device_type",
+        "device_id",
+        "segment_id",
+        "mqtt_client",
+        "mqtt_topic_prefix",
+        "unique_id",
+        "entity_id",
+        "discovery_name",
+        "config_topic",
+        "state_topic",
+        "availability_topic",
+        "_discovery_payload",
+        "_last_state_payload",
+    )
+
     def __init__(
         self,
         hardware_sensor: Any,
@@ -40,7 +66,7 @@ class MQTTSensor:
             mqtt_client: MQTT client instance
             mqtt_topic_prefix: MQTT topic prefix
         """
-        self.logger = logging.getLogger(f"{__name__}.{hardware_sensor.entity_id}")
+        self.logger = entity_logger(logger, hardware_sensor.entity_id)
         self.sensor = hardware_sensor
         self.device_type = device_type
         self.device_id = device_id
@@ -49,55 +75,79 @@ class MQTTSensor:
         self.mqtt_topic_prefix = mqtt_topic_prefix
 
         # Generate identifiers
-        sensor_name_slug = self.sensor.name.lower().replace(" ", "_")
+        sensor_name_slug = slugify_name(self.sensor.name)
         route_slug = f"{device_id}" if segment_id == 0 else f"{device_id}_{segment_id}"
         self.unique_id = f"scheiber_{device_type}_{route_slug}_{sensor_name_slug}"
         self.entity_id = hardware_sensor.entity_id
         self.discovery_name = format_discovery_name(self.entity_id)
 
         # Generate topics
-        base_topic = f"{mqtt_topic_prefix}/scheiber/{device_type}/{route_slug}/{sensor_name_slug}"
-        self.config_topic = f"{mqtt_topic_prefix}/sensor/{self.entity_id}/config"
-        self.state_topic = f"{base_topic}/state"
-        self.availability_topic = f"{base_topic}/availability"
-
-        # Subscribe to hardware state changes
-        hardware_sensor.subscribe(self._on_hardware_state_change)
+        topics = build_output_topics(
+            mqtt_topic_prefix,
+            "sensor",
+            device_type,
+            route_slug,
+            sensor_name_slug,
+            self.entity_id,
+        )
+        self.config_topic = topics.config
+        self.state_topic = topics.state
+        self.availability_topic = topics.availability
 
-    def publish_discovery(self):
-        """Publish Home Assistant MQTT Discovery config."""
+        # Discovery config is static per entity, so encode it once
         discovery_config = {
             "name": self.discovery_name,
             "unique_id": self.unique_id,
             "state_topic": self.state_topic,
             "availability_topic": self.availability_topic,
-            "device": {
-                "identifiers": ["scheiber_system"],
-                "name": "Scheiber",
-                "model": "Marine Lighting Control System",
-                "manufacturer": "Scheiber",
-            },
+            "device": HA_DEVICE,
             "unit_of_measurement": self.sensor.unit_of_measurement,
         }
 
-        # Add device class for voltage sensors
-        if hasattr(self.sensor, "device_class") and self.sensor.device_class:
-            discovery_config["device_class"] = self.sensor.device_class
-            discovery_config["state_class"] = "measurement"
-        elif hasattr(self.sensor, "icon") and self.sensor.icon:
-            # For sensors without device_class, add icon
-            discovery_config["icon"] = self.sensor.icon
-            discovery_config["state_class"] = "measurement"
+        discovery_config.update(self._discovery_extra(hardware_sensor))
+        self._discovery_payload = encode_json(discovery_config)
+        self._last_state_payload: Optional[bytes] = None
+
+        # Subscribe to hardware state changes
+        hardware_sensor.subscribe(self._on_hardware_state_change)
+
+    @staticmethod
+    def _discovery_extra(hardware_sensor: Any) -> Dict[str, str]:
+        """
+        Get the discovery fields that depend on the kind of sensor.
 
+        Args:
+            hardware_sensor: Sensor instance from scheiber module
+
+        Returns:
+            Device class (voltage sensors etc.) or icon, plus state class
+        """
+        device_class = getattr(hardware_sensor, "device_class", None)
+        if device_class:
+            return {"device_class": device_class, "state_class": "measurement"}
+
+        # For sensors without device_class, add icon
+        icon = getattr(hardware_sensor, "icon", None)
+        if icon:
+            return {"icon": icon, "state_class": "measurement"}
+
+        return {}
+
+    def publish_discovery(self):
+        """Publish Home Assistant MQTT Discovery config."""
         self.mqtt_client.publish(
-            self.config_topic, json.dumps(discovery_config), retain=True, qos=1
+            self.config_topic, self._discovery_payload, retain=True, qos=1
         )
-        self.logger.debug(f"Published discovery config")
+        self.logger.debug("Published discovery config")
 
     def publish_availability(self, available: bool = True):
         """Publish availability status."""
-        payload = "online" if available else "offline"
-        self.mqtt_client.publish(self.availability_topic, payload, retain=True, qos=1)
+        self.mqtt_client.publish(
+            self.availability_topic,
+            AVAILABILITY_PAYLOADS[bool(available)],
+            retain=True,
+            qos=0,
+        )
 
     def publish_initial_state(self):
         """Publish initial state from hardware."""
@@ -122,14 +172,22 @@ class MQTTSensor:
         Args:
             state_dict: State dictionary from hardware sensor (contains 'value')
         """
-        self._publish_state()
+        # _publish_state reads the latest value, so the last update wins
+        _state_coalescer.submit(self, self._publish_state)
 
     def _publish_state(self):
         """Publish the current sensor value to MQTT."""
         value = self.sensor.get_value()
-        if value is not None:
-            self.mqtt_client.publish(self.state_topic, str(value), retain=True, qos=1)
-            self.logger.debug(f"Published state: {value}")
+        if value is None:
+            return
+
+        payload = str(value).encode()
+        if payload == self._last_state_payload:
+            return
+
+        self._last_state_payload = payload
+        self.mqtt_client.publish(self.state_topic, payload, retain=True, qos=0)
+        self.logger.debug("Published state: %s", value)
 
     def matches_topic(self, topic: str) -> bool:
         """Sensors don't subscribe to command topics."""
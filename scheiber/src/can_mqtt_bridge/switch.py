@@ -4,14 +4,51 @@ Switch entity for MQTT Bridge.
 Handles MQTT discovery, state publishing, and command handling for switches.
 """
 
-import json
 import logging
-import time
+import weakref
 from typing import Any, Dict, Optional
 
 import paho.mqtt.client as mqtt
 
+from . import _timers
 from .discovery_name import format_discovery_name
+from .entity_logging import entity_logger
+from .payloads import (
+    AVAILABILITY_PAYLOADS,
+    HA_DEVICE,
+    STATE_PAYLOADS,
+    encode_json,
+    parse_switch_command,
+)
+from .topics import build_output_topics
+
+logger = logging.getLogger(__name__)
+
+
+def _initial_state_timeout(switch_ref: "weakref.ReferenceType[MQTTSwitch]"):
+    """
+    Publish hardware state if no retained state arrived before the timeout.
+
+    Args:
+        switch_ref: Weak reference to the switch, so the pending timer does not
+            keep it alive
+    """
+    switch = switch_ref()
+    if switch is None:
+        return
+    if switch._initial_state_published or not switch._checking_initial_state:
+        return
+
+    switch._checking_initial_state = False
+    switch.logger.info(
+        "No retained state found after timeout, publishing initial state: %s",
+        switch._pending_hw_payload.decode(),
+    )
+    switch._publish_state(switch._pending_hw_payload)
+    switch._initial_state_published = True
+    # Clean up
+    switch.mqtt_client.message_callback_remove(switch.state_topic)
+    switch.mqtt_client.unsubscribe(switch.state_topic)
 
 
 class MQTTSwitch:
@@ -25,6 +62,34 @@ class MQTTSwitch:
     - Command parsing and execution
     """
 
+    __slots__ = (
+        "logger",
+        "hardware_switch",
+        "device_type",
+        "device_id",
+        "segment_id",
+        "mqtt_client",
+        "mqtt_topic_prefix",
+        "read_only",
+        "switch_name",
+        "device_slug",
+        "unique_id",
+        "entity_id",
+        "discovery_name",
+        "config_topic",
+        "state_topic",
+        "availability_topic",
+        "command_topic",
+        "_discovery_payload",
+        "_mqtt_state",
+        "_mqtt_state_timestamp",
+        "_initial_state_published",
+        "_checking_initial_state",
+        "_pending_hw_payload",
+        "_last_state_payload",
+        "__weakref__",
+    )
+
     def __init__(
         self,
         hardware_switch,
@@ -47,7 +112,7 @@ class MQTTSwitch:
             mqtt_topic_prefix: MQTT topic prefix
             read_only: Read-only mode (no commands)
         """
-        self.logger = logging.getLogger(f"{__name__}.{hardware_switch.entity_id}")
+        self.logger = entity_logger(logger, hardware_switch.entity_id)
         self.hardware_switch = hardware_switch
         self.device_type = device_type
         self.device_id = device_id
@@ -67,23 +132,20 @@ class MQTTSwitch:
         self.discovery_name = format_discovery_name(self.entity_id)
 
         # Generate topics (v5 schema)
-        base_topic = f"{mqtt_topic_prefix}/scheiber/{device_type}/{self.device_slug}/{self.switch_name}"
-        self.config_topic = f"{mqtt_topic_prefix}/switch/{self.entity_id}/config"
-        self.state_topic = f"{base_topic}/state"
-        self.availability_topic = f"{base_topic}/availability"
-        self.command_topic = f"{base_topic}/set"
-
-        # Track MQTT state for comparison
-        self._mqtt_state: Optional[str] = None
-        self._mqtt_state_timestamp: Optional[float] = None
-        self._initial_state_published = False
-        self._checking_initial_state = False
-
-        # Subscribe to hardware state changes
-        hardware_switch.subscribe(self._on_hardware_state_change)
+        topics = build_output_topics(
+            mqtt_topic_prefix,
+            "switch",
+            device_type,
+            self.device_slug,
+            self.switch_name,
+            self.entity_id,
+        )
+        self.config_topic = topics.config
+        self.state_topic = topics.state
+        self.availability_topic = topics.availability
+        self.command_topic = topics.command
 
-    def publish_discovery(self):
-        """Publish Home Assistant MQTT Discovery config."""
+        # Discovery config is static per entity, so encode it once
         discovery_config = {
             "name": self.discovery_name,
             "unique_id": self.unique_id,
@@ -96,39 +158,51 @@ class MQTTSwitch:
             "payload_off": "OFF",
             "state_on": "ON",
             "state_off": "OFF",
-            "device": {
-                "identifiers": ["scheiber_system"],
-                "name": "Scheiber",
-                "model": "Marine Lighting Control System",
-                "manufacturer": "Scheiber",
-            },
+            "device": HA_DEVICE,
         }
+        self._discovery_payload = encode_json(discovery_config)
 
+        # Track MQTT state for comparison
+        self._mqtt_state: Optional[str] = None
+        self._mqtt_state_timestamp: Optional[float] = None
+        self._initial_state_published = False
+        self._checking_initial_state = False
+        self._last_state_payload: Optional[bytes] = None
+
+        # Subscribe to hardware state changes
+        hardware_switch.subscribe(self._on_hardware_state_change)
+
+    def publish_discovery(self):
+        """Publish Home Assistant MQTT Discovery config."""
         self.mqtt_client.publish(
-            self.config_topic, json.dumps(discovery_config), retain=True, qos=1
+            self.config_topic, self._discovery_payload, retain=True, qos=1
         )
-        self.logger.debug(f"Published discovery config")
+        self.logger.debug("Published discovery config")
 
     def publish_availability(self, available: bool = True):
         """Publish availability status."""
-        payload = "online" if available else "offline"
-        self.mqtt_client.publish(self.availability_topic, payload, retain=True, qos=1)
+        self.mqtt_client.publish(
+            self.availability_topic,
+            AVAILABILITY_PAYLOADS[bool(available)],
+            retain=True,
+            qos=0,
+        )
 
     def subscribe_to_commands(self):
         """Subscribe to command topic."""
         self.mqtt_client.subscribe(self.command_topic)
-        self.logger.debug(f"Subscribed to commands at {self.command_topic}")
+        self.logger.debug("Subscribed to commands at %s", self.command_topic)
 
     def publish_initial_state(self):
         """Publish initial state from hardware if needed."""
         # Get current hardware state
         hw_state = self.hardware_switch.get_state()
-        hw_payload = "ON" if hw_state else "OFF"
+        hw_payload = STATE_PAYLOADS[bool(hw_state)]
 
         # Subscribe to state topic to fetch retained message
         self._setup_state_subscription(hw_payload)
 
-    def _setup_state_subscription(self, hw_payload: str):
+    def _setup_state_subscription(self, hw_payload: bytes):
         """Subscribe to state topic to check existing retained state."""
         # Store hardware state for comparison
         self._pending_hw_payload = hw_payload
@@ -139,26 +213,10 @@ class MQTTSwitch:
             self.state_topic, self._on_initial_state_message
         )
         self.mqtt_client.subscribe(self.state_topic)
-        self.logger.debug(f"Subscribed to {self.state_topic} to check retained state")
-
-        # Set timeout to publish anyway if no retained message
-        def timeout_handler():
-            if not self._initial_state_published and self._checking_initial_state:
-                self._checking_initial_state = False
-                self.logger.info(
-                    f"No retained state found after timeout, publishing initial state: {hw_payload}"
-                )
-                self._publish_state(hw_payload)
-                self._initial_state_published = True
-                # Clean up
-                self.mqtt_client.message_callback_remove(self.state_topic)
-                self.mqtt_client.unsubscribe(self.state_topic)
+        self.logger.debug("Subscribed to %s to check retained state", self.state_topic)
 
-        # Timeout after 2 seconds
-        threading = __import__("threading")
-        timer = threading.Timer(2.0, timeout_handler)
-        timer.daemon = True
-        timer.start()
+        # Set timeout to publish anyway if no retained message (2 seconds)
+        _timers.schedule(2.0, _initial_state_timeout, weakref.ref(self))
 
     def _on_initial_state_message(self, client, userdata, message):
         """Handle initial state topic message during subscription check."""
@@ -182,54 +240,55 @@ class MQTTSwitch:
         try:
             # Parse retained message
             if message.payload:
-                mqtt_payload = message.payload.decode().strip()
-
-                # Check message age
-                message_age = None
-                if hasattr(message, "timestamp") and message.timestamp:
-                    message_age = time.time() - message.timestamp
+                mqtt_payload = message.payload.strip()
 
                 # Compare states
                 state_matches = hw_payload == mqtt_payload
-                is_old = message_age is not None and message_age > 60
 
-                if state_matches and not is_old:
+                if state_matches:
+                    # The broker already holds this state; remember it so the
+                    # next identical hardware update is not republished
+                    self._last_state_payload = hw_payload
                     self.logger.info(
-                        f"Retained state matches hardware ({hw_payload}), skipping initial publish"
+                        "Retained state matches hardware (%s), skipping initial "
+                        "publish",
+                        hw_payload.decode(),
                     )
                 else:
-                    if not state_matches:
-                        self.logger.info(
-                            f"Retained state differs from hardware. "
-                            f"MQTT: {mqtt_payload}; Hardware: {hw_payload}. "
-                            f"Publishing hardware state."
-                        )
-                    elif is_old:
-                        self.logger.info(
-                            f"Retained state is old ({message_age:.1f}s), "
-                            f"publishing fresh hardware state: {hw_payload}"
-                        )
+                    self.logger.info(
+                        "Retained state differs from hardware. MQTT: %s; Hardware: "
+                        "%s. Publishing hardware state.",
+                        mqtt_payload.decode(),
+                        hw_payload.decode(),
+                    )
                     self._publish_state(hw_payload)
             else:
                 # No retained message
                 self.logger.info(
-                    f"No retained state found, publishing initial state: {hw_payload}"
+                    "No retained state found, publishing initial state: %s",
+                    hw_payload.decode(),
                 )
                 self._publish_state(hw_payload)
 
         except Exception as e:
             self.logger.warning(
-                f"Error checking retained state: {e}, publishing anyway"
+                "Error checking retained state: %s, publishing anyway", e
             )
             self._publish_state(hw_payload)
 
         finally:
             self._initial_state_published = True
 
-    def _publish_state(self, payload: str):
-        """Publish state to MQTT."""
-        self.mqtt_client.publish(self.state_topic, payload, retain=True, qos=1)
-        self.logger.info(f"Published state to {self.state_topic}: {payload}")
+    def _publish_state(self, payload: bytes):
+        """Publish state to MQTT, unless it is what was published last."""
+        if payload == self._last_state_payload:
+            return
+
+        self._last_state_payload = payload
+        self.mqtt_client.publish(self.state_topic, payload, retain=True, qos=0)
+        self.logger.info(
+            "Published state to %s: %s", self.state_topic, payload.decode()
+        )
 
     def _on_hardware_state_change(self, state_dict: Dict[str, Any]):
         """
@@ -239,49 +298,36 @@ class MQTTSwitch:
             state_dict: State dictionary from hardware switch
         """
         if "state" in state_dict:
-            payload = "ON" if state_dict["state"] else "OFF"
-            self._publish_state(payload)
+            self._publish_state(STATE_PAYLOADS[bool(state_dict["state"])])
 
-    def handle_command(
-        self, payload: str, is_retained: bool = False, timestamp: Optional[float] = None
-    ):
+    def handle_command(self, payload: str, is_retained: bool = False):
         """
         Handle incoming MQTT command.
 
         Args:
             payload: JSON command payload
             is_retained: Whether this is a retained message
-            timestamp: Message timestamp (for age checking)
         """
         if self.read_only:
             self.logger.debug("Ignoring command (read-only mode)")
             return
 
-        # Check for old retained messages (>5 minutes)
-        if is_retained and timestamp is not None:
-            message_age = time.time() - timestamp
-            if message_age > 300:  # 5 minutes
-                self.logger.info(
-                    f"Ignoring old retained command (age: {message_age:.1f}s)"
-                )
-                # Clear the old retained message
-                self.mqtt_client.publish(self.command_topic, None, retain=True)
-                return
+        if is_retained:
+            # MQTT 3.1.1 carries no publish time and paho stamps messages on
+            # receipt, so a retained command may be arbitrarily stale
+            self.logger.info("Ignoring retained command")
+            self.mqtt_client.publish(self.command_topic, None, retain=True)
+            return
 
         try:
             # Parse command (expect plain ON/OFF)
-            state_bool = payload.strip().upper() == "ON"
+            state_bool = parse_switch_command(payload)
 
-            self.logger.info(f"Setting to {'ON' if state_bool else 'OFF'}")
+            self.logger.info("Setting to %s", "ON" if state_bool else "OFF")
             self.hardware_switch.set(state_bool)
 
-            # Clear retained command after successful execution
-            if is_retained:
-                self.logger.debug("Clearing retained command")
-                self.mqtt_client.publish(self.command_topic, None, retain=True)
-
         except Exception as e:
-            self.logger.error(f"Error handling command: {e}")
+            self.logger.error("Error handling command: %s", e)
 
     def matches_topic(self, topic: str) -> bool:
         """
@@ -293,4 +339,4 @@ class MQTTSwitch:
         Returns:
             True if this switch handles the topic
         """
-        return topic == self.command_topic
+        return topic is self.command_topic or topic == self.command_topic
@@ -8,20 +8,10 @@ from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 
-# Add parent directories to path
+# Make the bridge and scheiber packages importable for every test module
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 
-@pytest.fixture
-def mock_mqtt_client():
-    """Mock MQTT client."""
-    client = MagicMock()
-    client.connect.return_value = 0
-    client.subscribe.return_value = (0, 1)
-    client.publish.return_value = MagicMock(rc=0)
-    return client
-
-
 @pytest.fixture
 def mock_scheiber_system():
     """Mock Scheiber system."""
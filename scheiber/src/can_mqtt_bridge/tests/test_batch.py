@@ -0,0 +1,115 @@
+"""Tests for MQTT publish batching."""
+
+import threading
+from unittest.mock import MagicMock, call
+
+from can_mqtt_bridge.batch import MqttBatcher
+
+
+def test_publish_passes_through_without_batch():
+    """Test publishes go straight to the client when no batch is open."""
+    client = MagicMock()
+    batcher = MqttBatcher(client)
+
+    result = batcher.publish("a/state", "ON", retain=True, qos=1)
+
+    client.publish.assert_called_once_with("a/state", "ON", retain=True, qos=1)
+    assert result is client.publish.return_value
+
+
+def test_batch_defers_publishes_until_exit():
+    """Test publishes inside a batch are sent in order when it closes."""
+    client = MagicMock()
+    batcher = MqttBatcher(client)
+
+    with batcher.batch():
+        batcher.publish("a/config", b"{}", retain=True, qos=1)
+        batcher.publish("a/availability", b"online", retain=True, qos=1)
+        client.publish.assert_not_called()
+
+    assert client.publish.call_args_list == [
+        call("a/config", b"{}", retain=True, qos=1),
+        call("a/availability", b"online", retain=True, qos=1),
+    ]
+
+    batcher.publish("a/state", "OFF")
+    assert client.publish.call_args == call("a/state", "OFF")
+
+
+def test_batch_flushes_on_error():
+    """Test recorded publishes are still sent if the block raises."""
+    client = MagicMock()
+    batcher = MqttBatcher(client)
+
+    try:
+        with batcher.batch():
+            batcher.publish("a/config", b"{}")
+            raise RuntimeError("setup failed")
+    except RuntimeError:
+        pass
+
+    client.publish.assert_called_once_with("a/config", b"{}")
+
+
+def test_other_attributes_are_forwarded():
+    """Test non-publish client methods reach the wrapped client."""
+    client = MagicMock()
+    batcher = MqttBatcher(client)
+
+    with batcher.batch():
+        batcher.subscribe("a/set")
+
+    client.subscribe.assert_called_once_with("a/set")
+
+
+def test_nested_batch_flushes_only_at_outermost_exit():
+    """Test an inner batch does not close or send the outer one."""
+    client = MagicMock()
+    batcher = MqttBatcher(client)
+
+    with batcher.batch():
+        batcher.publish("a/config", b"{}")
+        with batcher.batch():
+            batcher.publish("b/config", b"{}")
+        client.publish.assert_not_called()
+
+        batcher.publish("c/config", b"{}")
+        client.publish.assert_not_called()
+
+    assert client.publish.call_args_list == [
+        call("a/config", b"{}"),
+        call("b/config", b"{}"),
+        call("c/config", b"{}"),
+    ]
+
+
+def test_overlapping_batches_from_two_threads():
+    """Test a batch opened on another thread joins the open one."""
+    client = MagicMock()
+    batcher = MqttBatcher(client)
+    inner_open = threading.Event()
+    outer_closed = threading.Event()
+
+    def other_thread():
+        with batcher.batch():
+            batcher.publish("b/config", b"{}")
+            inner_open.set()
+            outer_closed.wait(timeout=5)
+        batcher.publish("b/state", b"ON")
+
+    with batcher.batch():
+        batcher.publish("a/config", b"{}")
+        thread = threading.Thread(target=other_thread)
+        thread.start()
+        inner_open.wait(timeout=5)
+
+    # The other thread's batch is still open, so nothing was sent yet
+    client.publish.assert_not_called()
+    outer_closed.set()
+    thread.join(timeout=5)
+
+    assert client.publish.call_args_list == [
+        call("a/config", b"{}"),
+        call("b/config", b"{}"),
+        call("b/state", b"ON"),
+    ]
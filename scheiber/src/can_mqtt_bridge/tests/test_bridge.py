@@ -5,18 +5,30 @@ Tests initialization, MQTT discovery, state publishing, and command handling.
 """
 
 import json
-import sys
-import time
-from pathlib import Path
-from unittest.mock import MagicMock, Mock, call, patch
+from types import SimpleNamespace
+from unittest.mock import DEFAULT, MagicMock, Mock, call
 
 import pytest
-
-# Add parent directories to path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-
+from can_mqtt_bridge import bridge as bridge_module
 from can_mqtt_bridge.bridge import MQTTBridge
 
+# (easing, brightness, transition) fade commands covering every easing function
+EASING_CASES = [
+    ("linear", 180, 1.0),
+    ("ease_in_sine", 200, 2.0),
+    ("ease_out_sine", 150, 1.5),
+    ("ease_in_out_sine", 255, 3.0),
+    ("ease_in_quad", 100, 0.5),
+    ("ease_out_quad", 220, 2.5),
+    ("ease_in_out_quad", 80, 1.2),
+    ("ease_in_cubic", 190, 1.8),
+    ("ease_out_cubic", 160, 2.2),
+    ("ease_in_out_cubic", 240, 3.5),
+    ("ease_in_quart", 120, 1.1),
+    ("ease_out_quart", 210, 2.8),
+    ("ease_in_out_quart", 170, 2.3),
+]
+
 
 def create_mock_mqtt_message(topic: str, payload: bytes, retained: bool = False):
     """Helper to create a mock MQTT message with all required attributes."""
@@ -24,22 +36,155 @@ def create_mock_mqtt_message(topic: str, payload: bytes, retained: bool = False)
     msg.topic = topic
     msg.payload = payload
     msg.retain = retained
-    msg.timestamp = time.time() if retained else None
     return msg
 
 
+@pytest.fixture
+def patched_mqtt(monkeypatch):
+    """Patch the MQTT client and Scheiber system created by MQTTBridge."""
+    mock_client = MagicMock()
+    mock_system = MagicMock()
+    mock_system.get_all_devices.return_value = []
+
+    monkeypatch.setattr(
+        "can_mqtt_bridge.bridge.mqtt.Client", MagicMock(return_value=mock_client)
+    )
+    monkeypatch.setattr(
+        "can_mqtt_bridge.bridge.create_scheiber_system",
+        MagicMock(return_value=mock_system),
+    )
+    return mock_client, mock_system
+
+
+@pytest.fixture
+def published(patched_mqtt):
+    """Payloads the bridge publishes, indexed by topic as they are recorded."""
+    mock_client, _ = patched_mqtt
+    by_topic = {}
+
+    def record(topic, payload=None, *args, **kwargs):
+        by_topic.setdefault(topic, []).append(payload)
+        return DEFAULT
+
+    mock_client.publish.side_effect = record
+    return by_topic
+
+
+class Bloc9Device:
+    """Stand-in Bloc9; the bridge derives the device type from the class name."""
+
+    def __init__(self, lights=(), switches=(), pulses=(), device_id=7, segment_id=0):
+        self.device_id = device_id
+        self.segment_id = segment_id
+        self.route_slug = (
+            f"{device_id}" if segment_id == 0 else f"{device_id}_{segment_id}"
+        )
+        self._lights = list(lights)
+        self._switches = list(switches)
+        self._pulses = list(pulses)
+
+    def get_lights(self):
+        return self._lights
+
+    def get_switches(self):
+        return self._switches
+
+    def get_pulses(self):
+        return self._pulses
+
+    def get_sensors(self):
+        return []
+
+    def get_air_switch_buttons(self):
+        return []
+
+
+class Bloc7Device:
+    """Stand-in Bloc7 sensor device."""
+
+    def __init__(self, sensors=(), device_id=21, segment_id=0):
+        self.device_id = device_id
+        self.segment_id = segment_id
+        self.route_slug = (
+            f"{device_id}" if segment_id == 0 else f"{device_id}_{segment_id}"
+        )
+        self._sensors = list(sensors)
+
+    def get_sensors(self):
+        return self._sensors
+
+
+class AirSwitchDevice:
+    """Stand-in receiver for wireless Air Switch buttons."""
+
+    def __init__(self, buttons=(), device_id=1):
+        self.device_id = device_id
+        self._buttons = list(buttons)
+
+    def get_sensors(self):
+        return []
+
+    def get_air_switch_buttons(self):
+        return self._buttons
+
+
+def make_light(entity_id="s1", name="S1", switch_nr=0, state=False, brightness=0):
+    """Build a hardware light; only the methods tests assert on are mocks."""
+    return SimpleNamespace(
+        name=name,
+        entity_id=entity_id,
+        switch_nr=switch_nr,  # 0-based index
+        _default_easing="ease_in_out_sine",
+        get_state=Mock(return_value={"state": state, "brightness": brightness}),
+        subscribe=Mock(),
+        unsubscribe=Mock(),
+        set=Mock(),
+        set_brightness=Mock(),
+        fade_to=Mock(),
+        flash=Mock(),
+    )
+
+
+def make_switch(entity_id="switch_1", name="Switch 1", switch_nr=0):
+    """Build a hardware switch."""
+    return SimpleNamespace(
+        name=name,
+        entity_id=entity_id,
+        switch_nr=switch_nr,
+        get_state=Mock(return_value=False),
+        subscribe=Mock(),
+        unsubscribe=Mock(),
+        set=Mock(),
+    )
+
+
+def make_pulse(entity_id, name, switch_nr=0):
+    """Build a hardware pulse output."""
+    return SimpleNamespace(
+        name=name, entity_id=entity_id, switch_nr=switch_nr, press=Mock()
+    )
+
+
+@pytest.fixture
+def bridge_with(patched_mqtt):
+    """Start a default bridge serving the given devices."""
+    mock_client, mock_system = patched_mqtt
+
+    def _bridge_with(*devices, **kwargs):
+        mock_system.get_all_devices.return_value = list(devices)
+        bridge = MQTTBridge(can_interface="can0", mqtt_host="localhost", **kwargs)
+        bridge.start()
+        return bridge
+
+    return _bridge_with
+
+
 class TestMQTTBridgeInit:
     """Test MQTTBridge initialization."""
 
-    @patch("can_mqtt_bridge.bridge.mqtt.Client")
-    @patch("can_mqtt_bridge.bridge.create_scheiber_system")
-    def test_initialization_minimal(self, mock_create_system, mock_mqtt_client):
+    def test_initialization_minimal(self, patched_mqtt):
         """Test bridge initializes with minimal parameters."""
-        mock_system = MagicMock()
-        mock_create_system.return_value = mock_system
-
-        mock_client = MagicMock()
-        mock_mqtt_client.return_value = mock_client
+        mock_client, _ = patched_mqtt
 
         bridge = MQTTBridge(
             can_interface="can0",
@@ -51,7 +196,7 @@ class TestMQTTBridgeInit:
         assert bridge._running is False
 
         # Verify system creation
-        mock_create_system.assert_called_once_with(
+        bridge_module.create_scheiber_system.assert_called_once_with(
             can_interface="can0",
             config_path=None,
             state_file=None,
@@ -63,15 +208,9 @@ class TestMQTTBridgeInit:
         mock_client.connect.assert_called_once_with("localhost", 1883, 60)
         mock_client.loop_start.assert_called_once()
 
-    @patch("can_mqtt_bridge.bridge.mqtt.Client")
-    @patch("can_mqtt_bridge.bridge.create_scheiber_system")
-    def test_initialization_full_params(self, mock_create_system, mock_mqtt_client):
+    def test_initialization_full_params(self, patched_mqtt):
         """Test bridge initializes with all parameters."""
-        mock_system = MagicMock()
-        mock_create_system.return_value = mock_system
-
-        mock_client = MagicMock()
-        mock_mqtt_client.return_value = mock_client
+        mock_client, _ = patched_mqtt
 
         bridge = MQTTBridge(
             can_interface="can1",
@@ -95,16 +234,10 @@ class TestMQTTBridgeInit:
         # Verify MQTT connection
         mock_client.connect.assert_called_once_with("mqtt.example.com", 8883, 60)
 
-    @patch("can_mqtt_bridge.bridge.mqtt.Client")
-    @patch("can_mqtt_bridge.bridge.create_scheiber_system")
-    def test_initialization_mqtt_failure(self, mock_create_system, mock_mqtt_client):
+    def test_initialization_mqtt_failure(self, patched_mqtt):
         """Test bridge handles MQTT connection failure."""
-        mock_system = MagicMock()
-        mock_create_system.return_value = mock_system
-
-        mock_client = MagicMock()
+        mock_client, _ = patched_mqtt
         mock_client.connect.side_effect = Exception("Connection failed")
-        mock_mqtt_client.return_value = mock_client
 
         with pytest.raises(Exception, match="Connection failed"):
             MQTTBridge(can_interface="can0", mqtt_host="localhost")
@@ -113,55 +246,31 @@ class TestMQTTBridgeInit:
 class TestMQTTBridgeStartStop:
     """Test bridge start/stop lifecycle."""
 
-    @patch("can_mqtt_bridge.bridge.mqtt.Client")
-    @patch("can_mqtt_bridge.bridge.create_scheiber_system")
-    def test_start_bridge(self, mock_create_system, mock_mqtt_client):
+    def test_start_bridge(self, patched_mqtt, bridge_with):
         """Test starting the bridge."""
-        mock_system = MagicMock()
-        mock_system.get_all_devices.return_value = []
-        mock_create_system.return_value = mock_system
-
-        mock_client = MagicMock()
-        mock_mqtt_client.return_value = mock_client
+        _, mock_system = patched_mqtt
 
-        bridge = MQTTBridge(can_interface="can0", mqtt_host="localhost")
-        bridge.start()
+        bridge = bridge_with()
 
         assert bridge._running is True
         mock_system.start.assert_called_once()
 
-    @patch("can_mqtt_bridge.bridge.mqtt.Client")
-    @patch("can_mqtt_bridge.bridge.create_scheiber_system")
-    def test_start_already_running(self, mock_create_system, mock_mqtt_client):
+    def test_start_already_running(self, patched_mqtt, bridge_with):
         """Test starting bridge when already running does nothing."""
-        mock_system = MagicMock()
-        mock_system.get_all_devices.return_value = []
-        mock_create_system.return_value = mock_system
-
-        mock_client = MagicMock()
-        mock_mqtt_client.return_value = mock_client
+        _, mock_system = patched_mqtt
 
-        bridge = MQTTBridge(can_interface="can0", mqtt_host="localhost")
-        bridge.start()
+        bridge = bridge_with()
         mock_system.start.reset_mock()
 
         bridge.start()  # Second call
 
         mock_system.start.assert_not_called()
 
-    @patch("can_mqtt_bridge.bridge.mqtt.Client")
-    @patch("can_mqtt_bridge.bridge.create_scheiber_system")
-    def test_stop_bridge(self, mock_create_system, mock_mqtt_client):
+    def test_stop_bridge(self, patched_mqtt, bridge_with):
         """Test stopping the bridge."""
-        mock_system = MagicMock()
-        mock_system.get_all_devices.return_value = []
-        mock_create_system.return_value = mock_system
-
-        mock_client = MagicMock()
-        mock_mqtt_client.return_value = mock_client
+        mock_client, mock_system = patched_mqtt
 
-        bridge = MQTTBridge(can_interface="can0", mqtt_host="localhost")
-        bridge.start()
+        bridge = bridge_with()
         bridge.stop()
 
         assert bridge._running is False
@@ -173,51 +282,18 @@ class TestMQTTBridgeStartStop:
 class TestMQTTDiscoveryLights:
     """Test MQTT discovery config publishing for lights."""
 
-    @patch("can_mqtt_bridge.bridge.mqtt.Client")
-    @patch("can_mqtt_bridge.bridge.create_scheiber_system")
-    def test_light_discovery_config(self, mock_create_system, mock_mqtt_client):
+    def test_light_discovery_config(self, published, bridge_with):
         """Test light discovery config is published correctly."""
-        # Setup mock light
-        mock_light = MagicMock()
-        mock_light.name = "Shower"
-        mock_light.entity_id = "owners_cabin_light_shower"
-        mock_light.switch_nr = 0  # 0-based index
-        mock_light.get_state.return_value = {"state": False, "brightness": 0}
-        mock_light.subscribe = Mock()
-
-        # Setup mock device
-        mock_device = MagicMock()
-        mock_device.__class__.__name__ = "Bloc9Device"
-        mock_device.device_id = 7
-        mock_device.get_lights.return_value = [mock_light]
-        mock_device.get_switches.return_value = []
-
-        mock_system = MagicMock()
-        mock_system.get_all_devices.return_value = [mock_device]
-        mock_create_system.return_value = mock_system
-
-        mock_client = MagicMock()
-        mock_mqtt_client.return_value = mock_client
+        light = make_light(entity_id="owners_cabin_light_shower", name="Shower")
 
-        bridge = MQTTBridge(can_interface="can0", mqtt_host="localhost")
-        bridge.start()
+        bridge_with(Bloc9Device(lights=[light]))
 
-        # Find discovery config publish call
-        discovery_calls = [
-            call
-            for call in mock_client.publish.call_args_list
-            if "/config" in str(call)
+        # Config topic uses the entity_id
+        config_payloads = published[
+            "homeassistant/light/owners_cabin_light_shower/config"
         ]
-
-        assert len(discovery_calls) > 0
-
-        # Get the discovery config
-        config_topic = discovery_calls[0][0][0]
-        config_payload = discovery_calls[0][0][1]
-        config = json.loads(config_payload)
-
-        # Verify config topic (uses entity_id)
-        assert config_topic == "homeassistant/light/owners_cabin_light_shower/config"
+        assert len(config_payloads) == 1
+        config = json.loads(config_payloads[0])
 
         # Verify config content
         assert config["name"] == "Owners Cabin Light Shower"
@@ -239,59 +315,27 @@ class TestMQTTDiscoveryLights:
         assert config["device"]["manufacturer"] == "Scheiber"
         assert config["device"]["model"] == "Marine Lighting Control System"
 
-    @patch("can_mqtt_bridge.bridge.mqtt.Client")
-    @patch("can_mqtt_bridge.bridge.create_scheiber_system")
     def test_duplicate_light_entity_id_creates_one_logical_entity(
-        self, mock_create_system, mock_mqtt_client
+        self, published, bridge_with
     ):
-        first_light = MagicMock()
-        first_light.name = "Underwater Port"
-        first_light.entity_id = "underwater_light"
-        first_light.switch_nr = 0
-        first_light.get_state.return_value = {"state": False, "brightness": 0}
-        first_light.subscribe = Mock()
-
-        second_light = MagicMock()
-        second_light.name = "Underwater Starboard"
-        second_light.entity_id = "underwater_light"
-        second_light.switch_nr = 1
-        second_light.get_state.return_value = {"state": True, "brightness": 255}
-        second_light.subscribe = Mock()
-
-        first_device = MagicMock()
-        first_device.__class__.__name__ = "Bloc9Device"
-        first_device.device_id = 7
-        first_device.segment_id = 0
-        first_device.get_lights.return_value = [first_light]
-        first_device.get_switches.return_value = []
-        first_device.get_sensors.return_value = []
-
-        second_device = MagicMock()
-        second_device.__class__.__name__ = "Bloc9Device"
-        second_device.device_id = 8
-        second_device.segment_id = 0
-        second_device.get_lights.return_value = [second_light]
-        second_device.get_switches.return_value = []
-        second_device.get_sensors.return_value = []
-
-        mock_system = MagicMock()
-        mock_system.get_all_devices.return_value = [first_device, second_device]
-        mock_create_system.return_value = mock_system
-
-        mock_client = MagicMock()
-        mock_mqtt_client.return_value = mock_client
+        first_light = make_light(entity_id="underwater_light", name="Underwater Port")
+        second_light = make_light(
+            entity_id="underwater_light",
+            name="Underwater Starboard",
+            switch_nr=1,
+            state=True,
+            brightness=255,
+        )
 
-        bridge = MQTTBridge(can_interface="can0", mqtt_host="localhost")
-        bridge.start()
+        bridge_with(
+            Bloc9Device(lights=[first_light], device_id=7),
+            Bloc9Device(lights=[second_light], device_id=8),
+        )
 
-        config_calls = [
-            call
-            for call in mock_client.publish.call_args_list
-            if call[0][0] == "homeassistant/light/underwater_light/config"
-        ]
+        config_payloads = published["homeassistant/light/underwater_light/config"]
 
-        assert len(config_calls) == 1
-        discovery_config = json.loads(config_calls[0][0][1])
+        assert len(config_payloads) == 1
+        discovery_config = json.loads(config_payloads[0])
         assert (
             discovery_config["unique_id"] == "scheiber_logical_light_underwater_light"
         )
@@ -302,57 +346,21 @@ class TestMQTTDiscoveryLights:
         assert first_light.subscribe.call_count == 1
         assert second_light.subscribe.call_count == 1
 
-    @patch("can_mqtt_bridge.bridge.mqtt.Client")
-    @patch("can_mqtt_bridge.bridge.create_scheiber_system")
     def test_duplicate_pulse_entity_id_creates_one_logical_button(
-        self, mock_create_system, mock_mqtt_client
+        self, published, bridge_with
     ):
-        first_pulse = MagicMock()
-        first_pulse.name = "Door close port"
-        first_pulse.entity_id = "flybridge_door_close"
-        first_pulse.switch_nr = 1
-
-        second_pulse = MagicMock()
-        second_pulse.name = "Door close starboard"
-        second_pulse.entity_id = "flybridge_door_close"
-        second_pulse.switch_nr = 1
-
-        first_device = MagicMock()
-        first_device.__class__.__name__ = "Bloc9Device"
-        first_device.device_id = 7
-        first_device.segment_id = 0
-        first_device.get_lights.return_value = []
-        first_device.get_switches.return_value = []
-        first_device.get_pulses.return_value = [first_pulse]
-        first_device.get_sensors.return_value = []
-
-        second_device = MagicMock()
-        second_device.__class__.__name__ = "Bloc9Device"
-        second_device.device_id = 8
-        second_device.segment_id = 0
-        second_device.get_lights.return_value = []
-        second_device.get_switches.return_value = []
-        second_device.get_pulses.return_value = [second_pulse]
-        second_device.get_sensors.return_value = []
-
-        mock_system = MagicMock()
-        mock_system.get_all_devices.return_value = [first_device, second_device]
-        mock_create_system.return_value = mock_system
-
-        mock_client = MagicMock()
-        mock_mqtt_client.return_value = mock_client
+        first_pulse = make_pulse("flybridge_door_close", "Door close port", 1)
+        second_pulse = make_pulse("flybridge_door_close", "Door close starboard", 1)
 
-        bridge = MQTTBridge(can_interface="can0", mqtt_host="localhost")
-        bridge.start()
+        bridge_with(
+            Bloc9Device(pulses=[first_pulse], device_id=7),
+            Bloc9Device(pulses=[second_pulse], device_id=8),
+        )
 
-        config_calls = [
-            call
-            for call in mock_client.publish.call_args_list
-            if call[0][0] == "homeassistant/button/flybridge_door_close/config"
-        ]
+        config_payloads = published["homeassistant/button/flybridge_door_close/config"]
 
-        assert len(config_calls) == 1
-        discovery_config = json.loads(config_calls[0][0][1])
+        assert len(config_payloads) == 1
+        discovery_config = json.loads(config_payloads[0])
         assert (
             discovery_config["unique_id"]
             == "scheiber_logical_button_flybridge_door_close"
@@ -366,45 +374,23 @@ class TestMQTTDiscoveryLights:
 class TestMQTTSensors:
     """Test MQTT sensor setup for Bloc7 devices."""
 
-    @patch("can_mqtt_bridge.bridge.mqtt.Client")
-    @patch("can_mqtt_bridge.bridge.create_scheiber_system")
-    def test_bloc7_sensor_discovery_and_state_publish(
-        self, mock_create_system, mock_mqtt_client
-    ):
-        mock_sensor = MagicMock()
-        mock_sensor.name = "Black water 1"
-        mock_sensor.entity_id = "black_water_1"
-        mock_sensor.unit_of_measurement = "%"
-        mock_sensor.device_class = None
-        mock_sensor.icon = "mdi:water-percent"
-        mock_sensor.get_value.return_value = 51
-        mock_sensor.subscribe = Mock()
-
-        mock_device = MagicMock()
-        mock_device.__class__.__name__ = "Bloc7Device"
-        mock_device.device_id = 21
-        mock_device.segment_id = 0
-        mock_device.route_slug = "21"
-        mock_device.get_lights.return_value = []
-        mock_device.get_switches.return_value = []
-        mock_device.get_sensors.return_value = [mock_sensor]
-
-        mock_system = MagicMock()
-        mock_system.get_all_devices.return_value = [mock_device]
-        mock_create_system.return_value = mock_system
-
-        mock_client = MagicMock()
-        mock_mqtt_client.return_value = mock_client
+    def test_bloc7_sensor_discovery_and_state_publish(self, published, bridge_with):
+        sensor = SimpleNamespace(
+            name="Black water 1",
+            entity_id="black_water_1",
+            unit_of_measurement="%",
+            device_class=None,
+            icon="mdi:water-percent",
+            get_value=Mock(return_value=51),
+            subscribe=Mock(),
+            unsubscribe=Mock(),
+        )
 
-        bridge = MQTTBridge(can_interface="can0", mqtt_host="localhost")
-        bridge.start()
+        bridge_with(Bloc7Device(sensors=[sensor], device_id=21))
 
-        discovery_call = next(
-            call
-            for call in mock_client.publish.call_args_list
-            if call[0][0] == "homeassistant/sensor/black_water_1/config"
+        discovery_config = json.loads(
+            published["homeassistant/sensor/black_water_1/config"][0]
         )
-        discovery_config = json.loads(discovery_call[0][1])
 
         assert discovery_config["name"] == "Black Water 1"
         assert discovery_config["unique_id"] == "scheiber_bloc7_21_black_water_1"
@@ -416,51 +402,19 @@ class TestMQTTSensors:
         assert discovery_config["icon"] == "mdi:water-percent"
         assert discovery_config["unit_of_measurement"] == "%"
         assert discovery_config["state_class"] == "measurement"
-        assert mock_sensor.subscribe.call_count == 1
-        assert any(
-            call[0][0] == "homeassistant/scheiber/bloc7/21/black_water_1/state"
-            and call[0][1] == "51"
-            for call in mock_client.publish.call_args_list
-        )
+        assert sensor.subscribe.call_count == 1
+        assert b"51" in published["homeassistant/scheiber/bloc7/21/black_water_1/state"]
 
-    @patch("can_mqtt_bridge.bridge.mqtt.Client")
-    @patch("can_mqtt_bridge.bridge.create_scheiber_system")
     def test_light_discovery_config_includes_segment_id_in_topics(
-        self, mock_create_system, mock_mqtt_client
+        self, published, bridge_with
     ):
-        mock_light = MagicMock()
-        mock_light.name = "S1"
-        mock_light.entity_id = "master_cabin_light_shower"
-        mock_light.switch_nr = 0
-        mock_light.get_state.return_value = {"state": False, "brightness": 0}
-        mock_light.subscribe = Mock()
-
-        mock_device = MagicMock()
-        mock_device.__class__.__name__ = "Bloc9Device"
-        mock_device.device_id = 7
-        mock_device.segment_id = 3
-        mock_device.route_slug = "7_3"
-        mock_device.get_lights.return_value = [mock_light]
-        mock_device.get_switches.return_value = []
-
-        mock_system = MagicMock()
-        mock_system.get_all_devices.return_value = [mock_device]
-        mock_create_system.return_value = mock_system
-
-        mock_client = MagicMock()
-        mock_mqtt_client.return_value = mock_client
-
-        bridge = MQTTBridge(can_interface="can0", mqtt_host="localhost")
-        bridge.start()
+        light = make_light(entity_id="master_cabin_light_shower")
 
-        discovery_calls = [
-            call
-            for call in mock_client.publish.call_args_list
-            if "/config" in str(call)
-        ]
+        bridge_with(Bloc9Device(lights=[light], device_id=7, segment_id=3))
 
-        config_payload = discovery_calls[0][0][1]
-        config = json.loads(config_payload)
+        config = json.loads(
+            published["homeassistant/light/master_cabin_light_shower/config"][0]
+        )
 
         assert config["name"] == "Master Cabin Light Shower"
         assert config["unique_id"] == "scheiber_bloc9_7_3_s1"
@@ -481,86 +435,26 @@ class TestMQTTSensors:
         assert "ease_in_quad" in config["effect_list"]
         assert "ease_out_quart" in config["effect_list"]
 
-    @patch("can_mqtt_bridge.bridge.mqtt.Client")
-    @patch("can_mqtt_bridge.bridge.create_scheiber_system")
-    def test_light_availability_published(self, mock_create_system, mock_mqtt_client):
+    def test_light_availability_published(self, published, bridge_with):
         """Test light availability is published as online."""
-        mock_light = MagicMock()
-        mock_light.name = "S1"  # Human-readable name
-        mock_light.entity_id = "s1"  # Entity ID
-        mock_light.switch_nr = 0  # 0-based index
-        mock_light.get_state.return_value = {"state": False, "brightness": 0}
-        mock_light.subscribe = Mock()
-
-        mock_device = MagicMock()
-        mock_device.__class__.__name__ = "Bloc9Device"
-        mock_device.device_id = 7
-        mock_device.get_lights.return_value = [mock_light]
-        mock_device.get_switches.return_value = []
-
-        mock_system = MagicMock()
-        mock_system.get_all_devices.return_value = [mock_device]
-        mock_create_system.return_value = mock_system
-
-        mock_client = MagicMock()
-        mock_mqtt_client.return_value = mock_client
-
-        bridge = MQTTBridge(can_interface="can0", mqtt_host="localhost")
-        bridge.start()
-
-        # Find availability publish call
-        availability_calls = [
-            call
-            for call in mock_client.publish.call_args_list
-            if "availability" in str(call[0][0]) and call[0][1] == "online"
-        ]
+        bridge_with(Bloc9Device(lights=[make_light()]))
 
-        assert len(availability_calls) > 0
-        assert (
-            availability_calls[0][0][0]
-            == "homeassistant/scheiber/bloc9/7/s1/availability"
-        )
+        assert published["homeassistant/scheiber/bloc9/7/s1/availability"] == ["online"]
 
-    @patch("can_mqtt_bridge.bridge.mqtt.Client")
-    @patch("can_mqtt_bridge.bridge.create_scheiber_system")
-    def test_light_command_subscription(self, mock_create_system, mock_mqtt_client):
+    def test_light_command_subscription(self, patched_mqtt, bridge_with):
         """Test bridge subscribes to light command topics."""
-        mock_light = MagicMock()
-        mock_light.name = "S1"  # Human-readable name
-        mock_light.entity_id = "s1"  # Entity ID
-        mock_light.switch_nr = 0  # 0-based index
-        mock_light.get_state.return_value = {"state": False, "brightness": 0}
-        mock_light.subscribe = Mock()
-
-        mock_device = MagicMock()
-        mock_device.__class__.__name__ = "Bloc9Device"
-        mock_device.device_id = 7
-        mock_device.get_lights.return_value = [mock_light]
-        mock_device.get_switches.return_value = []
-
-        mock_system = MagicMock()
-        mock_system.get_all_devices.return_value = [mock_device]
-        mock_create_system.return_value = mock_system
-
-        mock_client = MagicMock()
-        mock_mqtt_client.return_value = mock_client
+        mock_client, _ = patched_mqtt
 
-        bridge = MQTTBridge(can_interface="can0", mqtt_host="localhost")
-        bridge.start()
+        bridge_with(Bloc9Device(lights=[make_light()]))
 
         # Verify subscription
-        subscribe_calls = [call[0][0] for call in mock_client.subscribe.call_args_list]
-        assert "homeassistant/scheiber/bloc9/7/s1/set" in subscribe_calls
+        mock_client.subscribe.assert_any_call("homeassistant/scheiber/bloc9/7/s1/set")
 
 
 class TestMQTTAirSwitchButtons:
     """Test MQTT event-entity setup for wireless Air Switch buttons."""
 
-    @patch("can_mqtt_bridge.bridge.mqtt.Client")
-    @patch("can_mqtt_bridge.bridge.create_scheiber_system")
-    def test_air_switch_button_discovery_and_press_event(
-        self, mock_create_system, mock_mqtt_client
-    ):
+    def test_air_switch_button_discovery_and_press_event(self, published, bridge_with):
         from scheiber.air_switch import AirSwitchButton
 
         hardware_button = AirSwitchButton(
@@ -570,31 +464,11 @@ class TestMQTTAirSwitchButtons:
             entity_id="bow_salon_top_left",
         )
 
-        mock_device = MagicMock()
-        mock_device.__class__.__name__ = "AirSwitchDevice"
-        mock_device.device_id = 1
-        mock_device.get_lights.return_value = []
-        mock_device.get_switches.return_value = []
-        mock_device.get_pulses.return_value = []
-        mock_device.get_sensors.return_value = []
-        mock_device.get_air_switch_buttons.return_value = [hardware_button]
-
-        mock_system = MagicMock()
-        mock_system.get_all_devices.return_value = [mock_device]
-        mock_create_system.return_value = mock_system
-
-        mock_client = MagicMock()
-        mock_mqtt_client.return_value = mock_client
-
-        bridge = MQTTBridge(can_interface="can0", mqtt_host="localhost")
-        bridge.start()
+        bridge_with(AirSwitchDevice(buttons=[hardware_button]))
 
-        discovery_call = next(
-            call
-            for call in mock_client.publish.call_args_list
-            if call[0][0] == "homeassistant/event/bow_salon_top_left/config"
+        discovery_config = json.loads(
+            published["homeassistant/event/bow_salon_top_left/config"][0]
         )
-        discovery_config = json.loads(discovery_call[0][1])
         assert discovery_config["event_types"] == ["press"]
         assert discovery_config["device_class"] == "button"
         assert discovery_config["unique_id"] == "scheiber_air_switch_52ab81_btn2"
@@ -602,85 +476,35 @@ class TestMQTTAirSwitchButtons:
         # A real press on the hardware object should publish a press event,
         # exercising the full device -> MQTT wiring done in bridge.start().
         hardware_button.handle_observation(True)
-        state_call = next(
-            call
-            for call in mock_client.publish.call_args_list
-            if call[0][0] == "homeassistant/scheiber/air_switch/52ab81/btn2/state"
-        )
-        assert json.loads(state_call[0][1]) == {"event_type": "press"}
+        state_payloads = published[
+            "homeassistant/scheiber/air_switch/52ab81/btn2/state"
+        ]
+        assert json.loads(state_payloads[0]) == {"event_type": "press"}
 
-    @patch("can_mqtt_bridge.bridge.mqtt.Client")
-    @patch("can_mqtt_bridge.bridge.create_scheiber_system")
     def test_devices_without_air_switch_buttons_are_skipped(
-        self, mock_create_system, mock_mqtt_client
+        self, published, bridge_with
     ):
-        mock_device = MagicMock()
-        mock_device.__class__.__name__ = "Bloc9Device"
-        mock_device.device_id = 7
-        mock_device.get_lights.return_value = []
-        mock_device.get_switches.return_value = []
-        mock_device.get_pulses.return_value = []
-        mock_device.get_sensors.return_value = []
-        mock_device.get_air_switch_buttons.return_value = []
-
-        mock_system = MagicMock()
-        mock_system.get_all_devices.return_value = [mock_device]
-        mock_create_system.return_value = mock_system
-
-        mock_client = MagicMock()
-        mock_mqtt_client.return_value = mock_client
-
-        bridge = MQTTBridge(can_interface="can0", mqtt_host="localhost")
-        bridge.start()  # must not raise
+        bridge_with(Bloc9Device())  # must not raise
 
-        assert not any(
-            "/event/" in call[0][0] for call in mock_client.publish.call_args_list
-        )
+        assert not any("/event/" in topic for topic in published)
 
 
 class TestMQTTDiscoverySwitches:
     """Test MQTT discovery config publishing for switches."""
 
-    @patch("can_mqtt_bridge.bridge.mqtt.Client")
-    @patch("can_mqtt_bridge.bridge.create_scheiber_system")
-    def test_switch_discovery_config(self, mock_create_system, mock_mqtt_client):
+    def test_switch_discovery_config(self, published, bridge_with):
         """Test switch discovery config is published correctly."""
-        mock_switch = MagicMock()
-        mock_switch.name = "Fan"
-        mock_switch.entity_id = "owners_cabin_switch_fan"
-        mock_switch.switch_nr = 0
-        mock_switch.get_state.return_value = False
-        mock_switch.subscribe = Mock()
-
-        mock_device = MagicMock()
-        mock_device.__class__.__name__ = "Bloc9Device"
-        mock_device.device_id = 7
-        mock_device.get_lights.return_value = []
-        mock_device.get_switches.return_value = [mock_switch]
-
-        mock_system = MagicMock()
-        mock_system.get_all_devices.return_value = [mock_device]
-        mock_create_system.return_value = mock_system
-
-        mock_client = MagicMock()
-        mock_mqtt_client.return_value = mock_client
+        switch = make_switch(entity_id="owners_cabin_switch_fan", name="Fan")
 
-        bridge = MQTTBridge(can_interface="can0", mqtt_host="localhost")
-        bridge.start()
+        bridge_with(Bloc9Device(switches=[switch]))
 
-        # Find discovery config
-        discovery_calls = [
-            call
-            for call in mock_client.publish.call_args_list
-            if "/config" in str(call)
+        # Config topic uses the entity_id, state topics use the output (s1)
+        config_payloads = published[
+            "homeassistant/switch/owners_cabin_switch_fan/config"
         ]
+        assert len(config_payloads) == 1
+        config = json.loads(config_payloads[0])
 
-        config_topic = discovery_calls[0][0][0]
-        config_payload = discovery_calls[0][0][1]
-        config = json.loads(config_payload)
-
-        # Verify config (uses entity_id in config topic, s1 in state topic)
-        assert config_topic == "homeassistant/switch/owners_cabin_switch_fan/config"
         assert config["name"] == "Owners Cabin Switch Fan"
         assert config["unique_id"] == "scheiber_bloc9_7_s1"
         assert config["state_topic"] == "homeassistant/scheiber/bloc9/7/s1/state"
@@ -699,139 +523,52 @@ class TestMQTTDiscoverySwitches:
 class TestStatePublishing:
     """Test state publishing to MQTT."""
 
-    @patch("can_mqtt_bridge.bridge.mqtt.Client")
-    @patch("can_mqtt_bridge.bridge.create_scheiber_system")
-    def test_light_state_change_published(self, mock_create_system, mock_mqtt_client):
+    def test_light_state_change_published(self, published, bridge_with):
         """Test light state changes are published to MQTT."""
-        mock_light = MagicMock()
-        mock_light.name = "S1"  # Human-readable name
-        mock_light.entity_id = "s1"  # Entity ID
-        mock_light.switch_nr = 0  # 0-based index
-        mock_light.get_state.return_value = {"state": False, "brightness": 0}
-
-        # Capture the callback
-        callback_holder = []
-
-        def capture_callback(callback):
-            callback_holder.append(callback)
-
-        mock_light.subscribe = capture_callback
-
-        mock_device = MagicMock()
-        mock_device.__class__.__name__ = "Bloc9Device"
-        mock_device.device_id = 7
-        mock_device.get_lights.return_value = [mock_light]
-        mock_device.get_switches.return_value = []
+        light = make_light()
 
-        mock_system = MagicMock()
-        mock_system.get_all_devices.return_value = [mock_device]
-        mock_create_system.return_value = mock_system
+        bridge_with(Bloc9Device(lights=[light]))
 
-        mock_client = MagicMock()
-        mock_mqtt_client.return_value = mock_client
-
-        bridge = MQTTBridge(can_interface="can0", mqtt_host="localhost")
-        bridge.start()
-
-        # Reset publish calls
-        mock_client.publish.reset_mock()
+        # Forget the startup publishes
+        published.clear()
 
-        # Trigger state change
-        assert len(callback_holder) == 1
-        state_callback = callback_holder[0]
+        # Trigger state change through the registered observer
+        assert light.subscribe.call_count == 1
+        state_callback = light.subscribe.call_args[0][0]
         state_callback({"state": True, "brightness": 200})
 
         # Verify state published
-        publish_calls = [call[0] for call in mock_client.publish.call_args_list]
-        state_publishes = [call for call in publish_calls if call[0].endswith("/state")]
-
-        assert len(state_publishes) == 1
-        topic, payload = state_publishes[0]
-        assert topic == "homeassistant/scheiber/bloc9/7/s1/state"
+        assert list(published) == ["homeassistant/scheiber/bloc9/7/s1/state"]
+        state_payloads = published["homeassistant/scheiber/bloc9/7/s1/state"]
+        assert len(state_payloads) == 1
 
-        state = json.loads(payload)
+        state = json.loads(state_payloads[0])
         assert state["state"] == "ON"
         assert state["brightness"] == 200
 
-    @patch("can_mqtt_bridge.bridge.mqtt.Client")
-    @patch("can_mqtt_bridge.bridge.create_scheiber_system")
-    def test_switch_state_change_published(self, mock_create_system, mock_mqtt_client):
+    def test_switch_state_change_published(self, published, bridge_with):
         """Test switch state changes are published to MQTT."""
-        mock_switch = MagicMock()
-        mock_switch.name = "Switch 1"
-        mock_switch.entity_id = "switch_1"
-        mock_switch.switch_nr = 0
-        mock_switch.get_state.return_value = False
-
-        callback_holder = []
-
-        def capture_callback(callback):
-            callback_holder.append(callback)
-
-        mock_switch.subscribe = capture_callback
-
-        mock_device = MagicMock()
-        mock_device.__class__.__name__ = "Bloc9Device"
-        mock_device.device_id = 7
-        mock_device.get_lights.return_value = []
-        mock_device.get_switches.return_value = [mock_switch]
+        switch = make_switch()
 
-        mock_system = MagicMock()
-        mock_system.get_all_devices.return_value = [mock_device]
-        mock_create_system.return_value = mock_system
+        bridge_with(Bloc9Device(switches=[switch]))
 
-        mock_client = MagicMock()
-        mock_mqtt_client.return_value = mock_client
-
-        bridge = MQTTBridge(can_interface="can0", mqtt_host="localhost")
-        bridge.start()
-
-        mock_client.publish.reset_mock()
+        published.clear()
 
         # Trigger state change
-        state_callback = callback_holder[0]
+        state_callback = switch.subscribe.call_args[0][0]
         state_callback({"state": True})
 
         # Verify
-        publish_calls = [call[0] for call in mock_client.publish.call_args_list]
-        state_publishes = [call for call in publish_calls if call[0].endswith("/state")]
-
-        assert len(state_publishes) == 1
-        topic, payload = state_publishes[0]
-        assert payload == "ON"
+        assert published == {"homeassistant/scheiber/bloc9/7/s1/state": [b"ON"]}
 
 
 class TestCommandHandling:
     """Test MQTT command handling."""
 
-    @patch("can_mqtt_bridge.bridge.mqtt.Client")
-    @patch("can_mqtt_bridge.bridge.create_scheiber_system")
-    def test_light_brightness_command(self, mock_create_system, mock_mqtt_client):
+    def test_light_brightness_command(self, bridge_with):
         """Test handling brightness command for light."""
-        mock_light = MagicMock()
-        mock_light.name = "S1"  # Human-readable name
-        mock_light.entity_id = "s1"  # Entity ID
-        mock_light.switch_nr = 0  # 0-based index
-        mock_light.get_state.return_value = {"state": False, "brightness": 0}
-        mock_light.subscribe = Mock()
-        mock_light.set = Mock()
-        mock_light._default_easing = "ease_in_out_sine"
-
-        mock_device = MagicMock()
-        mock_device.__class__.__name__ = "Bloc9Device"
-        mock_device.device_id = 7
-        mock_device.get_lights.return_value = [mock_light]
-        mock_device.get_switches.return_value = []
-
-        mock_system = MagicMock()
-        mock_system.get_all_devices.return_value = [mock_device]
-        mock_create_system.return_value = mock_system
-
-        mock_client = MagicMock()
-        mock_mqtt_client.return_value = mock_client
-
-        bridge = MQTTBridge(can_interface="can0", mqtt_host="localhost")
-        bridge.start()
+        light = make_light()
+        bridge = bridge_with(Bloc9Device(lights=[light]))
 
         # Verify entities were created
         assert len(bridge._mqtt_entities) > 0
@@ -844,35 +581,12 @@ class TestCommandHandling:
         bridge._on_mqtt_message(None, None, msg)
 
         # Verify command sent to light
-        mock_light.set.assert_called_once_with(state=True, brightness=150, effect=None)
+        light.set.assert_called_once_with(state=True, brightness=150, effect=None)
 
-    @patch("can_mqtt_bridge.bridge.mqtt.Client")
-    @patch("can_mqtt_bridge.bridge.create_scheiber_system")
-    def test_light_on_command(self, mock_create_system, mock_mqtt_client):
+    def test_light_on_command(self, bridge_with):
         """Test handling ON command for light."""
-        mock_light = MagicMock()
-        mock_light.name = "S1"  # Human-readable name
-        mock_light.entity_id = "s1"  # Entity ID
-        mock_light.switch_nr = 0  # 0-based index
-        mock_light.get_state.return_value = {"state": False, "brightness": 0}
-        mock_light.subscribe = Mock()
-        mock_light.set_brightness = Mock()
-
-        mock_device = MagicMock()
-        mock_device.__class__.__name__ = "Bloc9Device"
-        mock_device.device_id = 7
-        mock_device.get_lights.return_value = [mock_light]
-        mock_device.get_switches.return_value = []
-
-        mock_system = MagicMock()
-        mock_system.get_all_devices.return_value = [mock_device]
-        mock_create_system.return_value = mock_system
-
-        mock_client = MagicMock()
-        mock_mqtt_client.return_value = mock_client
-
-        bridge = MQTTBridge(can_interface="can0", mqtt_host="localhost")
-        bridge.start()
+        light = make_light()
+        bridge = bridge_with(Bloc9Device(lights=[light]))
 
         msg = create_mock_mqtt_message(
             "homeassistant/scheiber/bloc9/7/s1/set", b'{"state": "ON"}'
@@ -880,130 +594,66 @@ class TestCommandHandling:
 
         bridge._on_mqtt_message(None, None, msg)
 
-        mock_light.set_brightness.assert_called_once_with(255)
+        light.set_brightness.assert_called_once_with(255)
 
-    @patch("can_mqtt_bridge.bridge.mqtt.Client")
-    @patch("can_mqtt_bridge.bridge.create_scheiber_system")
-    def test_fade_command_with_effect(self, mock_create_system, mock_mqtt_client):
-        """Test fade command with custom easing effect."""
-        mock_light = MagicMock()
-        mock_light.name = "S1"  # Human-readable name
-        mock_light.entity_id = "s1"  # Entity ID
-        mock_light.switch_nr = 0  # 0-based index
-        mock_light.get_state.return_value = {"state": True, "brightness": 128}
-        mock_light.subscribe = Mock()
-
-        mock_device = MagicMock()
-        mock_device.__class__.__name__ = "Bloc9Device"
-        mock_device.device_id = 7
-        mock_device.get_lights.return_value = [mock_light]
-        mock_device.get_switches.return_value = []
-
-        mock_system = MagicMock()
-        mock_system.get_all_devices.return_value = [mock_device]
-        mock_create_system.return_value = mock_system
-
-        mock_client = MagicMock()
-        mock_mqtt_client.return_value = mock_client
+    def test_light_plain_off_command(self, bridge_with):
+        """Test handling a plain (non-JSON) OFF command for light."""
+        light = make_light(state=True, brightness=255)
+        bridge = bridge_with(Bloc9Device(lights=[light]))
 
-        bridge = MQTTBridge(can_interface="can0", mqtt_host="localhost")
-        bridge.start()
+        msg = create_mock_mqtt_message("homeassistant/scheiber/bloc9/7/s1/set", b"OFF")
+
+        bridge._on_mqtt_message(None, None, msg)
+
+        light.set_brightness.assert_called_once_with(0)
+
+    def test_fade_command_with_effect(self, patched_mqtt, bridge_with):
+        """Test fade command with custom easing effect."""
+        mock_client, _ = patched_mqtt
+        light = make_light(state=True, brightness=128)
+        bridge_with(Bloc9Device(lights=[light]))
 
         # Simulate fade command with custom effect
-        command_payload = json.dumps(
-            {
-                "state": "ON",
-                "brightness": 200,
-                "transition": 2.5,
-                "effect": "ease_in_quad",
-            }
+        command_payload = (
+            b'{"state": "ON", "brightness": 200, "transition": 2.5, '
+            b'"effect": "ease_in_quad"}'
         )
 
         # Find the message callback and invoke it
         on_message = mock_client.on_message
         msg = create_mock_mqtt_message(
-            "homeassistant/scheiber/bloc9/7/s1/set", command_payload.encode()
+            "homeassistant/scheiber/bloc9/7/s1/set", command_payload
         )
         on_message(mock_client, None, msg)
 
         # Verify fade_to was called with correct easing
-        mock_light.fade_to.assert_called_once_with(
-            200, duration=2.5, easing="ease_in_quad"
-        )
+        light.fade_to.assert_called_once_with(200, duration=2.5, easing="ease_in_quad")
 
-    @patch("can_mqtt_bridge.bridge.mqtt.Client")
-    @patch("can_mqtt_bridge.bridge.create_scheiber_system")
-    def test_fade_command_default_easing(self, mock_create_system, mock_mqtt_client):
+    def test_fade_command_default_easing(self, patched_mqtt, bridge_with):
         """Test fade command defaults to ease_in_out_sine when no effect specified."""
-        mock_light = MagicMock()
-        mock_light.name = "S1"  # Human-readable name
-        mock_light.entity_id = "s1"  # Entity ID
-        mock_light.switch_nr = 0  # 0-based index
-        mock_light.get_state.return_value = {"state": True, "brightness": 128}
-        mock_light.subscribe = Mock()
-        mock_light._default_easing = "ease_in_out_sine"
-
-        mock_device = MagicMock()
-        mock_device.__class__.__name__ = "Bloc9Device"
-        mock_device.device_id = 7
-        mock_device.get_lights.return_value = [mock_light]
-        mock_device.get_switches.return_value = []
-
-        mock_system = MagicMock()
-        mock_system.get_all_devices.return_value = [mock_device]
-        mock_create_system.return_value = mock_system
-
-        mock_client = MagicMock()
-        mock_mqtt_client.return_value = mock_client
-
-        bridge = MQTTBridge(can_interface="can0", mqtt_host="localhost")
-        bridge.start()
+        mock_client, _ = patched_mqtt
+        light = make_light(state=True, brightness=128)
+        bridge_with(Bloc9Device(lights=[light]))
 
         # Simulate fade command without effect
-        command_payload = json.dumps(
-            {"state": "ON", "brightness": 200, "transition": 2.5}
-        )
+        command_payload = b'{"state": "ON", "brightness": 200, "transition": 2.5}'
 
         # Find the message callback and invoke it
         on_message = mock_client.on_message
         msg = create_mock_mqtt_message(
-            "homeassistant/scheiber/bloc9/7/s1/set", command_payload.encode()
+            "homeassistant/scheiber/bloc9/7/s1/set", command_payload
         )
         on_message(mock_client, None, msg)
 
         # Verify fade_to was called with default easing
-        mock_light.fade_to.assert_called_once_with(
+        light.fade_to.assert_called_once_with(
             200, duration=2.5, easing="ease_in_out_sine"
         )
 
-    @patch("can_mqtt_bridge.bridge.mqtt.Client")
-    @patch("can_mqtt_bridge.bridge.create_scheiber_system")
-    def test_fade_command(self, mock_create_system, mock_mqtt_client):
+    def test_fade_command(self, bridge_with):
         """Test handling fade transition command."""
-        mock_light = MagicMock()
-        mock_light.name = "S1"  # Human-readable name
-        mock_light.entity_id = "s1"  # Entity ID
-        mock_light.switch_nr = 0  # 0-based index
-        mock_light.get_state.return_value = {"state": False, "brightness": 0}
-        mock_light.subscribe = Mock()
-        mock_light.fade_to = Mock()
-        mock_light._default_easing = "ease_in_out_sine"
-
-        mock_device = MagicMock()
-        mock_device.__class__.__name__ = "Bloc9Device"
-        mock_device.device_id = 7
-        mock_device.get_lights.return_value = [mock_light]
-        mock_device.get_switches.return_value = []
-
-        mock_system = MagicMock()
-        mock_system.get_all_devices.return_value = [mock_device]
-        mock_create_system.return_value = mock_system
-
-        mock_client = MagicMock()
-        mock_mqtt_client.return_value = mock_client
-
-        bridge = MQTTBridge(can_interface="can0", mqtt_host="localhost")
-        bridge.start()
+        light = make_light()
+        bridge = bridge_with(Bloc9Device(lights=[light]))
 
         msg = create_mock_mqtt_message(
             "homeassistant/scheiber/bloc9/7/s1/set",
@@ -1012,105 +662,42 @@ class TestCommandHandling:
 
         bridge._on_mqtt_message(None, None, msg)
 
-        mock_light.fade_to.assert_called_once_with(
+        light.fade_to.assert_called_once_with(
             200, duration=2, easing="ease_in_out_sine"
         )
 
-    @patch("can_mqtt_bridge.bridge.mqtt.Client")
-    @patch("can_mqtt_bridge.bridge.create_scheiber_system")
-    def test_multiple_easing_effects(self, mock_create_system, mock_mqtt_client):
+    @pytest.mark.parametrize(
+        "easing,brightness,duration",
+        EASING_CASES,
+        ids=[case[0] for case in EASING_CASES],
+    )
+    def test_multiple_easing_effects(
+        self, patched_mqtt, bridge_with, easing, brightness, duration
+    ):
         """Test that different easing effects are properly passed to hardware layer."""
-        mock_light = MagicMock()
-        mock_light.name = "S1"  # Human-readable name
-        mock_light.entity_id = "s1"  # Entity ID
-        mock_light.switch_nr = 0  # 0-based index
-        mock_light.get_state.return_value = {"state": True, "brightness": 128}
-        mock_light.subscribe = Mock()
-
-        mock_device = MagicMock()
-        mock_device.__class__.__name__ = "Bloc9Device"
-        mock_device.device_id = 7
-        mock_device.get_lights.return_value = [mock_light]
-        mock_device.get_switches.return_value = []
-
-        mock_system = MagicMock()
-        mock_system.get_all_devices.return_value = [mock_device]
-        mock_create_system.return_value = mock_system
-
-        mock_client = MagicMock()
-        mock_mqtt_client.return_value = mock_client
+        mock_client, _ = patched_mqtt
+        light = make_light(state=True, brightness=128)
+        bridge_with(Bloc9Device(lights=[light]))
 
-        bridge = MQTTBridge(can_interface="can0", mqtt_host="localhost")
-        bridge.start()
-
-        # Test various easing functions
-        test_cases = [
-            ("linear", 180, 1.0),
-            ("ease_in_sine", 200, 2.0),
-            ("ease_out_sine", 150, 1.5),
-            ("ease_in_out_sine", 255, 3.0),
-            ("ease_in_quad", 100, 0.5),
-            ("ease_out_quad", 220, 2.5),
-            ("ease_in_out_quad", 80, 1.2),
-            ("ease_in_cubic", 190, 1.8),
-            ("ease_out_cubic", 160, 2.2),
-            ("ease_in_out_cubic", 240, 3.5),
-            ("ease_in_quart", 120, 1.1),
-            ("ease_out_quart", 210, 2.8),
-            ("ease_in_out_quart", 170, 2.3),
-        ]
-
-        on_message = mock_client.on_message
-
-        for easing, brightness, duration in test_cases:
-            mock_light.fade_to.reset_mock()
+        command_payload = (
+            f'{{"state": "ON", "brightness": {brightness}, '
+            f'"transition": {duration}, "effect": "{easing}"}}'
+        ).encode()
 
-            command_payload = json.dumps(
-                {
-                    "state": "ON",
-                    "brightness": brightness,
-                    "transition": duration,
-                    "effect": easing,
-                }
-            )
-
-            msg = create_mock_mqtt_message(
-                "homeassistant/scheiber/bloc9/7/s1/set", command_payload.encode()
-            )
-            on_message(mock_client, None, msg)
+        msg = create_mock_mqtt_message(
+            "homeassistant/scheiber/bloc9/7/s1/set", command_payload
+        )
+        mock_client.on_message(mock_client, None, msg)
 
-            # Verify correct easing was passed to hardware
-            mock_light.fade_to.assert_called_once_with(
-                brightness, duration=duration, easing=easing
-            )
+        # Verify correct easing was passed to hardware
+        light.fade_to.assert_called_once_with(
+            brightness, duration=duration, easing=easing
+        )
 
-    @patch("can_mqtt_bridge.bridge.mqtt.Client")
-    @patch("can_mqtt_bridge.bridge.create_scheiber_system")
-    def test_light_flash_command(self, mock_create_system, mock_mqtt_client):
+    def test_light_flash_command(self, bridge_with):
         """Test handling flash effect command."""
-        mock_light = MagicMock()
-        mock_light.name = "S1"  # Human-readable name
-        mock_light.entity_id = "s1"  # Entity ID
-        mock_light.switch_nr = 0  # 0-based index
-        mock_light.get_state.return_value = {"state": False, "brightness": 0}
-        mock_light.subscribe = Mock()
-        mock_light.flash = Mock()
-
-        mock_device = MagicMock()
-        mock_device.__class__.__name__ = "Bloc9Device"
-        mock_device.device_id = 7
-        mock_device.get_lights.return_value = [mock_light]
-        mock_device.get_switches.return_value = []
-
-        mock_system = MagicMock()
-        mock_system.get_all_devices.return_value = [mock_device]
-        mock_create_system.return_value = mock_system
-
-        mock_client = MagicMock()
-        mock_mqtt_client.return_value = mock_client
-
-        bridge = MQTTBridge(can_interface="can0", mqtt_host="localhost")
-        bridge.start()
+        light = make_light()
+        bridge = bridge_with(Bloc9Device(lights=[light]))
 
         msg = create_mock_mqtt_message(
             "homeassistant/scheiber/bloc9/7/s1/set", b'{"flash": "short"}'
@@ -1118,70 +705,23 @@ class TestCommandHandling:
 
         bridge._on_mqtt_message(None, None, msg)
 
-        mock_light.flash.assert_called_once_with(count=3)
+        light.flash.assert_called_once_with(count=3)
 
-    @patch("can_mqtt_bridge.bridge.mqtt.Client")
-    @patch("can_mqtt_bridge.bridge.create_scheiber_system")
-    def test_switch_on_command(self, mock_create_system, mock_mqtt_client):
+    def test_switch_on_command(self, bridge_with):
         """Test handling ON command for switch."""
-        mock_switch = MagicMock()
-        mock_switch.name = "Switch 1"
-        mock_switch.entity_id = "switch_1"
-        mock_switch.switch_nr = 0
-        mock_switch.get_state.return_value = False
-        mock_switch.subscribe = Mock()
-        mock_switch.set = Mock()
-
-        mock_device = MagicMock()
-        mock_device.__class__.__name__ = "Bloc9Device"
-        mock_device.device_id = 7
-        mock_device.get_lights.return_value = []
-        mock_device.get_switches.return_value = [mock_switch]
-
-        mock_system = MagicMock()
-        mock_system.get_all_devices.return_value = [mock_device]
-        mock_create_system.return_value = mock_system
-
-        mock_client = MagicMock()
-        mock_mqtt_client.return_value = mock_client
-
-        bridge = MQTTBridge(can_interface="can0", mqtt_host="localhost")
-        bridge.start()
+        switch = make_switch()
+        bridge = bridge_with(Bloc9Device(switches=[switch]))
 
         msg = create_mock_mqtt_message("homeassistant/scheiber/bloc9/7/s1/set", b"ON")
 
         bridge._on_mqtt_message(None, None, msg)
 
-        mock_switch.set.assert_called_once_with(True)
+        switch.set.assert_called_once_with(True)
 
-    @patch("can_mqtt_bridge.bridge.mqtt.Client")
-    @patch("can_mqtt_bridge.bridge.create_scheiber_system")
-    def test_read_only_mode_ignores_commands(
-        self, mock_create_system, mock_mqtt_client
-    ):
+    def test_read_only_mode_ignores_commands(self, bridge_with):
         """Test read-only mode ignores all commands."""
-        mock_light = MagicMock()
-        mock_light.name = "S1"  # Human-readable name
-        mock_light.entity_id = "s1"  # Entity ID
-        mock_light.switch_nr = 0  # 0-based index
-        mock_light.get_state.return_value = {"state": False, "brightness": 0}
-        mock_light.subscribe = Mock()
-
-        mock_device = MagicMock()
-        mock_device.__class__.__name__ = "Bloc9Device"
-        mock_device.device_id = 7
-        mock_device.get_lights.return_value = [mock_light]
-        mock_device.get_switches.return_value = []
-
-        mock_system = MagicMock()
-        mock_system.get_all_devices.return_value = [mock_device]
-        mock_create_system.return_value = mock_system
-
-        mock_client = MagicMock()
-        mock_mqtt_client.return_value = mock_client
-
-        bridge = MQTTBridge(can_interface="can0", mqtt_host="localhost", read_only=True)
-        bridge.start()
+        light = make_light()
+        bridge = bridge_with(Bloc9Device(lights=[light]), read_only=True)
 
         msg = create_mock_mqtt_message(
             "homeassistant/scheiber/bloc9/7/s1/set", b'{"brightness": 150}'
@@ -1190,54 +730,127 @@ class TestCommandHandling:
         bridge._on_mqtt_message(None, None, msg)
 
         # Verify no command sent
-        mock_light.set_brightness.assert_not_called()
+        light.set.assert_not_called()
+        light.set_brightness.assert_not_called()
 
 
 class TestTopicPrefix:
     """Test custom MQTT topic prefix."""
 
-    @patch("can_mqtt_bridge.bridge.mqtt.Client")
-    @patch("can_mqtt_bridge.bridge.create_scheiber_system")
-    def test_custom_topic_prefix(self, mock_create_system, mock_mqtt_client):
+    def test_custom_topic_prefix(self, published, bridge_with):
         """Test using custom topic prefix."""
-        mock_light = MagicMock()
-        mock_light.name = "S1"  # Human-readable name
-        mock_light.entity_id = "s1"  # Entity ID
-        mock_light.switch_nr = 0  # 0-based index
-        mock_light.get_state.return_value = {"state": False, "brightness": 0}
-        mock_light.subscribe = Mock()
-
-        mock_device = MagicMock()
-        mock_device.__class__.__name__ = "Bloc9Device"
-        mock_device.device_id = 7
-        mock_device.get_lights.return_value = [mock_light]
-        mock_device.get_switches.return_value = []
-
-        mock_system = MagicMock()
-        mock_system.get_all_devices.return_value = [mock_device]
-        mock_create_system.return_value = mock_system
-
-        mock_client = MagicMock()
-        mock_mqtt_client.return_value = mock_client
+        bridge_with(Bloc9Device(lights=[make_light()]), mqtt_topic_prefix="boat")
 
-        bridge = MQTTBridge(
-            can_interface="can0", mqtt_host="localhost", mqtt_topic_prefix="boat"
+        # Verify custom prefix used (config topic uses entity_id)
+        config = json.loads(published["boat/light/s1/config"][0])
+        assert config["state_topic"] == "boat/scheiber/bloc9/7/s1/state"
+        assert config["command_topic"] == "boat/scheiber/bloc9/7/s1/set"
+        assert config["availability_topic"] == "boat/scheiber/bloc9/7/s1/availability"
+
+
+class TestHomeAssistantStatus:
+    """Test republishing discovery when Home Assistant restarts."""
+
+    def test_connect_subscribes_to_status(self, patched_mqtt):
+        """Test the bridge listens to the Home Assistant status topic."""
+        mock_client, _ = patched_mqtt
+
+        bridge = MQTTBridge(can_interface="can0", mqtt_host="localhost")
+        bridge._on_mqtt_connect(mock_client, None, None, 0)
+
+        mock_client.message_callback_add.assert_any_call(
+            "homeassistant/status", bridge._on_ha_status
+        )
+        mock_client.subscribe.assert_any_call("homeassistant/status")
+
+    def test_reconnect_resubscribes_in_one_call(self, patched_mqtt, bridge_with):
+        """Test all command topics are resubscribed with a single call."""
+        mock_client, _ = patched_mqtt
+        bridge = bridge_with(
+            Bloc9Device(lights=[make_light(), make_light("s2", switch_nr=1)])
+        )
+        mock_client.subscribe.reset_mock()
+
+        bridge._on_mqtt_connect(mock_client, None, None, 0)
+
+        mock_client.subscribe.assert_any_call(
+            [
+                ("homeassistant/scheiber/bloc9/7/s1/set", 0),
+                ("homeassistant/scheiber/bloc9/7/s2/set", 0),
+            ]
+        )
+        assert mock_client.subscribe.call_count == 2
+
+    def test_status_online_republishes_discovery(self, patched_mqtt, bridge_with):
+        """Test discovery and availability are republished on HA birth."""
+        mock_client, _ = patched_mqtt
+        bridge = bridge_with(Bloc9Device(lights=[make_light()]))
+        mock_client.publish.reset_mock()
+
+        bridge._on_ha_status(
+            mock_client,
+            None,
+            create_mock_mqtt_message("homeassistant/status", b"online"),
+        )
+
+        # Publish order matters here: discovery before availability
+        published_topics = [call[0][0] for call in mock_client.publish.call_args_list]
+        assert published_topics == [
+            "homeassistant/light/s1/config",
+            "homeassistant/scheiber/bloc9/7/s1/availability",
+        ]
+
+        # Home Assistant going offline does not trigger a republish
+        mock_client.publish.reset_mock()
+        bridge._on_ha_status(
+            mock_client,
+            None,
+            create_mock_mqtt_message("homeassistant/status", b"offline"),
+        )
+        mock_client.publish.assert_not_called()
+
+    def test_status_online_during_startup_is_ignored(self, patched_mqtt, monkeypatch):
+        """Test an HA birth message arriving mid-setup leaves the burst intact."""
+        mock_client, mock_system = patched_mqtt
+        mock_system.get_all_devices.return_value = [Bloc9Device(lights=[make_light()])]
+        bridge = MQTTBridge(can_interface="can0", mqtt_host="localhost")
+        setup_air_switch_buttons = bridge._setup_air_switch_buttons
+
+        def setup_then_receive_status(devices):
+            setup_air_switch_buttons(devices)
+            bridge._on_ha_status(
+                mock_client,
+                None,
+                create_mock_mqtt_message("homeassistant/status", b"online"),
+            )
+            # Still inside the startup burst: nothing may have been sent yet
+            mock_client.publish.assert_not_called()
+
+        monkeypatch.setattr(
+            bridge, "_setup_air_switch_buttons", setup_then_receive_status
         )
         bridge.start()
 
-        # Find discovery config
-        discovery_calls = [
-            call
-            for call in mock_client.publish.call_args_list
-            if "/config" in str(call)
+        published_topics = [args[0] for args, _ in mock_client.publish.call_args_list]
+        assert published_topics.count("homeassistant/light/s1/config") == 1
+        assert mock_client.max_inflight_messages_set.call_args_list == [
+            call(MQTTBridge.BURST_MAX_INFLIGHT_MESSAGES),
+            call(MQTTBridge.MAX_INFLIGHT_MESSAGES),
         ]
 
-        config_topic = discovery_calls[0][0][0]
-        config_payload = discovery_calls[0][0][1]
-        config = json.loads(config_payload)
+    def test_nested_publish_burst_restores_inflight_once(self, patched_mqtt):
+        """Test only the outermost burst resets the in-flight window."""
+        mock_client, _ = patched_mqtt
+        bridge = MQTTBridge(can_interface="can0", mqtt_host="localhost")
 
-        # Verify custom prefix used (config topic uses entity_id)
-        assert config_topic == "boat/light/s1/config"
-        assert config["state_topic"] == "boat/scheiber/bloc9/7/s1/state"
-        assert config["command_topic"] == "boat/scheiber/bloc9/7/s1/set"
-        assert config["availability_topic"] == "boat/scheiber/bloc9/7/s1/availability"
+        with bridge._publish_burst():
+            with bridge._publish_burst():
+                pass
+            assert mock_client.max_inflight_messages_set.call_args_list == [
+                call(MQTTBridge.BURST_MAX_INFLIGHT_MESSAGES)
+            ]
+
+        assert mock_client.max_inflight_messages_set.call_args_list == [
+            call(MQTTBridge.BURST_MAX_INFLIGHT_MESSAGES),
+            call(MQTTBridge.MAX_INFLIGHT_MESSAGES),
+        ]
@@ -0,0 +1,46 @@
+"""Tests for coalescing of bursty state publishes."""
+
+import time
+from unittest.mock import Mock
+
+from can_mqtt_bridge.coalesce import PublishCoalescer
+
+
+def test_latest_publish_per_key_wins():
+    """Test only the last submitted publish per key runs on flush."""
+    coalescer = PublishCoalescer(interval=10)
+    first, second, other = Mock(), Mock(), Mock()
+
+    coalescer.submit("sensor_a", first)
+    coalescer.submit("sensor_a", second)
+    coalescer.submit("sensor_b", other)
+    coalescer.flush()
+
+    first.assert_not_called()
+    second.assert_called_once_with()
+    other.assert_called_once_with()
+
+
+def test_flush_runs_after_interval():
+    """Test pending publishes are flushed automatically after the window."""
+    coalescer = PublishCoalescer(interval=0.01)
+    publish = Mock()
+
+    coalescer.submit("sensor_a", publish)
+    publish.assert_not_called()
+
+    time.sleep(0.1)
+    publish.assert_called_once_with()
+
+
+def test_failing_publish_does_not_block_others():
+    """Test an exception in one publish does not drop the rest."""
+    coalescer = PublishCoalescer(interval=10)
+    failing = Mock(side_effect=RuntimeError("broker gone"))
+    publish = Mock()
+
+    coalescer.submit("sensor_a", failing)
+    coalescer.submit("sensor_b", publish)
+    coalescer.flush()
+
+    publish.assert_called_once_with()
@@ -0,0 +1,15 @@
+"""Tests for discovery naming helpers."""
+
+from can_mqtt_bridge.discovery_name import format_discovery_name, slugify_name
+
+
+def test_format_discovery_name():
+    """Test entity slugs become capitalized display names."""
+    assert format_discovery_name("main_light-crew_cabin") == "Main Light Crew Cabin"
+    assert format_discovery_name(" _bow__light-_2- ") == "Bow Light 2"
+
+
+def test_slugify_name_replaces_spaces_only():
+    """Test slugs keep the historical lower-case, space-to-underscore format."""
+    assert slugify_name("Battery Voltage") == "battery_voltage"
+    assert slugify_name("Fresh-Water Tank") == "fresh-water_tank"
@@ -0,0 +1,30 @@
+"""Tests for per-entity logging."""
+
+import logging
+
+from can_mqtt_bridge.entity_logging import entity_logger
+
+
+def test_entity_logger_prefixes_entity_id(caplog):
+    """Test messages are emitted through the module logger with the entity ID."""
+    module_logger = logging.getLogger("can_mqtt_bridge.light")
+    log = entity_logger(module_logger, "salon_light")
+
+    with caplog.at_level(logging.INFO, logger="can_mqtt_bridge.light"):
+        log.info("Published %s", "ON")
+
+    record = caplog.records[-1]
+    assert record.name == "can_mqtt_bridge.light"
+    assert record.getMessage() == "[salon_light] Published ON"
+    assert record.entity == "salon_light"
+
+
+def test_entity_loggers_share_module_logger():
+    """Test entities do not register a logger of their own."""
+    module_logger = logging.getLogger("can_mqtt_bridge.switch")
+
+    first = entity_logger(module_logger, "pump")
+    second = entity_logger(module_logger, "fan")
+
+    assert first.logger is second.logger is module_logger
+    assert "can_mqtt_bridge.switch.pump" not in logging.Logger.manager.loggerDict
@@ -0,0 +1,38 @@
+"""Tests for shared MQTT payload helpers."""
+
+import json
+
+from can_mqtt_bridge import payloads
+
+
+def test_encode_json_returns_bytes():
+    """Test payloads are encoded to JSON bytes."""
+    data = {"name": "Salon Light", "device": {"identifiers": ["scheiber_system"]}}
+
+    encoded = payloads.encode_json(data)
+
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded) == data
+
+
+def test_encode_json_handles_non_ascii_names():
+    """Test names with non-ASCII characters round-trip."""
+    encoded = payloads.encode_json({"name": "Pumpe Süd", "value": 1})
+
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded) == {"name": "Pumpe Süd", "value": 1}
+
+
+def test_parse_light_command():
+    """Test plain, JSON and malformed light commands are parsed."""
+    assert payloads.parse_light_command("OFF") == {"state": "OFF"}
+    assert payloads.parse_light_command('{"brightness": 80}') == {"brightness": 80}
+    assert payloads.parse_light_command("on") == {"state": "on"}
+
+
+def test_parse_switch_command():
+    """Test exact and loosely formatted switch commands are parsed."""
+    assert payloads.parse_switch_command("ON") is True
+    assert payloads.parse_switch_command("OFF") is False
+    assert payloads.parse_switch_command(" on\n") is True
+    assert payloads.parse_switch_command("toggle") is False
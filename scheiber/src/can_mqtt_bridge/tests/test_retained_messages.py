@@ -2,24 +2,24 @@
 Test retained message handling in MQTT bridge.
 
 Verifies that:
-1. Old retained messages (>5 minutes) are ignored
-2. Recent retained messages are processed
-3. Retained commands are cleared after execution
+1. Retained commands are never executed, since their age is unknown
+2. Retained commands are cleared from the broker
+3. Non-retained commands are processed
 """
 
-import time
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
-from can_mqtt_bridge.light import MQTTLight
+from can_mqtt_bridge.button import MQTTButton
+from can_mqtt_bridge.light import MQTTLight, _parse_retained_state
 from can_mqtt_bridge.switch import MQTTSwitch
 
 
 class TestRetainedMessageHandling:
     """Test retained message validation and clearing."""
 
-    def test_light_ignores_old_retained_message(self):
-        """Test that old retained messages are ignored."""
+    def test_light_ignores_retained_message(self):
+        """Test that retained commands are cleared without being executed."""
         # Setup
         mock_hardware = Mock()
         mock_hardware.switch_nr = 4  # S5 (0-indexed)
@@ -36,46 +36,13 @@ class TestRetainedMessageHandling:
             mqtt_client=mock_mqtt,
             mqtt_topic_prefix="homeassistant",
             read_only=False,
-        )  # Simulate old retained message (6 minutes old)
-        old_timestamp = time.time() - 360
-        light.handle_command(
-            payload='{"state": "ON"}', is_retained=True, timestamp=old_timestamp
         )
+        light.handle_command(payload='{"state": "ON"}', is_retained=True)
 
         # Verify: hardware command NOT sent
         mock_hardware.set_brightness.assert_not_called()
 
-        # Verify: old retained message is cleared
-        mock_mqtt.publish.assert_called_with(light.command_topic, None, retain=True)
-
-    def test_light_processes_recent_retained_message(self):
-        """Test that recent retained messages are processed."""
-        # Setup
-        mock_hardware = Mock()
-        mock_hardware.switch_nr = 4  # S5 (0-indexed)
-        mock_hardware.name = "Test Light"
-        mock_hardware.entity_id = "test_light"
-        mock_hardware.subscribe = Mock()
-
-        mock_mqtt = Mock()
-
-        light = MQTTLight(
-            hardware_light=mock_hardware,
-            device_type="bloc9",
-            device_id=7,
-            mqtt_client=mock_mqtt,
-            mqtt_topic_prefix="homeassistant",
-            read_only=False,
-        )  # Simulate recent retained message (1 minute old)
-        recent_timestamp = time.time() - 60
-        light.handle_command(
-            payload='{"state": "ON"}', is_retained=True, timestamp=recent_timestamp
-        )
-
-        # Verify: hardware command IS sent
-        mock_hardware.set_brightness.assert_called_once_with(255)
-
-        # Verify: retained message is cleared after execution
+        # Verify: retained message is cleared
         mock_mqtt.publish.assert_called_with(light.command_topic, None, retain=True)
 
     def test_light_processes_non_retained_message(self):
@@ -97,9 +64,7 @@ class TestRetainedMessageHandling:
             mqtt_topic_prefix="homeassistant",
             read_only=False,
         )  # Simulate non-retained message
-        light.handle_command(
-            payload='{"state": "ON"}', is_retained=False, timestamp=None
-        )
+        light.handle_command(payload='{"state": "ON"}', is_retained=False)
 
         # Verify: hardware command IS sent
         mock_hardware.set_brightness.assert_called_once_with(255)
@@ -107,8 +72,8 @@ class TestRetainedMessageHandling:
         # Verify: NO clearing (not retained)
         mock_mqtt.publish.assert_not_called()
 
-    def test_switch_ignores_old_retained_message(self):
-        """Test that switches ignore old retained messages."""
+    def test_switch_ignores_retained_message(self):
+        """Test that switches clear retained commands without executing them."""
         # Setup
         mock_hardware = Mock()
         mock_hardware.switch_nr = 4  # S5 (0-indexed)
@@ -125,20 +90,17 @@ class TestRetainedMessageHandling:
             mqtt_client=mock_mqtt,
             mqtt_topic_prefix="homeassistant",
             read_only=False,
-        )  # Simulate old retained message (6 minutes old)
-        old_timestamp = time.time() - 360
-        switch.handle_command(
-            payload='{"state": "ON"}', is_retained=True, timestamp=old_timestamp
         )
+        switch.handle_command(payload="ON", is_retained=True)
 
         # Verify: hardware command NOT sent
         mock_hardware.set.assert_not_called()
 
-        # Verify: old retained message is cleared
+        # Verify: retained message is cleared
         mock_mqtt.publish.assert_called_with(switch.command_topic, None, retain=True)
 
-    def test_switch_processes_recent_retained_message(self):
-        """Test that switches process recent retained messages."""
+    def test_switch_processes_non_retained_message(self):
+        """Test that switches process non-retained messages normally."""
         # Setup
         mock_hardware = Mock()
         mock_hardware.switch_nr = 4  # S5 (0-indexed)
@@ -155,95 +117,144 @@ class TestRetainedMessageHandling:
             mqtt_client=mock_mqtt,
             mqtt_topic_prefix="homeassistant",
             read_only=False,
-        )  # Simulate recent retained message (1 minute old)
-        recent_timestamp = time.time() - 60
-        switch.handle_command(
-            payload="ON", is_retained=True, timestamp=recent_timestamp
-        )
+        )  # Simulate non-retained message
+        switch.handle_command(payload="ON", is_retained=False)
 
         # Verify: hardware command IS sent
         mock_hardware.set.assert_called_once_with(True)
 
-        # Verify: retained message is cleared after execution
-        mock_mqtt.publish.assert_called_with(switch.command_topic, None, retain=True)
+        # Verify: NO clearing (not retained)
+        mock_mqtt.publish.assert_not_called()
 
-    def test_switch_processes_non_retained_message(self):
-        """Test that switches process non-retained messages normally."""
-        # Setup
+    def test_light_ignores_cleared_retained_command_echo(self):
+        """Test that the empty payload echoed after clearing is ignored."""
         mock_hardware = Mock()
-        mock_hardware.switch_nr = 4  # S5 (0-indexed)
-        mock_hardware.name = "Test Switch"
-        mock_hardware.entity_id = "test_switch"
+        mock_hardware.switch_nr = 4
+        mock_hardware.name = "Test Light"
+        mock_hardware.entity_id = "test_light"
         mock_hardware.subscribe = Mock()
 
         mock_mqtt = Mock()
 
-        switch = MQTTSwitch(
-            hardware_switch=mock_hardware,
+        light = MQTTLight(
+            hardware_light=mock_hardware,
             device_type="bloc9",
             device_id=7,
             mqtt_client=mock_mqtt,
             mqtt_topic_prefix="homeassistant",
             read_only=False,
-        )  # Simulate non-retained message
-        switch.handle_command(payload="ON", is_retained=False, timestamp=None)
+        )
+        light.handle_command(payload='{"state": "ON"}', is_retained=True)
+        assert mock_mqtt.publish.call_count == 1
 
-        # Verify: hardware command IS sent
-        mock_hardware.set.assert_called_once_with(True)
+        # Broker delivers the zero-length message that cleared the command
+        light.handle_command(payload="", is_retained=False)
 
-        # Verify: NO clearing (not retained)
-        mock_mqtt.publish.assert_not_called()
+        # Verify: light is not switched and nothing is cleared again
+        mock_hardware.set_brightness.assert_not_called()
+        assert mock_mqtt.publish.call_count == 1
 
-    def test_age_threshold_just_under_5_minutes(self):
-        """Test boundary: just under 5 minutes should be processed."""
-        # Setup
-        mock_hardware = Mock()
-        mock_hardware.switch_nr = 4  # S5 (0-indexed)
-        mock_hardware.name = "Test Light"
-        mock_hardware.entity_id = "test_light"
-        mock_hardware.subscribe = Mock()
+    def test_button_does_not_press_on_retained_message(self):
+        """Test that a retained PRESS never fires the pulse output."""
+        mock_pulse = Mock()
+        mock_pulse.switch_nr = 3
+        mock_pulse.name = "Door close"
+        mock_pulse.entity_id = "door_close"
 
         mock_mqtt = Mock()
 
-        light = MQTTLight(
-            hardware_light=mock_hardware,
+        button = MQTTButton(
+            hardware_pulse=mock_pulse,
             device_type="bloc9",
             device_id=7,
             mqtt_client=mock_mqtt,
             mqtt_topic_prefix="homeassistant",
             read_only=False,
-        )  # Simulate message just under 5 minutes old (299 seconds)
-        boundary_timestamp = time.time() - 299
-        light.handle_command(
-            payload='{"state": "ON"}', is_retained=True, timestamp=boundary_timestamp
         )
+        button.handle_command(payload="PRESS", is_retained=True)
 
-        # Verify: should be processed (not > 300)
-        mock_hardware.set_brightness.assert_called_once_with(255)
+        mock_pulse.press.assert_not_called()
+        mock_mqtt.publish.assert_called_once_with(
+            button.command_topic, None, retain=True
+        )
 
-    def test_age_threshold_just_over_5_minutes(self):
-        """Test boundary: just over 5 minutes should be ignored."""
-        # Setup
+
+class TestRetainedStateComparison:
+    """Test comparing retained light state against hardware on startup."""
+
+    def _make_light(self, brightness):
         mock_hardware = Mock()
-        mock_hardware.switch_nr = 4  # S5 (0-indexed)
+        mock_hardware.switch_nr = 4
         mock_hardware.name = "Test Light"
         mock_hardware.entity_id = "test_light"
-        mock_hardware.subscribe = Mock()
-
-        mock_mqtt = Mock()
 
         light = MQTTLight(
             hardware_light=mock_hardware,
             device_type="bloc9",
             device_id=7,
-            mqtt_client=mock_mqtt,
-            mqtt_topic_prefix="homeassistant",
-            read_only=False,
-        )  # Simulate message just over 5 minutes old (301 seconds)
-        boundary_timestamp = time.time() - 301
-        light.handle_command(
-            payload='{"state": "ON"}', is_retained=True, timestamp=boundary_timestamp
+            mqtt_client=Mock(),
         )
+        light._pending_hw_state = {"state": True, "brightness": brightness}
+        light.logger = Mock()
+        return light
 
-        # Verify: should be ignored (> 300)
-        mock_hardware.set_brightness.assert_not_called()
+    def _retained(self, payload):
+        message = MagicMock()
+        message.payload = payload
+        return message
+
+    def test_out_of_range_brightness_does_not_match(self):
+        """Test a retained brightness of 300 is not taken for 44."""
+        light = self._make_light(44)
+
+        light._check_and_publish_state(
+            self._retained(b'{"state": "ON", "brightness": 300}')
+        )
+
+        light.mqtt_client.publish.assert_called_once()
+
+    def test_float_brightness_from_json_fallback_is_compared(self):
+        """Test a non-integer retained brightness is compared, not an error."""
+        light = self._make_light(44)
+
+        light._check_and_publish_state(
+            self._retained(b'{"state": "on", "brightness": 44.5}')
+        )
+
+        light.logger.warning.assert_not_called()
+        light.mqtt_client.publish.assert_called_once()
+
+
+class TestRetainedStateParsing:
+    """Test parsing of retained light state payloads."""
+
+    def test_parses_published_format(self):
+        """Test payloads in the format published by MQTTLight."""
+        assert _parse_retained_state(b'{"state": "ON", "brightness": 128}') == (
+            True,
+            128,
+        )
+        assert _parse_retained_state(b'{"state": "OFF", "brightness": 0}') == (
+            False,
+            0,
+        )
+
+    def test_parses_compact_format(self):
+        """Test payloads without whitespace after separators."""
+        assert _parse_retained_state(b'{"state":"ON","brightness":255}') == (
+            True,
+            255,
+        )
+
+    def test_missing_brightness_defaults_to_zero(self):
+        """Test that a state-only payload reports brightness 0."""
+        assert _parse_retained_state(b'{"state": "ON"}') == (True, 0)
+
+    def test_falls_back_to_json_for_unknown_format(self):
+        """Test that unexpected payloads are still parsed as JSON."""
+        assert _parse_retained_state(b'{"brightness": 10, "state": "on"}') == (
+            False,
+            10,
+        )
+        with pytest.raises(ValueError):
+            _parse_retained_state(b"garbage")
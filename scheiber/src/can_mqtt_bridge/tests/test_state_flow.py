@@ -2,11 +2,6 @@
 Test to verify CAN message -> hardware state -> MQTT state flow.
 """
 
-import sys
-from pathlib import Path
-
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from unittest.mock import MagicMock, Mock
 
 import can
@@ -85,5 +80,80 @@ def test_can_to_mqtt_state_flow():
     print("✓ CAN -> Hardware -> MQTT state flow working correctly")
 
 
+def test_released_mqtt_light_unsubscribes_from_hardware():
+    """Test that the hardware observer does not keep the MQTT light alive."""
+    import gc
+
+    device = Bloc9Device(
+        device_id=7,
+        can_bus=Mock(spec=ScheiberCanBus),
+        lights_config={"s5": {"name": "Test Light", "entity_id": "test_light"}},
+    )
+    hardware_light = device.get_lights()[0]
+
+    mqtt_light = MQTTLight(
+        hardware_light=hardware_light,
+        device_type="bloc9",
+        device_id=7,
+        mqtt_client=Mock(),
+    )
+    assert len(hardware_light._observers) == 1
+
+    del mqtt_light
+    gc.collect()
+
+    assert hardware_light._observers == []
+
+
+def test_unchanged_light_state_is_not_republished():
+    """Test that repeated hardware updates with the same state publish once."""
+    device = Bloc9Device(
+        device_id=7,
+        can_bus=Mock(spec=ScheiberCanBus),
+        lights_config={"s5": {"name": "Test Light", "entity_id": "test_light"}},
+    )
+    mock_mqtt_client = Mock()
+    mqtt_light = MQTTLight(
+        hardware_light=device.get_lights()[0],
+        device_type="bloc9",
+        device_id=7,
+        mqtt_client=mock_mqtt_client,
+    )
+
+    mqtt_light._on_hardware_state_change({"state": True, "brightness": 200})
+    mqtt_light._on_hardware_state_change({"state": True, "brightness": 200})
+    assert mock_mqtt_client.publish.call_count == 1
+
+    mqtt_light._on_hardware_state_change({"state": True, "brightness": 120})
+    assert mock_mqtt_client.publish.call_count == 2
+
+
+def test_matching_retained_state_is_not_republished():
+    """Test that a heartbeat matching the retained state publishes nothing."""
+    import time
+
+    device = Bloc9Device(
+        device_id=7,
+        can_bus=Mock(spec=ScheiberCanBus),
+        lights_config={"s5": {"name": "Test Light", "entity_id": "test_light"}},
+    )
+    mock_mqtt_client = Mock()
+    mqtt_light = MQTTLight(
+        hardware_light=device.get_lights()[0],
+        device_type="bloc9",
+        device_id=7,
+        mqtt_client=mock_mqtt_client,
+    )
+    mqtt_light._pending_hw_state = {"state": True, "brightness": 200}
+    retained = MagicMock()
+    retained.payload = b'{"state": "ON", "brightness": 200}'
+    retained.timestamp = time.monotonic()
+
+    mqtt_light._check_and_publish_state(retained)
+    mqtt_light._on_hardware_state_change({"state": True, "brightness": 200})
+
+    mock_mqtt_client.publish.assert_not_called()
+
+
 if __name__ == "__main__":
     test_can_to_mqtt_state_flow()
@@ -90,7 +90,7 @@ class TestSwitchStateConfirmation:
         assert mock_mqtt_client.publish.call_count == 1
         publish_call = mock_mqtt_client.publish.call_args
         assert publish_call[0][0] == "homeassistant/scheiber/bloc9/10/s3/state"
-        assert publish_call[0][1] == "ON"
+        assert publish_call[0][1] == b"ON"
         assert publish_call[1]["retain"] == True
 
     def test_switch_physical_button_updates_mqtt(self):
@@ -146,7 +146,7 @@ class TestSwitchStateConfirmation:
         assert mock_mqtt_client.publish.call_count == 1
         publish_call = mock_mqtt_client.publish.call_args
         assert publish_call[0][0] == "homeassistant/scheiber/bloc9/10/s3/state"
-        assert publish_call[0][1] == "ON"
+        assert publish_call[0][1] == b"ON"
 
     def test_switch_turn_off_flow(self):
         """Test turning OFF also waits for CAN confirmation."""
@@ -202,7 +202,7 @@ class TestSwitchStateConfirmation:
 
         # Verify: MQTT updated
         assert mock_mqtt_client.publish.call_count == 1
-        assert mock_mqtt_client.publish.call_args[0][1] == "OFF"
+        assert mock_mqtt_client.publish.call_args[0][1] == b"OFF"
 
     def test_mqtt_discovery_optimistic_false(self):
         """Verify discovery config has optimistic=False."""
@@ -238,3 +238,29 @@ class TestSwitchStateConfirmation:
         assert config["payload_off"] == "OFF"
         assert config["state_on"] == "ON"
         assert config["state_off"] == "OFF"
+
+    def test_unchanged_state_is_not_republished(self):
+        """Test that repeated hardware updates with the same state publish once."""
+        mock_can_bus = Mock()
+        device = Bloc9Device(
+            device_id=10,
+            can_bus=mock_can_bus,
+            switches_config={"s3": {"name": "Test Switch", "entity_id": "test_switch"}},
+        )
+
+        mock_mqtt_client = Mock()
+        mqtt_switch = MQTTSwitch(
+            hardware_switch=device.switches[0],
+            device_type="bloc9",
+            device_id=10,
+            mqtt_client=mock_mqtt_client,
+            mqtt_topic_prefix="homeassistant",
+        )
+
+        mqtt_switch._on_hardware_state_change({"state": True})
+        mqtt_switch._on_hardware_state_change({"state": True})
+        assert mock_mqtt_client.publish.call_count == 1
+
+        mqtt_switch._on_hardware_state_change({"state": False})
+        assert mock_mqtt_client.publish.call_count == 2
+        assert mock_mqtt_client.publish.call_args[0][1] == b"OFF"
@@ -0,0 +1,43 @@
+"""Tests for the shared bridge scheduler."""
+
+import threading
+
+from can_mqtt_bridge import _timers
+
+
+def test_callbacks_run_in_due_order():
+    """Test callbacks run after their delay, earliest first."""
+    done = threading.Event()
+    calls = []
+
+    _timers.schedule(0.05, lambda: (calls.append("late"), done.set()))
+    _timers.schedule(0.01, calls.append, "early")
+
+    assert done.wait(1.0)
+    assert calls == ["early", "late"]
+
+
+def test_cancelled_callback_does_not_run():
+    """Test cancelled callbacks are skipped."""
+    done = threading.Event()
+    calls = []
+
+    event = _timers.schedule(0.01, calls.append, "cancelled")
+    _timers.cancel(event)
+    _timers.schedule(0.02, done.set)
+
+    assert done.wait(1.0)
+    assert calls == []
+
+
+def test_failing_callback_keeps_scheduler_running():
+    """Test an exception in one callback does not stop later callbacks."""
+    done = threading.Event()
+
+    def fail():
+        raise RuntimeError("boom")
+
+    _timers.schedule(0.01, fail)
+    _timers.schedule(0.02, done.set)
+
+    assert done.wait(1.0)
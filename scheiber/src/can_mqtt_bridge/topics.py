@@ -0,0 +1,62 @@
+"""
+Helpers for building MQTT topics of bridge entities.
+"""
+
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+
+
+@dataclass(frozen=True)
+class OutputTopics:
+    """MQTT topics of a single hardware output entity."""
+
+    __slots__ = ("config", "state", "availability", "command")
+
+    config: str
+    state: str
+    availability: str
+    command: str
+
+
+@lru_cache(maxsize=None)
+def _device_topic(mqtt_topic_prefix: str, device_type: str, device_slug: str) -> str:
+    """Return the interned topic prefix shared by all outputs of a device."""
+    return sys.intern(f"{mqtt_topic_prefix}/scheiber/{device_type}/{device_slug}")
+
+
+def build_output_topics(
+    mqtt_topic_prefix: str,
+    component: str,
+    device_type: str,
+    device_slug: str,
+    switch_name: str,
+    entity_id: str,
+) -> OutputTopics:
+    """
+    Build the (v5 schema) topics for a hardware output entity.
+
+    Topics are interned so comparisons and dict lookups against them can
+    short-circuit on identity, and outputs of one device share the prefix,
+    which is built once per device.
+
+    Args:
+        mqtt_topic_prefix: MQTT topic prefix
+        component: Home Assistant component (e.g., 'light', 'switch')
+        device_type: Device type (e.g., 'bloc9', or 'logical')
+        device_slug: Device bus ID, with segment suffix when non-zero
+            (logical entities use their component instead)
+        switch_name: Output identifier (e.g., 's1', or a sensor slug)
+        entity_id: Entity ID (e.g., 'main_light_crew_cabin')
+
+    Returns:
+        OutputTopics for the entity
+    """
+    device_topic = _device_topic(mqtt_topic_prefix, device_type, device_slug)
+    base_topic = sys.intern(f"{device_topic}/{switch_name}")
+    return OutputTopics(
+        config=sys.intern(f"{mqtt_topic_prefix}/{component}/{entity_id}/config"),
+        state=sys.intern(base_topic + "/state"),
+        availability=sys.intern(base_topic + "/availability"),
+        command=sys.intern(base_topic + "/set"),
+    )
@@ -4,8 +4,9 @@ Scheiber Module - Client-agnostic CAN bus layer.
 Public API for creating and managing Scheiber CAN devices.
 """
 
+import json
 import logging
-from pathlib import Path
+from types import MappingProxyType
 from typing import Optional
 
 from .air_switch import AirSwitchDevice
@@ -30,6 +31,27 @@ __all__ = [
 ]
 
 
+# Device types built straight from their config section:
+# type -> (class, log name, item name, item getter)
+_CONFIG_DEVICE_TYPES = MappingProxyType(
+    {
+        "bloc7": (Bloc7Device, "Bloc7", "sensors", Bloc7Device.get_sensors),
+        "source_selector": (
+            SourceSelectorDevice,
+            "SourceSelector",
+            "sensors",
+            SourceSelectorDevice.get_sensors,
+        ),
+        "air_switch": (
+            AirSwitchDevice,
+            "AirSwitch",
+            "buttons",
+            AirSwitchDevice.get_air_switch_buttons,
+        ),
+    }
+)
+
+
 def create_scheiber_system(
     can_interface: str,
     config_path: Optional[str] = None,
@@ -85,9 +107,6 @@ def create_scheiber_system(
     # Create devices from configuration with initial state
     devices = _create_devices(config, can_bus, initial_state, logger)
 
-    # Validate unique device IDs per type
-    _validate_unique_ids(devices)
-
     # Create system
     system = ScheiberSystem(
         can_bus=can_bus,
@@ -97,7 +116,7 @@ def create_scheiber_system(
     )
 
     logger.info(
-        f"Created Scheiber system with {len(devices)} devices on {can_interface}"
+        "Created Scheiber system with %d devices on %s", len(devices), can_interface
     )
     return system
 
@@ -116,20 +135,16 @@ def _load_state(state_file: Optional[str], logger: logging.Logger) -> dict:
     if not state_file:
         return {}
 
-    state_path = Path(state_file)
-    if not state_path.exists():
-        logger.info(f"No state file found: {state_file} (starting fresh)")
-        return {}
-
     try:
-        import json
-
-        with open(state_path, "r") as f:
+        with open(state_file, "r") as f:
             state_data = json.load(f)
-        logger.info(f"Loaded persisted state from: {state_file}")
+        logger.info("Loaded persisted state from: %s", state_file)
         return state_data
+    except FileNotFoundError:
+        logger.info("No state file found: %s (starting fresh)", state_file)
+        return {}
     except Exception as e:
-        logger.error(f"Failed to load state file: {e} (starting fresh)")
+        logger.error("Failed to load state file: %s (starting fresh)", e)
         return {}
 
 
@@ -157,17 +172,13 @@ def _create_devices(
         segment_id = device_config.get("segment_id", 0)
 
         if not device_type or device_id is None:
-            logger.warning(f"Invalid device config: {device_config}")
+            logger.warning("Invalid device config: %s", device_config)
             continue
 
-        # Extract device-specific state
         device_route = (
             f"{device_id}" if segment_id == 0 else f"{device_id}_{segment_id}"
         )
-        device_key = f"{device_type}_{device_route}"
-        device_state = initial_state.get(device_key, {})
 
-        # Create device based on type
         if device_type == "bloc9":
             # Extract lights and switches configuration
             lights_config = device_config.get("lights", {})
@@ -181,7 +192,7 @@ def _create_devices(
                 lights_config=lights_config,
                 switches_config=switches_config,
                 pulses_config=pulses_config,
-                initial_state=device_state,
+                initial_state=initial_state.get(f"bloc9_{device_route}", {}),
                 logger=logging.getLogger(f"Bloc9.{device_route}"),
             )
             devices.append(device)
@@ -190,73 +201,37 @@ def _create_devices(
             num_switches = len(switches_config)
             num_pulses = len(pulses_config)
             logger.info(
-                f"Created Bloc9 device: bus_id={device_id}, "
-                f"segment_id={segment_id}, "
-                f"{num_lights} lights, {num_switches} switches, {num_pulses} pulses"
-            )
-        elif device_type == "bloc7":
-            device = Bloc7Device(
-                device_id=device_id,
-                can_bus=can_bus,
-                config=device_config,
-                segment_id=segment_id,
-                logger=logging.getLogger(f"Bloc7.{device_route}"),
-            )
-            devices.append(device)
-            logger.info(
-                f"Created Bloc7 device: bus_id={device_id}, "
-                f"segment_id={segment_id}, "
-                f"{len(device.get_sensors())} sensors"
-            )
-        elif device_type == "source_selector":
-            device = SourceSelectorDevice(
-                device_id=device_id,
-                can_bus=can_bus,
-                config=device_config,
-                segment_id=segment_id,
-                logger=logging.getLogger(f"SourceSelector.{device_route}"),
-            )
-            devices.append(device)
-            logger.info(
-                f"Created SourceSelector device: bus_id={device_id}, "
-                f"segment_id={segment_id}, "
-                f"{len(device.get_sensors())} sensors"
-            )
-        elif device_type == "air_switch":
-            device = AirSwitchDevice(
-                device_id=device_id,
-                can_bus=can_bus,
-                config=device_config,
-                segment_id=segment_id,
-                logger=logging.getLogger(f"AirSwitch.{device_route}"),
+                "Created Bloc9 device: bus_id=%s, segment_id=%s, "
+                "%s lights, %s switches, %s pulses",
+                device_id,
+                segment_id,
+                num_lights,
+                num_switches,
+                num_pulses,
             )
-            devices.append(device)
-            logger.info(
-                f"Created AirSwitch device: bus_id={device_id}, "
-                f"segment_id={segment_id}, "
-                f"{len(device.get_air_switch_buttons())} buttons"
-            )
-        else:
-            logger.warning(f"Unknown device type: {device_type}")
-
-    return devices
-
+            continue
 
-def _validate_unique_ids(devices: list) -> None:
-    """
-    Validate that device IDs are unique per device type.
+        config_device_type = _CONFIG_DEVICE_TYPES.get(device_type)
+        if config_device_type is None:
+            logger.warning("Unknown device type: %s", device_type)
+            continue
 
-    Args:
-        devices: List of device instances
+        device_class, label, item_name, get_items = config_device_type
+        device = device_class(
+            device_id=device_id,
+            can_bus=can_bus,
+            config=device_config,
+            segment_id=segment_id,
+            logger=logging.getLogger(f"{label}.{device_route}"),
+        )
+        devices.append(device)
+        logger.info(
+            "Created %s device: bus_id=%s, segment_id=%s, %s %s",
+            label,
+            device_id,
+            segment_id,
+            len(get_items(device)),
+            item_name,
+        )
 
-    Raises:
-        ValueError: If duplicate device ID found
-    """
-    seen = set()
-    for device in devices:
-        key = (device.device_type, device.device_id, device.segment_id)
-        if key in seen:
-            raise ValueError(
-                f"Duplicate device: {device.device_type} bus_id={device.device_id} segment_id={device.segment_id}"
-            )
-        seen.add(key)
+    return devices
@@ -10,6 +10,8 @@ from typing import Any, Dict, List, Optional
 
 import can
 
+from .protocol import format_route_slug
+
 
 class ScheiberCanDevice(ABC):
     """
@@ -22,6 +24,17 @@ class ScheiberCanDevice(ABC):
     - store_to_state(): Return current state for persistence
     """
 
+    __slots__ = (
+        "device_id",
+        "segment_id",
+        "device_type",
+        "can_bus",
+        "logger",
+        "_observers",
+        "_route_slug",
+        "_state_key",
+    )
+
     def __init__(
         self,
         device_id: int,
@@ -44,6 +57,10 @@ class ScheiberCanDevice(ABC):
         self.segment_id = segment_id
         self.device_type = device_type
         self.can_bus = can_bus
+        # Identity never changes after construction; heartbeats and state
+        # saves read these strings far more often than devices are created
+        self._route_slug = format_route_slug(device_id, segment_id)
+        self._state_key = f"{device_type}_{self._route_slug}"
         self.logger = logger or logging.getLogger(
             f"{self.__class__.__name__}.{self.route_slug}"
         )
@@ -52,16 +69,12 @@ class ScheiberCanDevice(ABC):
     @property
     def route_slug(self) -> str:
         """Return the device's bus/segment identity string."""
-        return (
-            f"{self.device_id}"
-            if self.segment_id == 0
-            else f"{self.device_id}_{self.segment_id}"
-        )
+        return self._route_slug
 
     @property
     def state_key(self) -> str:
         """Return the persistence key for this device."""
-        return f"{self.device_type}_{self.route_slug}"
+        return self._state_key
 
     @abstractmethod
     def get_matchers(self) -> List:
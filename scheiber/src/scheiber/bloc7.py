@@ -24,24 +24,22 @@ class ValueConfig:
         self.bit_length = bit_length
         self.endian = endian
         self.scale = scale
+        # Resolved once, extract_value runs for every matching CAN frame
+        self._end_byte = start_byte + (bit_length + 7) // 8
+        self._byteorder = "little" if endian == "little" else "big"
 
     def extract_value(self, data: bytes) -> float:
         """Extracts and scales the value from the CAN data payload."""
-        num_bytes = (self.bit_length + 7) // 8
-        end_byte = self.start_byte + num_bytes
+        end_byte = self._end_byte
         if end_byte > len(data):
             logger.warning(
-                f"Not enough data to extract value. Need {end_byte} bytes, have {len(data)}."
+                "Not enough data to extract value. Need %d bytes, have %d.",
+                end_byte,
+                len(data),
             )
             return 0.0
 
-        byte_slice = data[self.start_byte : end_byte]
-
-        if self.endian == "little":
-            raw_value = int.from_bytes(byte_slice, "little")
-        else:
-            raw_value = int.from_bytes(byte_slice, "big")
-
+        raw_value = int.from_bytes(data[self.start_byte : end_byte], self._byteorder)
         return round(raw_value * self.scale, 2)
 
 
@@ -73,7 +71,10 @@ class SensorOutput:
             if self.value != new_value:
                 self.value = new_value
                 logger.info(
-                    f"Sensor '{self.name}' updated to {self.value} {self.unit_of_measurement}"
+                    "Sensor '%s' updated to %s %s",
+                    self.name,
+                    self.value,
+                    self.unit_of_measurement,
                 )
                 self.notify_observers()
                 return True
@@ -6,7 +6,7 @@ Manages 6 dimmable light outputs (S1-S6) using the Bloc9 CAN protocol.
 
 import logging
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import can
 
@@ -17,6 +17,14 @@ from .matchers import Matcher
 from .pulse import PulseOutput
 from .switch import Switch
 
+# Output names (s1-s6), indexed by 0-based switch number
+OUTPUT_NAMES = tuple(f"s{i + 1}" for i in range(6))
+OUTPUT_SWITCH_NRS = {name: i for i, name in enumerate(OUTPUT_NAMES)}
+
+# Full OFF / full ON command payloads, indexed by switch number
+OFF_COMMANDS = tuple(bytes((nr, 0x00, 0x00, 0x00)) for nr in range(6))
+ON_COMMANDS = tuple(bytes((nr, 0x01, 0x00, 0x00)) for nr in range(6))
+
 
 class Bloc9Device(ScheiberCanDevice):
     """
@@ -34,6 +42,18 @@ class Bloc9Device(ScheiberCanDevice):
     - Brightness 253-255: Full ON (no PWM)
     """
 
+    __slots__ = (
+        "_initial_state",
+        "_heartbeat_id",
+        "_command_id",
+        "switches",
+        "lights",
+        "pulses",
+        "_matcher_to_outputs",
+        "_matchers",
+        "_output_labels",
+    )
+
     # Dimming threshold (prevent LED flickering at extremes)
     DIMMING_THRESHOLD = 2
 
@@ -66,40 +86,29 @@ class Bloc9Device(ScheiberCanDevice):
         # Extract persisted state for outputs
         self._initial_state = initial_state or {}
 
+        # Arbitration IDs of this device's own messages, fixed for its lifetime
+        address_byte = build_bloc9_address_byte(device_id, segment_id)
+        self._heartbeat_id = 0x00000600 | address_byte
+        self._command_id = 0x02360600 | address_byte
+
         # Track all outputs (mix of switches and lights)
         self.switches: List[Switch] = []
         self.lights: List[DimmableLight] = []
         self.pulses: List[PulseOutput] = []
 
-        # Map output names to switch numbers
-        output_map = {f"s{i+1}": i for i in range(6)}
-
-        # Matcher-to-output mapping for direct dispatch
-        # Will be built by get_matchers() when called
+        # Matcher-to-output mapping for direct dispatch, and the matchers
+        # themselves. Outputs are fixed after init, so both are built once.
         self._matcher_to_outputs: Dict[int, List] = {}
+        self._matchers: Optional[Tuple[Matcher, ...]] = None
 
         # Create lights for configured outputs
         if lights_config:
             for output_name, config in lights_config.items():
-                switch_nr = output_map.get(output_name.lower())
-                if switch_nr is None:
-                    self.logger.warning(f"Invalid output name: {output_name}")
+                resolved = self._resolve_output(output_name, config)
+                if resolved is None:
                     continue
-
-                name = config.get("name", output_name)
-                entity_id = config.get("entity_id", name.lower().replace(" ", "_"))
-
-                # Get persisted state for this output
-                # Try entity_id first (new format), fall back to output_name (old format s1-s6)
-                output_state = self._initial_state.get(entity_id)
-                if output_state is None:
-                    output_state = self._initial_state.get(output_name, {})
-                    if output_state:
-                        self.logger.debug(
-                            f"Using legacy state key '{output_name}' for {entity_id}"
-                        )
-                else:
-                    output_state = output_state or {}
+                switch_nr, name, entity_id = resolved
+                output_state = self._persisted_output_state(output_name, entity_id)
                 persisted_brightness = output_state.get("brightness")
                 persisted_state = output_state.get("state")
 
@@ -143,25 +152,11 @@ class Bloc9Device(ScheiberCanDevice):
         # Create switches for configured outputs
         if switches_config:
             for output_name, config in switches_config.items():
-                switch_nr = output_map.get(output_name.lower())
-                if switch_nr is None:
-                    self.logger.warning(f"Invalid output name: {output_name}")
+                resolved = self._resolve_output(output_name, config)
+                if resolved is None:
                     continue
-
-                name = config.get("name", output_name)
-                entity_id = config.get("entity_id", name.lower().replace(" ", "_"))
-
-                # Get persisted state for this output
-                # Try entity_id first (new format), fall back to output_name (old format s1-s6)
-                output_state = self._initial_state.get(entity_id)
-                if output_state is None:
-                    output_state = self._initial_state.get(output_name, {})
-                    if output_state:
-                        self.logger.debug(
-                            f"Using legacy state key '{output_name}' for {entity_id}"
-                        )
-                else:
-                    output_state = output_state or {}
+                switch_nr, name, entity_id = resolved
+                output_state = self._persisted_output_state(output_name, entity_id)
                 persisted_state = output_state.get("state")
 
                 switch = Switch(
@@ -187,13 +182,10 @@ class Bloc9Device(ScheiberCanDevice):
 
         if pulses_config:
             for output_name, config in pulses_config.items():
-                switch_nr = output_map.get(output_name.lower())
-                if switch_nr is None:
-                    self.logger.warning(f"Invalid output name: {output_name}")
+                resolved = self._resolve_output(output_name, config)
+                if resolved is None:
                     continue
-
-                name = config.get("name", output_name)
-                entity_id = config.get("entity_id", name.lower().replace(" ", "_"))
+                switch_nr, name, entity_id = resolved
                 pulse = PulseOutput(
                     device_id=device_id,
                     switch_nr=switch_nr,
@@ -208,55 +200,82 @@ class Bloc9Device(ScheiberCanDevice):
         # Build matcher-to-outputs mapping for message dispatch
         self.get_matchers()
 
+        # Configured name per output, aligned with OUTPUT_NAMES, for heartbeats
+        output_labels = ["unknown"] * len(OUTPUT_NAMES)
+        for outputs in (self.lights, self.switches, self.pulses):
+            for output in outputs:
+                output_labels[output.switch_nr] = output.name
+        self._output_labels = tuple(output_labels)
+
+    def _resolve_output(
+        self, output_name: str, config: Dict[str, Any]
+    ) -> Optional[Tuple[int, str, str]]:
+        """
+        Resolve a configured output to its switch number, name and entity ID.
+
+        Returns:
+            (switch_nr, name, entity_id), or None if the output name is invalid
+        """
+        switch_nr = OUTPUT_SWITCH_NRS.get(output_name.lower())
+        if switch_nr is None:
+            self.logger.warning(f"Invalid output name: {output_name}")
+            return None
+
+        name = config.get("name", output_name)
+        entity_id = config.get("entity_id", name.lower().replace(" ", "_"))
+        return switch_nr, name, entity_id
+
+    def _persisted_output_state(
+        self, output_name: str, entity_id: str
+    ) -> Dict[str, Any]:
+        """
+        Return the persisted state for an output.
+
+        Tries entity_id first (new format), falls back to output_name
+        (old format s1-s6).
+        """
+        output_state = self._initial_state.get(entity_id)
+        if output_state is None:
+            output_state = self._initial_state.get(output_name, {})
+            if output_state:
+                self.logger.debug(
+                    f"Using legacy state key '{output_name}' for {entity_id}"
+                )
+            return output_state
+        return output_state or {}
+
     def get_matchers(self) -> List[Matcher]:
         """
         Return all matchers for Bloc9 messages.
 
         Delegates to individual lights and switches to get their matchers,
         builds a mapping from matcher pattern to outputs for direct dispatch,
-        then adds heartbeat and command echo matchers.
+        then adds heartbeat and command echo matchers. The result is built on
+        the first call and reused afterwards.
         """
+        if self._matchers is not None:
+            return list(self._matchers)
+
         matchers = []
         self._matcher_to_outputs = {}  # Clear and rebuild
 
-        # Collect matchers from all lights
-        for light in self.lights:
-            for matcher in light.get_matchers():
-                pattern = matcher.pattern
-                if pattern not in self._matcher_to_outputs:
-                    self._matcher_to_outputs[pattern] = []
-                    matchers.append(matcher)
-                self._matcher_to_outputs[pattern].append(light)
-
-        # Collect matchers from all switches
-        for switch in self.switches:
-            for matcher in switch.get_matchers():
-                pattern = matcher.pattern
-                if pattern not in self._matcher_to_outputs:
-                    self._matcher_to_outputs[pattern] = []
-                    matchers.append(matcher)
-                self._matcher_to_outputs[pattern].append(switch)
-
-        for pulse in self.pulses:
-            for matcher in pulse.get_matchers():
-                pattern = matcher.pattern
-                if pattern not in self._matcher_to_outputs:
-                    self._matcher_to_outputs[pattern] = []
-                    matchers.append(matcher)
-                self._matcher_to_outputs[pattern].append(pulse)
+        # Collect matchers from all outputs (lights, switches, pulses)
+        for outputs in (self.lights, self.switches, self.pulses):
+            for output in outputs:
+                for matcher in output.get_matchers():
+                    pattern = matcher.pattern
+                    if pattern not in self._matcher_to_outputs:
+                        self._matcher_to_outputs[pattern] = []
+                        matchers.append(matcher)
+                    self._matcher_to_outputs[pattern].append(output)
 
         # Add heartbeat matcher (low-priority status)
-        heartbeat_pattern = 0x00000600 | build_bloc9_address_byte(
-            self.device_id, self.segment_id
-        )
-        matchers.append(Matcher(pattern=heartbeat_pattern, mask=0xFFFFFFFF))
+        matchers.append(Matcher(pattern=self._heartbeat_id, mask=0xFFFFFFFF))
 
         # Add command matcher (identify our own commands as known, not "unknown")
-        command_id = 0x02360600 | build_bloc9_address_byte(
-            self.device_id, self.segment_id
-        )
-        matchers.append(Matcher(pattern=command_id, mask=0xFFFFFFFF))
+        matchers.append(Matcher(pattern=self._command_id, mask=0xFFFFFFFF))
 
+        self._matchers = tuple(matchers)
         return matchers
 
     def process_message(self, msg: can.Message) -> None:
@@ -269,28 +288,21 @@ class Bloc9Device(ScheiberCanDevice):
             msg: CAN message
         """
         # Check if this is heartbeat (low-priority status)
-        heartbeat_pattern = 0x00000600 | build_bloc9_address_byte(
-            self.device_id, self.segment_id
-        )
-        if msg.arbitration_id == heartbeat_pattern:
+        arbitration_id = msg.arbitration_id
+        if arbitration_id == self._heartbeat_id:
             self._process_status(msg)
             return
 
         # Check if this is command echo (ignore)
-        command_id = 0x02360600 | build_bloc9_address_byte(
-            self.device_id, self.segment_id
-        )
-        if msg.arbitration_id == command_id:
+        if arbitration_id == self._command_id:
             return
 
         # Direct dispatch: look up outputs by arbitration ID
-        outputs = self._matcher_to_outputs.get(msg.arbitration_id, [])
+        outputs = self._matcher_to_outputs.get(arbitration_id)
         if outputs:
             self._process_switch_change(msg, outputs)
         else:
-            self.logger.debug(
-                f"No outputs for arbitration_id 0x{msg.arbitration_id:08X}"
-            )
+            self.logger.debug("No outputs for arbitration_id 0x%08X", arbitration_id)
 
     def _process_switch_change(self, msg: can.Message, outputs: List) -> None:
         """
@@ -300,14 +312,17 @@ class Bloc9Device(ScheiberCanDevice):
         """
         if len(msg.data) < 8:
             self.logger.warning(
-                f"Switch change message too short: {len(msg.data)} bytes, expected 8"
+                "Switch change message too short: %d bytes, expected 8", len(msg.data)
             )
             return
 
         # Log the actual CAN message being processed
-        self.logger.debug(
-            f"Processing state change: ID=0x{msg.arbitration_id:08X} Data={msg.data.hex()}"
-        )
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(
+                "Processing state change: ID=0x%08X Data=%s",
+                msg.arbitration_id,
+                msg.data.hex(),
+            )
 
         # Direct dispatch: each output knows how to process the message
         for output in outputs:
@@ -320,26 +335,11 @@ class Bloc9Device(ScheiberCanDevice):
         This message is periodic and doesn't contain state changes.
         Use it to publish device info to MQTT.
         """
-        # Build output info dict - include all 6 outputs
-        outputs = {}
-
-        # Initialize all as unknown
-        for i in range(1, 7):
-            outputs[f"s{i}"] = "unknown"
-
-        # Fill in configured lights
-        for light in self.lights:
-            output_name = f"s{light.switch_nr + 1}"
-            outputs[output_name] = light.name
-
-        # Fill in configured switches
-        for switch in self.switches:
-            output_name = f"s{switch.switch_nr + 1}"
-            outputs[output_name] = switch.name
+        if not self._observers:
+            return
 
-        for pulse in self.pulses:
-            output_name = f"s{pulse.switch_nr + 1}"
-            outputs[output_name] = pulse.name
+        # Build output info dict - include all 6 outputs, unknown unless configured
+        outputs = dict(zip(OUTPUT_NAMES, self._output_labels))
 
         # Notify observers with device info
         device_info = {
@@ -362,30 +362,29 @@ class Bloc9Device(ScheiberCanDevice):
             state: Desired state
             brightness: Desired brightness (0-255)
         """
-        # Construct CAN ID
-        can_id = 0x02360600 | build_bloc9_address_byte(self.device_id, self.segment_id)
-
         # Determine brightness
         brightness = brightness if brightness is not None else (255 if state else 0)
 
         # Apply dimming threshold logic
         if brightness <= self.DIMMING_THRESHOLD:
             # Low brightness = OFF (no PWM)
-            data = bytes([switch_nr, 0x00, 0x00, 0x00])
-            self.logger.debug(f"S{switch_nr+1} -> OFF (brightness={brightness})")
+            data = OFF_COMMANDS[switch_nr]
+            self.logger.debug("S%d -> OFF (brightness=%d)", switch_nr + 1, brightness)
         elif brightness >= (255 - self.DIMMING_THRESHOLD):
             # High brightness = full ON (no PWM)
-            data = bytes([switch_nr, 0x01, 0x00, 0x00])
-            self.logger.debug(f"S{switch_nr+1} -> ON (brightness={brightness})")
+            data = ON_COMMANDS[switch_nr]
+            self.logger.debug("S%d -> ON (brightness=%d)", switch_nr + 1, brightness)
         else:
             # Middle range = PWM dimming
             brightness_byte = max(1, min(254, brightness))
             data = bytes([switch_nr, 0x11, 0x00, brightness_byte])
-            self.logger.debug(f"S{switch_nr+1} -> PWM brightness={brightness_byte}")
+            self.logger.debug(
+                "S%d -> PWM brightness=%d", switch_nr + 1, brightness_byte
+            )
 
         # Send via CAN bus
         try:
-            self.can_bus.send_message(can_id, data)
+            self.can_bus.send_message(self._command_id, data)
         except Exception as e:
             self.logger.error(f"Failed to send command: {e}")
 
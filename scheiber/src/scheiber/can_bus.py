@@ -41,6 +41,8 @@ class ScheiberCanBus:
 
         self.bus: Optional[can.BusABC] = None
         self.notifier: Optional[can.Notifier] = None
+        # Replaced, never mutated in place, so the receive path can iterate it
+        # without copying; _message_lock only serializes the writers
         self._message_callbacks: List[Callable[[can.Message], None]] = []
         self._message_lock = threading.Lock()
         self._running = False
@@ -72,7 +74,7 @@ class ScheiberCanBus:
         """
         if self.read_only:
             self.logger.warning(
-                f"Cannot send message in read-only mode: 0x{arbitration_id:08X}"
+                "Cannot send message in read-only mode: 0x%08X", arbitration_id
             )
             return
 
@@ -84,7 +86,10 @@ class ScheiberCanBus:
             self.bus.send(msg)
             with self.stats_lock:
                 self.stats["messages_sent"] += 1
-            self.logger.debug(f"CAN TX: ID=0x{arbitration_id:08X} Data={data.hex()}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(
+                    "CAN TX: ID=0x%08X Data=%s", arbitration_id, data.hex()
+                )
         except Exception as e:
             self.logger.error(f"Failed to send CAN message: {e}")
             raise
@@ -188,7 +193,7 @@ class ScheiberCanBus:
         """Subscribe to raw CAN messages from the shared listener."""
         with self._message_lock:
             if callback not in self._message_callbacks:
-                self._message_callbacks.append(callback)
+                self._message_callbacks = self._message_callbacks + [callback]
 
     def unsubscribe_from_messages(
         self, callback: Callable[[can.Message], None]
@@ -196,7 +201,9 @@ class ScheiberCanBus:
         """Unsubscribe from raw CAN messages."""
         with self._message_lock:
             if callback in self._message_callbacks:
-                self._message_callbacks.remove(callback)
+                callbacks = list(self._message_callbacks)
+                callbacks.remove(callback)
+                self._message_callbacks = callbacks
 
     def unsubscribe_from_stats(
         self, callback: Callable[[Dict[str, Any]], None]
@@ -218,10 +225,7 @@ class ScheiberCanBus:
             self.stats["unique_ids"].add(msg.arbitration_id)
 
         # Forward to subscribers
-        with self._message_lock:
-            callbacks = self._message_callbacks.copy()
-
-        for callback in callbacks:
+        for callback in self._message_callbacks:
             try:
                 callback(msg)
             except Exception as e:
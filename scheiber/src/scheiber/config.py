@@ -9,8 +9,9 @@ import hashlib
 import os
 import re
 from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Generator, List, Optional, Tuple
+from typing import Any, Dict, Generator, List, Optional, Tuple, Union
 
 import yaml
 
@@ -19,9 +20,15 @@ try:
 except ImportError:  # pragma: no cover
     fcntl = None
 
+# libyaml's C loader when PyYAML was built with it, the pure-Python one otherwise
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 ENTITY_ID_RE = re.compile(r"^[a-z0-9_]+$")
+# Home Assistant domain prefixes users sometimes paste into entity_id
+OUTPUT_ENTITY_DOMAIN_PREFIXES = ("light.", "switch.", "button.")
 AIR_SWITCH_IDENTITY_RE = re.compile(r"^[0-9A-Fa-f]{6}$")
 BLOC9_OUTPUT_KEYS = tuple(f"s{i}" for i in range(1, 7))
+BLOC9_OUTPUT_KEY_SET = frozenset(BLOC9_OUTPUT_KEYS)
 SENSOR_DEVICE_TYPES = {"bloc7", "source_selector"}
 AIR_SWITCH_DEVICE_TYPE = "air_switch"
 AIR_SWITCH_BUTTON_INDEX_MIN = 1
@@ -150,9 +157,11 @@ def _normalize_float_field(
     return None, make_error(code, message, path)
 
 
-def compute_revision(raw_yaml: str) -> str:
-    """Compute a stable revision hash for a config payload."""
-    digest = hashlib.sha256(raw_yaml.encode("utf-8")).hexdigest()
+def compute_revision(raw_yaml: Union[str, bytes]) -> str:
+    """Compute a stable revision hash for a config payload (text or UTF-8 bytes)."""
+    if isinstance(raw_yaml, str):
+        raw_yaml = raw_yaml.encode("utf-8")
+    digest = hashlib.sha256(raw_yaml).hexdigest()
     return f"sha256:{digest}"
 
 
@@ -173,9 +182,25 @@ def load_runtime_config(config_path: Optional[str]) -> Dict[str, Any]:
     if not path.exists():
         raise FileNotFoundError(f"Configuration file not found: {config_path}")
 
-    raw_yaml = path.read_text(encoding="utf-8")
+    # Reuse the config parsed earlier in this process while the file is untouched;
+    # callers get their own copy so they cannot alter the cached one
+    stat = path.stat()
+    return copy.deepcopy(
+        _load_runtime_config_file(
+            str(path), stat.st_mtime_ns, stat.st_size, stat.st_ino
+        )
+    )
+
+
+@lru_cache(maxsize=4)
+def _load_runtime_config_file(
+    config_path: str, mtime_ns: int, size: int, inode: int
+) -> Dict[str, Any]:
+    """Load a runtime config file; the stat arguments only key the cache."""
+    path = Path(config_path)
+    raw_yaml = path.read_bytes()
     try:
-        raw_data = yaml.safe_load(raw_yaml) or {}
+        raw_data = yaml.load(raw_yaml, Loader=_YAML_LOADER) or {}
     except yaml.YAMLError as exc:
         raise ValueError(f"Failed to parse configuration: {exc}") from exc
 
@@ -201,11 +226,13 @@ def load_editor_state(config_path: str) -> Dict[str, Any]:
             "diagnostics": {"errors": [], "warnings": []},
         }
 
-    raw_yaml = path.read_text(encoding="utf-8")
-    revision = compute_revision(raw_yaml)
+    # libyaml scans bytes directly; a str would be re-encoded before parsing
+    raw_bytes = path.read_bytes()
+    raw_yaml = raw_bytes.decode("utf-8")
+    revision = compute_revision(raw_bytes)
 
     try:
-        raw_data = yaml.safe_load(raw_yaml) or {}
+        raw_data = yaml.load(raw_bytes, Loader=_YAML_LOADER) or {}
     except yaml.YAMLError as exc:
         return {
             "path": config_path,
@@ -520,11 +547,7 @@ def validate_editor_config(
                 else:
                     entity_id = entity_id.strip()
                     normalized_output["entity_id"] = entity_id
-                    if (
-                        entity_id.startswith("light.")
-                        or entity_id.startswith("switch.")
-                        or entity_id.startswith("button.")
-                    ):
+                    if entity_id.startswith(OUTPUT_ENTITY_DOMAIN_PREFIXES):
                         errors.append(
                             make_error(
                                 "entity_id_with_domain",
@@ -603,7 +626,7 @@ def validate_editor_config(
                 normalized_outputs[output_name] = normalized_output
 
             for output_name in outputs.keys():
-                if output_name not in BLOC9_OUTPUT_KEYS:
+                if output_name not in BLOC9_OUTPUT_KEY_SET:
                     errors.append(
                         make_error(
                             "invalid_output_name",
@@ -1191,7 +1214,7 @@ def runtime_to_editor_config(runtime_config: Dict[str, Any]) -> Dict[str, Any]:
             )
 
         for output_name, output_config in output_metadata.items():
-            if output_name not in BLOC9_OUTPUT_KEYS:
+            if output_name not in BLOC9_OUTPUT_KEY_SET:
                 raise ConfigValidationError(
                     [
                         make_error(
@@ -1232,9 +1255,9 @@ def runtime_to_editor_config(runtime_config: Dict[str, Any]) -> Dict[str, Any]:
             ("switch", "switches"),
             ("pulse", "pulses"),
         ):
-            section = device.get(section_name, {})
+            section = device.get(section_name)
             if section is None:
-                section = {}
+                continue
             if not isinstance(section, dict):
                 raise ConfigValidationError(
                     [
@@ -1247,7 +1270,7 @@ def runtime_to_editor_config(runtime_config: Dict[str, Any]) -> Dict[str, Any]:
                 )
 
             for output_name, output_config in section.items():
-                if output_name not in BLOC9_OUTPUT_KEYS:
+                if output_name not in BLOC9_OUTPUT_KEY_SET:
                     raise ConfigValidationError(
                         [
                             make_error(
@@ -1404,10 +1427,11 @@ def save_editor_config(
     path = Path(config_path)
 
     with locked_config_path(path):
-        current_raw = path.read_text(encoding="utf-8") if path.exists() else None
-        current_revision = (
-            compute_revision(current_raw) if current_raw is not None else None
-        )
+        current_raw = current_revision = None
+        if path.exists():
+            current_bytes = path.read_bytes()
+            current_raw = current_bytes.decode("utf-8")
+            current_revision = compute_revision(current_bytes)
         if expected_revision is not None and expected_revision != current_revision:
             raise ConfigRevisionConflictError(
                 "Configuration has changed since it was loaded"
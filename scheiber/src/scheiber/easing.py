@@ -6,6 +6,8 @@ All functions take a progress value (0.0 to 1.0) and return an eased value (0.0
 """
 
 import math
+from functools import lru_cache
+from typing import Tuple
 
 
 def linear(t: float) -> float:
@@ -232,3 +234,26 @@ def get_easing_function(name: str = None):
         )
 
     return EASING_FUNCTIONS[name]
+
+
+@lru_cache(maxsize=64)
+def get_easing_curve(name: str, steps: int) -> Tuple[float, ...]:
+    """
+    Get the eased progress values for a transition with a fixed number of steps.
+
+    The curve is sampled once per (easing, step count) pair and cached, so
+    repeated fades with the same duration do not re-evaluate the easing
+    function on every step.
+
+    Args:
+        name: Name of the easing function (e.g., "ease_in_out_sine")
+        steps: Number of steps in the transition (curve has steps + 1 samples)
+
+    Returns:
+        Tuple of eased values from 0.0 to 1.0, one per step
+
+    Raises:
+        ValueError: If the easing function name is not recognized
+    """
+    easing_func = get_easing_function(name)
+    return tuple(easing_func(step / steps) for step in range(steps + 1))
@@ -90,7 +90,7 @@ class DimmableLight(Output):
         # Store effect as default easing if provided
         if effect:
             self._default_easing = effect
-            self.logger.debug(f"Default easing set to: {effect}")
+            self.logger.debug("Default easing set to: %s", effect)
 
         # Determine easing: explicit fade_easing > effect > stored default
         easing = (
@@ -116,7 +116,7 @@ class DimmableLight(Output):
         # If only effect with state=ON (no brightness), just store it - don't change light
         if effect and brightness is None and state:
             # Effect stored above, don't change light state
-            self.logger.debug(f"Stored effect '{effect}' without changing light state")
+            self.logger.debug("Stored effect '%s' without changing light state", effect)
             return
 
         # Immediate brightness change
@@ -284,13 +284,16 @@ class DimmableLight(Output):
         Args:
             msg: CAN message
         """
-        state, brightness = self.get_state_from_can_message(
-            msg, self.switch_nr, self.dimming_threshold
-        )
+        state, brightness = self._decode_matching_message(msg, self.dimming_threshold)
 
         self.logger.debug(
-            f"Light '{self.name}' (S{self.switch_nr+1}) received matched message: "
-            f"arbitration_id=0x{msg.arbitration_id:08X}, state={state}, brightness={brightness}"
+            "Light '%s' (S%d) received matched message: "
+            "arbitration_id=0x%08X, state=%s, brightness=%s",
+            self.name,
+            self.switch_nr + 1,
+            msg.arbitration_id,
+            state,
+            brightness,
         )
 
         self.update_state(state, brightness)
@@ -327,14 +330,19 @@ class DimmableLight(Output):
             changed_props["brightness"] = effective_brightness
 
         if changed_props:
-            translation_note = (
-                f" (translated from brightness={brightness})"
-                if brightness != effective_brightness
-                else ""
-            )
-            self.logger.debug(
-                f"State updated from CAN: {self.name} state={effective_state}, brightness={effective_brightness}{translation_note}"
-            )
+            if self.logger.isEnabledFor(logging.DEBUG):
+                translation_note = (
+                    f" (translated from brightness={brightness})"
+                    if brightness != effective_brightness
+                    else ""
+                )
+                self.logger.debug(
+                    "State updated from CAN: %s state=%s, brightness=%s%s",
+                    self.name,
+                    effective_state,
+                    effective_brightness,
+                    translation_note,
+                )
             # Always send full state to MQTT (Home Assistant needs both state and brightness)
             full_state = {"state": effective_state, "brightness": effective_brightness}
             self._notify_observers(full_state)
@@ -22,6 +22,8 @@ class Matcher:
         mask: Bitmask to apply (0xFF masks all bits, 0x00 ignores all bits)
     """
 
+    __slots__ = ("pattern", "mask")
+
     pattern: int
     mask: int
 
@@ -9,6 +9,9 @@ from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import can
 
+from .matchers import Matcher
+from .protocol import build_address_byte
+
 
 class Output:
     """
@@ -45,6 +48,8 @@ class Output:
         self.switch_nr = switch_nr
         self.name = name
         self.entity_id = entity_id
+        # Even outputs use bytes 0-3 of their change frame, odd ones bytes 4-7
+        self._data_offset = 4 * (switch_nr % 2)
         self._send_command_func = send_command_func
         output_device_slug = (
             f"{device_id}" if segment_id == 0 else f"{device_id}_{segment_id}"
@@ -64,8 +69,6 @@ class Output:
         Returns:
             List of Matcher objects
         """
-        from .matchers import Matcher
-
         # Determine which message type based on switch number
         # S1/S2: 0x02160600, S3/S4: 0x02180600, S5/S6: 0x021A0600
         if self.switch_nr in (0, 1):  # S1, S2
@@ -80,12 +83,8 @@ class Output:
         else:
             return []
 
-        from .discovery import build_bloc9_address_byte
-
         # Add device route to pattern (same addressing as commands)
-        pattern = base_pattern | build_bloc9_address_byte(
-            self.device_id, self.segment_id
-        )
+        pattern = base_pattern | build_address_byte(self.device_id, self.segment_id)
 
         return [Matcher(pattern=pattern, mask=0xFFFFFFFF)]
 
@@ -128,6 +127,24 @@ class Output:
 
         return (state, brightness)
 
+    def _decode_matching_message(
+        self, msg: can.Message, dimming_threshold: int
+    ) -> Tuple[bool, int]:
+        """
+        Decode this output's state and brightness from a matched change frame.
+
+        Same decoding as get_state_from_can_message(), using the byte offset
+        resolved once at init instead of the switch number's parity.
+        """
+        data = msg.data
+        if len(data) < 8:
+            return (False, 0)
+
+        offset = self._data_offset
+        brightness = data[offset]
+        state = (data[offset + 3] & 0x01) == 0x01 or brightness > dimming_threshold
+        return (state, brightness)
+
     def process_matching_message(self, msg: can.Message) -> None:
         """
         Process a CAN message that matched this output's matcher.
@@ -15,6 +15,17 @@ BLOC7_NORMALIZED_PREFIX = 0x02040500
 BLOC7_RAW_PREFIX = 0x02060500
 SOURCE_SELECTOR_AC_PREFIX = 0x02040B00
 
+# Arbitration-ID prefix -> (device_type, message family)
+MESSAGE_FAMILIES = {
+    BLOC7_STATUS_PREFIX: ("bloc7", "status"),
+    BLOC9_STATUS_PREFIX: ("bloc9", "status"),
+    SOURCE_SELECTOR_STATUS_PREFIX: ("source_selector", "status"),
+    BLOC7_NORMALIZED_PREFIX: ("bloc7", "normalized_level"),
+    BLOC7_RAW_PREFIX: ("bloc7", "raw_sender"),
+    SOURCE_SELECTOR_AC_PREFIX: ("source_selector", "ac_measurement"),
+}
+PROVISIONAL_FAMILIES = frozenset({"status", "raw_sender"})
+
 
 def format_route_slug(bus_id: int, segment_id: int = 0) -> str:
     """Format a bus/segment identity for topics, state keys, and UI labels."""
@@ -63,26 +74,19 @@ def _base_classification(arbitration_id: int) -> Optional[Dict[str, Any]]:
 def classify_message_family(arbitration_id: int) -> Optional[Dict[str, Any]]:
     """Classify known Scheiber message families without decoding payloads."""
     prefix = arbitration_id & 0xFFFFFF00
-    base = _base_classification(arbitration_id)
-    if base is None:
+    known = MESSAGE_FAMILIES.get(prefix)
+    if known is None:
         return None
 
-    family_map = {
-        BLOC7_STATUS_PREFIX: ("bloc7", "status"),
-        BLOC9_STATUS_PREFIX: ("bloc9", "status"),
-        SOURCE_SELECTOR_STATUS_PREFIX: ("source_selector", "status"),
-        BLOC7_NORMALIZED_PREFIX: ("bloc7", "normalized_level"),
-        BLOC7_RAW_PREFIX: ("bloc7", "raw_sender"),
-        SOURCE_SELECTOR_AC_PREFIX: ("source_selector", "ac_measurement"),
-    }
-    device_type, family = family_map.get(prefix, (None, None))
-    if device_type is None:
+    base = _base_classification(arbitration_id)
+    if base is None:
         return None
 
+    device_type, family = known
     return {
         **base,
         "device_type": device_type,
         "family": family,
         "prefix": f"0x{prefix:08X}",
-        "is_provisional": family in {"status", "raw_sender"},
+        "is_provisional": family in PROVISIONAL_FAMILIES,
     }
@@ -39,16 +39,14 @@ class PulseOutput(Output):
 
     def press(self) -> None:
         """Trigger the configured momentary output."""
-        self.logger.info(f"Triggering pulse on S{self.switch_nr + 1}")
+        self.logger.info("Triggering pulse on S%d", self.switch_nr + 1)
         self._send_command_func(self.switch_nr, True)
 
     def process_matching_message(self, msg: can.Message) -> None:
         """
         Track observed state changes for diagnostics without publishing HA state.
         """
-        state, _brightness = self.get_state_from_can_message(
-            msg, self.switch_nr, self.dimming_threshold
-        )
+        state, _brightness = self._decode_matching_message(msg, self.dimming_threshold)
         self._state = state
 
     def restore_from_state(self, state: Dict) -> None:
@@ -69,12 +69,12 @@ class Switch(Output):
         Args:
             state: True for ON, False for OFF
         """
-        self.logger.info(f"Setting switch to {'ON' if state else 'OFF'}")
+        self.logger.info("Setting switch to %s", "ON" if state else "OFF")
 
         # Send command to hardware - don't update state yet
         # Wait for CAN confirmation via update_state()
         self._send_command(state)
-        self.logger.debug(f"Command sent, waiting for CAN confirmation")
+        self.logger.debug("Command sent, waiting for CAN confirmation")
 
     def process_matching_message(self, msg: can.Message) -> None:
         """
@@ -85,13 +85,15 @@ class Switch(Output):
         Args:
             msg: CAN message
         """
-        state, brightness = self.get_state_from_can_message(
-            msg, self.switch_nr, self.dimming_threshold
-        )
+        state, brightness = self._decode_matching_message(msg, self.dimming_threshold)
 
         self.logger.debug(
-            f"Switch '{self.name}' (S{self.switch_nr+1}) received matched message: "
-            f"arbitration_id=0x{msg.arbitration_id:08X}, state={state}"
+            "Switch '%s' (S%d) received matched message: "
+            "arbitration_id=0x%08X, state=%s",
+            self.name,
+            self.switch_nr + 1,
+            msg.arbitration_id,
+            state,
         )
 
         # Switch ignores brightness, only cares about state
@@ -143,10 +145,8 @@ class Switch(Output):
         Args:
             state: New state from CAN bus
         """
-        self.logger.debug(f"CAN state update received: {state}")
+        # Heartbeats repeat the current state; like lights, only changes log
         if self._state != state:
             self._state = state
-            self.logger.info(f"State changed from CAN, notifying observers: {state}")
+            self.logger.info("State changed from CAN, notifying observers: %s", state)
             self._notify_observers({"state": state})
-        else:
-            self.logger.debug(f"CAN state matches current state: {state}")
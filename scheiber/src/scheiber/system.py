@@ -6,6 +6,7 @@ Manages device instances, routes CAN messages, coordinates state persistence.
 
 import json
 import logging
+import os
 import threading
 import time
 from pathlib import Path
@@ -72,8 +73,14 @@ class ScheiberSystem:
         # State persistence
         self._state_dirty = False
         self._state_lock = threading.Lock()
-        self._state_timer: Optional[threading.Timer] = None
+        # One long-lived saver thread, woken early by _state_stop on shutdown
+        self._state_thread: Optional[threading.Thread] = None
+        self._state_stop = threading.Event()
         self._state_interval = 30.0  # Save every 30 seconds if dirty
+        # Last payload written, so heartbeats that change nothing skip the disk
+        self._saved_state_payload: Optional[str] = None
+        # Set once the state file's directory has been created
+        self._state_dir_ready = False
         self._running = False
 
     def get_device(
@@ -114,9 +121,9 @@ class ScheiberSystem:
             if device_key in state_data:
                 try:
                     device.restore_from_state(state_data[device_key])
-                    self.logger.info(f"Restored state for {device}")
+                    self.logger.info("Restored state for %s", device)
                 except Exception as e:
-                    self.logger.error(f"Failed to restore state for {device}: {e}")
+                    self.logger.error("Failed to restore state for %s: %s", device, e)
 
     def save_state(self) -> Dict[str, Any]:
         """
@@ -131,7 +138,7 @@ class ScheiberSystem:
             try:
                 state_data[device_key] = device.store_to_state()
             except Exception as e:
-                self.logger.error(f"Failed to collect state from {device}: {e}")
+                self.logger.error("Failed to collect state from %s: %s", device, e)
         return state_data
 
     def start(self) -> None:
@@ -150,18 +157,23 @@ class ScheiberSystem:
 
         # Start periodic state saving
         if self.state_file:
-            self._schedule_state_save()
+            self._state_stop.clear()
+            self._state_thread = threading.Thread(
+                target=self._state_save_loop, name="scheiber-state-save", daemon=True
+            )
+            self._state_thread.start()
 
-        self.logger.info(f"Scheiber system started with {len(self.devices)} devices")
+        self.logger.info("Scheiber system started with %s devices", len(self.devices))
 
     def stop(self) -> None:
         """Stop CAN message processing."""
         self._running = False
 
-        # Cancel state save timer
-        if self._state_timer:
-            self._state_timer.cancel()
-            self._state_timer = None
+        # Stop the state saver
+        self._state_stop.set()
+        if self._state_thread:
+            self._state_thread.join(timeout=5.0)
+            self._state_thread = None
 
         # Save state one last time
         if self.state_file and self._state_dirty:
@@ -204,10 +216,13 @@ class ScheiberSystem:
                 matched = True
                 try:
                     device.process_message(msg)
-                    self._mark_state_dirty()
+                    # Most frames arrive while the state is already dirty; only
+                    # take the lock when the flag actually changes
+                    if not self._state_dirty:
+                        self._mark_state_dirty()
                 except Exception as e:
                     self.logger.error(
-                        f"Error processing message in {device}: {e}", exc_info=True
+                        "Error processing message in %s: %s", device, e, exc_info=True
                     )
 
         # Log unknown arbitration IDs (once)
@@ -215,8 +230,9 @@ class ScheiberSystem:
             if msg.arbitration_id not in self._unknown_ids:
                 self._unknown_ids.add(msg.arbitration_id)
                 self.logger.warning(
-                    f"Unknown CAN ID: 0x{msg.arbitration_id:08X} "
-                    f"Data: {msg.data.hex()}"
+                    "Unknown CAN ID: 0x%08X Data: %s",
+                    msg.arbitration_id,
+                    msg.data.hex(),
                 )
 
     def _mark_state_dirty(self) -> None:
@@ -229,58 +245,52 @@ class ScheiberSystem:
         if not self.state_file:
             return
 
-        state_path = Path(self.state_file)
-        if not state_path.exists():
-            self.logger.info(f"No state file found: {self.state_file}")
-            return
-
         try:
-            with open(state_path, "r") as f:
+            with open(self.state_file, "r") as f:
                 state_data = json.load(f)
             self.restore_state(state_data)
-            self.logger.info(f"Loaded state from: {self.state_file}")
+            self.logger.info("Loaded state from: %s", self.state_file)
+        except FileNotFoundError:
+            self.logger.info("No state file found: %s", self.state_file)
         except Exception as e:
-            self.logger.error(f"Failed to load state: {e}")
+            self.logger.error("Failed to load state: %s", e)
 
     def _save_state(self) -> None:
         """Save state to file."""
         if not self.state_file:
             return
 
+        # Clear the flag before collecting, so changes made meanwhile are kept
+        with self._state_lock:
+            self._state_dirty = False
+
         try:
-            state_data = self.save_state()
+            payload = json.dumps(self.save_state(), separators=(",", ":"))
+            if payload == self._saved_state_payload:
+                return
+
             state_path = Path(self.state_file)
-            state_path.parent.mkdir(parents=True, exist_ok=True)
+            if not self._state_dir_ready:
+                state_path.parent.mkdir(parents=True, exist_ok=True)
+                self._state_dir_ready = True
 
-            # Write atomically (write to temp, then rename)
+            # Write atomically (write to temp, then rename); sync before the
+            # rename so a power cut cannot leave a truncated state file behind
             temp_path = state_path.with_suffix(".tmp")
             with open(temp_path, "w") as f:
-                json.dump(state_data, f, indent=2)
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
             temp_path.replace(state_path)
+            self._saved_state_payload = payload
 
-            with self._state_lock:
-                self._state_dirty = False
-
-            self.logger.debug(f"Saved state to: {self.state_file}")
+            self.logger.debug("Saved state to: %s", self.state_file)
         except Exception as e:
-            self.logger.error(f"Failed to save state: {e}")
-
-    def _schedule_state_save(self) -> None:
-        """Schedule periodic state saving."""
-        if not self._running:
-            return
-
-        def save_if_dirty():
-            if self._running:
-                with self._state_lock:
-                    should_save = self._state_dirty
-
-                if should_save:
-                    self._save_state()
-
-                # Schedule next save
-                self._schedule_state_save()
-
-        self._state_timer = threading.Timer(self._state_interval, save_if_dirty)
-        self._state_timer.daemon = True
-        self._state_timer.start()
+            self._mark_state_dirty()
+            self.logger.error("Failed to save state: %s", e)
+
+    def _state_save_loop(self) -> None:
+        """Save state periodically while dirty, until the system stops."""
+        while not self._state_stop.wait(self._state_interval):
+            if self._state_dirty:
+                self._save_state()
@@ -70,3 +70,21 @@ devices:
     system._on_can_message(msg)
 
     assert events == [{"event_type": "press"}]
+
+
+def test_unknown_device_type_is_skipped_not_defaulted():
+    import logging
+    from unittest.mock import Mock
+
+    from scheiber import _create_devices
+
+    config = {
+        "devices": [
+            {"type": "bloc99", "bus_id": 1},
+            {"type": "air_switch", "bus_id": 2, "buttons": []},
+        ]
+    }
+
+    devices = _create_devices(config, Mock(), {}, logging.getLogger("test"))
+
+    assert [type(device) for device in devices] == [AirSwitchDevice]
@@ -5,6 +5,7 @@ from scheiber.config import (
     ConfigValidationError,
     compute_revision,
     load_editor_state,
+    load_runtime_config,
     runtime_to_editor_config,
     save_editor_config,
     validate_editor_config,
@@ -278,6 +279,31 @@ def test_validate_editor_config_rejects_duplicate_entity_id():
     assert any(error["code"] == "duplicate_entity_id" for error in exc.value.errors)
 
 
+def test_validate_editor_config_rejects_entity_id_with_domain():
+    config = {
+        "schema_version": 1,
+        "devices": [
+            {
+                "type": "bloc9",
+                "bus_id": 1,
+                "outputs": {
+                    "s1": {
+                        "enabled": True,
+                        "role": "light",
+                        "name": "Main",
+                        "entity_id": "light.main",
+                    }
+                },
+            }
+        ],
+    }
+
+    with pytest.raises(ConfigValidationError) as exc:
+        validate_editor_config(config)
+
+    assert any(error["code"] == "entity_id_with_domain" for error in exc.value.errors)
+
+
 def test_validate_editor_config_allows_shared_logical_light_entity_id():
     normalized, warnings = validate_editor_config(
         {
@@ -719,3 +745,109 @@ def test_load_editor_state_returns_missing_for_absent_file(tmp_path):
 
     assert state["status"] == "missing"
     assert state["config"]["devices"] == []
+
+
+@pytest.mark.parametrize("loader", ["CSafeLoader", "SafeLoader"])
+def test_load_runtime_config_with_either_yaml_loader(tmp_path, monkeypatch, loader):
+    import yaml
+
+    from scheiber import config as config_module
+
+    if not hasattr(yaml, loader):
+        pytest.skip(f"PyYAML built without {loader}")
+    monkeypatch.setattr(config_module, "_YAML_LOADER", getattr(yaml, loader))
+
+    config_path = tmp_path / "scheiber.yaml"
+    config_path.write_text(
+        "devices:\n"
+        "  - type: bloc9\n"
+        "    bus_id: 7\n"
+        "    lights:\n"
+        "      s1:\n"
+        "        name: Salon\n"
+        "        entity_id: salon\n",
+        encoding="utf-8",
+    )
+
+    runtime_config = load_runtime_config(str(config_path))
+
+    assert runtime_config["devices"][0]["bus_id"] == 7
+    assert runtime_config["devices"][0]["lights"]["s1"]["entity_id"] == "salon"
+
+
+def test_load_runtime_config_reuses_parsed_config_until_yaml_changes(
+    tmp_path, monkeypatch
+):
+    from scheiber import config as config_module
+
+    config_path = tmp_path / "scheiber.yaml"
+    config_path.write_text(
+        "devices:\n"
+        "  - type: bloc9\n"
+        "    bus_id: 7\n"
+        "    lights:\n"
+        "      s1:\n"
+        "        name: Salon\n"
+        "        entity_id: salon\n",
+        encoding="utf-8",
+    )
+
+    first = load_runtime_config(str(config_path))
+
+    def fail_yaml_load(*args, **kwargs):
+        raise AssertionError("YAML should not be parsed on a cache hit")
+
+    monkeypatch.setattr(config_module.yaml, "load", fail_yaml_load)
+    assert load_runtime_config(str(config_path)) == first
+
+    monkeypatch.undo()
+    config_path.write_text(
+        config_path.read_text(encoding="utf-8").replace("Salon", "Crew galley"),
+        encoding="utf-8",
+    )
+    updated = load_runtime_config(str(config_path))
+    assert updated["devices"][0]["lights"]["s1"]["name"] == "Crew galley"
+
+
+def test_load_runtime_config_returns_independent_copies(tmp_path):
+    config_path = tmp_path / "scheiber.yaml"
+    config_path.write_text(
+        "devices:\n"
+        "  - type: bloc9\n"
+        "    bus_id: 7\n"
+        "    lights:\n"
+        "      s1:\n"
+        "        name: Salon\n"
+        "        entity_id: salon\n",
+        encoding="utf-8",
+    )
+
+    first = load_runtime_config(str(config_path))
+    first["devices"].clear()
+
+    second = load_runtime_config(str(config_path))
+    assert second["devices"][0]["lights"]["s1"]["entity_id"] == "salon"
+
+
+def test_editor_revision_of_crlf_config_is_accepted_on_save(tmp_path):
+    config_path = tmp_path / "scheiber-config.yaml"
+    config_path.write_bytes(
+        b"devices:\r\n"
+        b"  - type: bloc9\r\n"
+        b"    bus_id: 7\r\n"
+        b"    lights:\r\n"
+        b"      s1:\r\n"
+        b"        name: Main\r\n"
+        b"        entity_id: main_light\r\n"
+    )
+
+    original = config_path.read_bytes()
+
+    state = load_editor_state(str(config_path))
+    assert state["status"] == "valid"
+    assert state["revision"] == compute_revision(original)
+
+    saved = save_editor_config(
+        str(config_path), state["config"], expected_revision=state["revision"]
+    )
+    assert saved["previous_raw_yaml"] == original.decode("utf-8")
@@ -66,6 +66,11 @@ def test_classify_message_family_keeps_route_and_family_separate():
     assert selector["route_slug"] == "3_2"
 
 
+def test_classify_message_family_ignores_unknown_prefixes():
+    assert classify_message_family(0x0216058A) is None
+    assert classify_message_family(0x00000B9A)["is_provisional"] is True
+
+
 def test_classify_bloc9_state_update_message():
     msg = can.Message(
         arbitration_id=0x021A06B8,
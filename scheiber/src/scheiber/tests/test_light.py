@@ -4,7 +4,9 @@ from unittest.mock import Mock, call
 
 import pytest
 
+from scheiber.easing import EASING_FUNCTIONS, get_easing_curve
 from scheiber.light import DimmableLight
+from scheiber.transitions import compute_fade_steps
 
 
 class TestDimmableLight:
@@ -704,5 +706,44 @@ class TestDimmableLightTransitions:
         assert state["state"] == True
 
 
+class TestEasingCurve:
+    """Test precomputed easing curves used by fade transitions."""
+
+    def test_curve_matches_easing_function(self):
+        """Test curve samples equal the easing function at each step."""
+        for name, easing_func in EASING_FUNCTIONS.items():
+            curve = get_easing_curve(name, 10)
+            assert len(curve) == 11
+            assert curve == tuple(easing_func(step / 10) for step in range(11))
+
+    def test_curve_is_cached(self):
+        """Test repeated lookups reuse the same curve."""
+        assert get_easing_curve("linear", 25) is get_easing_curve("linear", 25)
+
+    def test_unknown_easing_raises(self):
+        """Test unknown easing names are rejected."""
+        with pytest.raises(ValueError):
+            get_easing_curve("not_an_easing", 10)
+
+    def test_fade_steps_follow_curve(self):
+        """Test fade steps scale the curve between start and end brightness."""
+        assert compute_fade_steps(0, 200, get_easing_curve("linear", 4)) == [
+            0,
+            50,
+            100,
+            150,
+            200,
+        ]
+        assert compute_fade_steps(200, 0, get_easing_curve("linear", 2)) == [
+            200,
+            100,
+            0,
+        ]
+
+    def test_fade_steps_are_clamped(self):
+        """Test fade steps stay within 0-255 for overshooting curves."""
+        assert compute_fade_steps(0, 255, (-0.1, 0.5, 1.1)) == [0, 128, 255]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -58,3 +58,10 @@ class TestMatcher:
 
         assert "0x12345678" in str_repr or "0x12345678" in str_repr.upper()
         assert "0xffffff00" in str_repr or "0xFFFFFF00" in str_repr
+
+    def test_matcher_has_no_instance_dict(self):
+        """Test matchers are slotted (one is created per output)."""
+        matcher = Matcher(pattern=0x12345678, mask=0xFFFFFFFF)
+
+        assert not hasattr(matcher, "__dict__")
+        assert matcher == Matcher(pattern=0x12345678, mask=0xFFFFFFFF)
@@ -349,6 +349,37 @@ class TestMessageRouting:
         # Verify no overlap
         assert device_3_patterns.isdisjoint(device_9_patterns)
 
+    def test_matchers_are_built_once(self):
+        """Test repeated get_matchers calls return the same matchers."""
+        device = Bloc9Device(
+            device_id=3,
+            can_bus=Mock(),
+            lights_config={"s1": {"name": "Device 3 S1"}},
+        )
+
+        matchers = device.get_matchers()
+        matchers.clear()
+
+        assert [m.pattern for m in device.get_matchers()] == [
+            0x02160698,  # S1/S2 change
+            0x00000698,  # Heartbeat
+            0x02360698,  # Command echo
+        ]
+
+    def test_device_has_no_instance_dict(self):
+        """Test Bloc9 devices use slots instead of a per-instance dict."""
+        device = Bloc9Device(device_id=3, can_bus=Mock())
+
+        assert not hasattr(device, "__dict__")
+
+    def test_identity_strings_are_built_once(self):
+        """Test route slug and state key are reused across reads."""
+        device = Bloc9Device(device_id=3, segment_id=2, can_bus=Mock())
+
+        assert device.route_slug == "3_2"
+        assert device.state_key == "bloc9_3_2"
+        assert device.state_key is device.state_key
+
     def test_same_bus_id_isolated_by_segment_id(self):
         mock_bus = Mock()
 
@@ -378,6 +409,16 @@ class TestMessageRouting:
         assert device_segment_2.lights[0].get_state()["state"] is True
         assert device_segment_2.lights[0].get_state()["brightness"] == 100
 
+    def test_duplicate_devices_are_rejected(self):
+        """Test the system refuses two devices with the same type and address."""
+        from scheiber.system import ScheiberSystem
+
+        mock_bus = Mock()
+        devices = [Bloc9Device(device_id=7, can_bus=mock_bus) for _ in range(2)]
+
+        with pytest.raises(ValueError, match="Duplicate device: bloc9 bus_id=7"):
+            ScheiberSystem(can_bus=mock_bus, devices=devices)
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
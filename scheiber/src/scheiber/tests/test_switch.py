@@ -2,6 +2,7 @@
 
 from unittest.mock import Mock, call
 
+import can
 import pytest
 
 from scheiber.switch import Switch
@@ -115,6 +116,25 @@ class TestSwitch:
         # Should NOT send CAN command (only update internal state)
         send_command_mock.assert_not_called()
 
+    def test_repeated_can_state_is_silent(self, mock_logger):
+        """Test that a heartbeat repeating the current state logs nothing."""
+        switch = Switch(
+            device_id=3,
+            switch_nr=0,
+            name="Test",
+            entity_id="test",
+            send_command_func=Mock(),
+            logger=mock_logger,
+        )
+        observer = Mock()
+        switch.subscribe(observer)
+
+        switch.update_state(False)
+
+        observer.assert_not_called()
+        mock_logger.debug.assert_not_called()
+        mock_logger.info.assert_not_called()
+
     def test_set_sends_command_without_brightness(self, mock_scheiber_can_bus):
         """Test that set() sends CAN command with only switch_nr and state."""
         send_command_mock = Mock()
@@ -135,6 +155,22 @@ class TestSwitch:
         switch.set(False)
         send_command_mock.assert_called_once_with(2, False)
 
+    def test_matched_message_reads_own_half_of_frame(self):
+        """Test even and odd outputs decode their own bytes of a change frame."""
+        msg = can.Message(
+            arbitration_id=0x02180698,
+            data=bytes([0, 0, 0, 0x01, 0, 0, 0, 0x00]),
+            is_extended_id=True,
+        )
+        lower = Switch(3, 2, "S3", "s3", Mock())
+        upper = Switch(3, 3, "S4", "s4", Mock())
+
+        lower.process_matching_message(msg)
+        upper.process_matching_message(msg)
+
+        assert lower.get_state() is True
+        assert upper.get_state() is False
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,112 @@
+"""
+Test ScheiberSystem state persistence.
+
+State is saved periodically while dirty; saves that would write the same
+content again are skipped.
+"""
+
+import json
+import time
+from unittest.mock import Mock
+
+import can
+
+from scheiber.bloc9 import Bloc9Device
+from scheiber.system import ScheiberSystem
+
+
+def make_system(tmp_path):
+    mock_bus = Mock()
+    device = Bloc9Device(
+        device_id=7,
+        can_bus=mock_bus,
+        lights_config={"s1": {"name": "Salon", "entity_id": "salon"}},
+    )
+    state_file = tmp_path / "state.json"
+    return ScheiberSystem(mock_bus, [device], state_file=str(state_file)), state_file
+
+
+class TestStatePersistence:
+    """Test state file writes."""
+
+    def test_save_writes_device_state(self, tmp_path):
+        system, state_file = make_system(tmp_path)
+
+        system._mark_state_dirty()
+        system._save_state()
+
+        state = json.loads(state_file.read_text())
+        assert state["bloc9_7"]["salon"]["brightness"] == 0
+        assert system._state_dirty is False
+
+    def test_save_replaces_file_with_compact_json(self, tmp_path):
+        system, state_file = make_system(tmp_path)
+
+        system._save_state()
+
+        assert "\n" not in state_file.read_text()
+        assert not state_file.with_suffix(".tmp").exists()
+
+    def test_unchanged_state_is_not_rewritten(self, tmp_path):
+        system, state_file = make_system(tmp_path)
+        system._save_state()
+        state_file.write_text("sentinel")
+
+        # A heartbeat marks the state dirty without changing it
+        system._mark_state_dirty()
+        system._save_state()
+
+        assert state_file.read_text() == "sentinel"
+
+    def test_changed_state_is_rewritten(self, tmp_path):
+        system, state_file = make_system(tmp_path)
+        system._save_state()
+
+        system.devices[0].lights[0]._brightness = 120
+        system._mark_state_dirty()
+        system._save_state()
+
+        state = json.loads(state_file.read_text())
+        assert state["bloc9_7"]["salon"]["brightness"] == 120
+
+    def test_state_directory_is_created_once(self, tmp_path):
+        mock_bus = Mock()
+        state_file = tmp_path / "data" / "state.json"
+        system = ScheiberSystem(mock_bus, [], state_file=str(state_file))
+
+        system._save_state()
+        assert state_file.exists()
+        assert system._state_dir_ready is True
+
+    def test_missing_state_file_loads_nothing(self, tmp_path):
+        system, state_file = make_system(tmp_path)
+
+        system._load_state()  # must not raise
+
+        assert not state_file.exists()
+
+    def test_matched_message_marks_state_dirty(self, tmp_path):
+        system, _ = make_system(tmp_path)
+        heartbeat = can.Message(
+            arbitration_id=0x000006B8, data=bytes(8), is_extended_id=True
+        )
+
+        system._on_can_message(heartbeat)
+
+        assert system._state_dirty is True
+
+    def test_saver_thread_saves_while_running(self, tmp_path):
+        system, state_file = make_system(tmp_path)
+        system._state_interval = 0.01
+        system.start()
+        try:
+            system._mark_state_dirty()
+            for _ in range(200):
+                if state_file.exists():
+                    break
+                time.sleep(0.01)
+            assert state_file.exists()
+        finally:
+            system.stop()
+
+        assert system._state_thread is None
@@ -7,13 +7,34 @@ Designed for DimmableLight objects using proper object-oriented approach.
 import logging
 import threading
 import time
-from typing import TYPE_CHECKING, Callable, Optional
+from typing import TYPE_CHECKING, Callable, List, Optional, Sequence
 
 if TYPE_CHECKING:
     from scheiber.light import DimmableLight
 
 # Import easing functions from easing module
-from .easing import get_easing_function
+from .easing import get_easing_curve
+
+
+def compute_fade_steps(
+    start_brightness: int, end_brightness: int, curve: Sequence[float]
+) -> List[int]:
+    """
+    Compute the brightness value for every step of a transition.
+
+    Args:
+        start_brightness: Starting brightness (0-255)
+        end_brightness: Target brightness (0-255)
+        curve: Eased progress values (0.0 to 1.0), one per step
+
+    Returns:
+        Brightness values clamped to 0-255, one per step
+    """
+    delta = end_brightness - start_brightness
+    return [
+        max(0, min(255, int(round(start_brightness + delta * eased_t))))
+        for eased_t in curve
+    ]
 
 
 class TransitionController:
@@ -63,34 +84,25 @@ class TransitionController:
         def run_transition():
             try:
                 steps = max(1, int(duration / self.step_delay))
-                easing_func = get_easing_function(easing_name)
+                levels = compute_fade_steps(
+                    start_brightness,
+                    end_brightness,
+                    get_easing_curve(easing_name, steps),
+                )
                 transition_start = time.perf_counter()
 
-                for step in range(steps + 1):
+                for step, brightness_val in enumerate(levels):
                     if self.stop_event.is_set():
                         self.logger.info(
-                            f"Transition for {self.light.name} cancelled at step {step}/{steps}"
+                            "Transition for %s cancelled at step %d/%d",
+                            self.light.name,
+                            step,
+                            steps,
                         )
                         return
 
-                    # Calculate progress (0.0 to 1.0)
-                    t = step / steps
-
-                    # Apply easing function
-                    eased_t = easing_func(t)
-
-                    # Calculate brightness value
-                    value = int(
-                        round(
-                            start_brightness
-                            + (end_brightness - start_brightness) * eased_t
-                        )
-                    )
-
                     # Update brightness without triggering observers
                     # (observers are notified at the end)
-                    brightness_val = max(0, min(255, value))
-
                     self.light._set_brightness(brightness_val, notify=False)
 
                     if step < steps:
@@ -107,7 +119,10 @@ class TransitionController:
                 )
 
                 self.logger.info(
-                    f"Transition for {self.light.name} completed: {start_brightness} -> {end_brightness}"
+                    "Transition for %s completed: %s -> %s",
+                    self.light.name,
+                    start_brightness,
+                    end_brightness,
                 )
             except Exception as e:
                 self.logger.error(
@@ -177,7 +192,7 @@ class FlashController:
             try:
                 # Phase 1: Flash ON at full brightness
                 self.light._set_brightness(255, notify=True)
-                self.logger.debug(f"Flash {self.light.name}: ON @ 255")
+                self.logger.debug("Flash %s: ON @ 255", self.light.name)
 
                 # Wait for flash duration with cancellation checks
                 elapsed = 0.0
@@ -185,7 +200,9 @@ class FlashController:
                 while elapsed < duration:
                     if self.stop_event.is_set():
                         self.logger.warning(
-                            f"Flash interrupted for {self.light.name} after {elapsed:.1f}s"
+                            "Flash interrupted for %s after %.1fs",
+                            self.light.name,
+                            elapsed,
                         )
                         return
 
@@ -196,20 +213,23 @@ class FlashController:
                 # Phase 2: Restore to previous state
                 if self.stop_event.is_set():
                     self.logger.warning(
-                        f"Flash interrupted for {self.light.name} before restore"
+                        "Flash interrupted for %s before restore", self.light.name
                     )
                     return
 
                 self.light._set_brightness(previous_brightness, notify=True)
                 self.logger.debug(
-                    f"Flash {self.light.name}: restored to state={previous_state}, brightness={previous_brightness}"
+                    "Flash %s: restored to state=%s, brightness=%s",
+                    self.light.name,
+                    previous_state,
+                    previous_brightness,
                 )
 
                 # Invoke completion callback
                 if on_complete:
                     on_complete()
 
-                self.logger.info(f"Completed flash for {self.light.name}")
+                self.logger.info("Completed flash for %s", self.light.name)
 
             except Exception as e:
                 self.logger.error(
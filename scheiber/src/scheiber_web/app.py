@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import logging
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 
 from flask import Flask, abort, jsonify, render_template, request
 
@@ -472,6 +472,15 @@ def create_app(
         def route_slug(bus_id: int, segment_id: int = 0) -> str:
             return f"{bus_id}" if segment_id == 0 else f"{bus_id}_{segment_id}"
 
+        # Index Bloc9 devices by (bus_id, segment_id) once instead of scanning
+        # the device list for every selected output
+        bloc9_devices: Dict[Tuple[int, int], Dict[str, Any]] = {}
+        for entry in devices:
+            if entry.get("type") == "bloc9":
+                bloc9_devices.setdefault(
+                    (int(entry.get("bus_id")), int(entry.get("segment_id", 0))), entry
+                )
+
         for output in selected_outputs:
             try:
                 bus_id = int(output["bus_id"])
@@ -487,16 +496,7 @@ def create_app(
                     400,
                 )
 
-            device = next(
-                (
-                    entry
-                    for entry in devices
-                    if entry.get("type") == "bloc9"
-                    and int(entry.get("bus_id")) == bus_id
-                    and int(entry.get("segment_id", 0)) == segment_id
-                ),
-                None,
-            )
+            device = bloc9_devices.get((bus_id, segment_id))
             if device is None:
                 device = {
                     "type": "bloc9",
@@ -507,6 +507,7 @@ def create_app(
                     "outputs": {},
                 }
                 devices.append(device)
+                bloc9_devices[(bus_id, segment_id)] = device
 
             name_override = str(
                 device_names.get(route_slug(bus_id, segment_id))
@@ -19,6 +19,12 @@ from scheiber.protocol import classify_message_family
 MAX_HISTORY = 30
 BLOC9_COMMAND_PREFIX = 0x02360600
 
+# Per byte value: its 8-bit string and the positions of its set bits
+_BYTE_BITS = tuple(f"{value:08b}" for value in range(256))
+_SET_BIT_POSITIONS = tuple(
+    tuple(bit for bit in range(8) if (value >> bit) & 1) for value in range(256)
+)
+
 
 def _compute_bit_diff(
     prev: Optional[bytes], curr: Optional[bytes]
@@ -32,20 +38,17 @@ def _compute_bit_diff(
     for i in range(max_len):
         prev_byte = prev[i] if i < len(prev) else 0
         curr_byte = curr[i] if i < len(curr) else 0
-        changed = prev_byte != curr_byte
-        changed_positions = []
-        for bit in range(8):
-            if ((prev_byte >> bit) & 1) != ((curr_byte >> bit) & 1):
-                changed_positions.append(bit)
         result.append(
             {
                 "byte_index": i,
                 "prev_byte": prev_byte,
                 "curr_byte": curr_byte,
-                "changed": changed,
-                "changed_bit_positions": changed_positions,
-                "prev_bits": f"{prev_byte:08b}",
-                "curr_bits": f"{curr_byte:08b}",
+                "changed": prev_byte != curr_byte,
+                "changed_bit_positions": list(
+                    _SET_BIT_POSITIONS[prev_byte ^ curr_byte]
+                ),
+                "prev_bits": _BYTE_BITS[prev_byte],
+                "curr_bits": _BYTE_BITS[curr_byte],
             }
         )
     return result
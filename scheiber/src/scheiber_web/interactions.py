@@ -36,8 +36,9 @@ import os
 import re
 import threading
 import time
+from collections import deque
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import can
 
@@ -97,10 +98,12 @@ STEP_SEQUENCES: Dict[int, List[Dict[str, str]]] = {
 AIR_SWITCH_FAMILY_PREFIX = 0x04000000
 AIR_SWITCH_FAMILY_MASK = 0xFF000000
 
+_NON_SLUG_CHARS_RE = re.compile(r"[^a-z0-9]+")
+
 
 def _slugify_entity_id(value: str) -> str:
     """Slugify free-text into an entity-id-safe string (lowercase, underscores)."""
-    slug = re.sub(r"[^a-z0-9]+", "_", str(value or "").strip().lower())
+    slug = _NON_SLUG_CHARS_RE.sub("_", str(value or "").strip().lower())
     return slug.strip("_")
 
 
@@ -117,6 +120,8 @@ class InteractionDiscoveryService:
         self._lock = threading.RLock()
         self._subscribed = False
         self._session: Optional[Dict[str, Any]] = None
+        # (mtime, size, limit) of the log file -> summaries read from it
+        self._recent_cache: Optional[Tuple[Tuple[int, int, int], List]] = None
 
     def start(self, location: str, button_count: Any) -> Dict[str, Any]:
         if not self.runtime_controller.has_live_runtime():
@@ -217,36 +222,54 @@ class InteractionDiscoveryService:
             }
 
     def recent_sessions(self, limit: int = 5) -> List[Dict[str, Any]]:
-        """Return summaries of the most recently saved sessions, if any."""
-        if not self.log_file_path or not os.path.exists(self.log_file_path):
+        """
+        Return summaries of the most recently saved sessions, if any.
+
+        The status endpoints ask for these on every poll, so the log is only
+        re-read when it has changed since the last call.
+        """
+        if not self.log_file_path:
+            return []
+        try:
+            stat = os.stat(self.log_file_path)
+        except OSError:
             return []
 
+        cache_key = (stat.st_mtime_ns, stat.st_size, limit)
+        cached = self._recent_cache
+        if cached is not None and cached[0] == cache_key:
+            return list(cached[1])
+
         try:
             with open(self.log_file_path, "r", encoding="utf-8") as handle:
-                lines = [line for line in handle if line.strip()]
+                lines = deque((line for line in handle if line.strip()), limit)
         except OSError as exc:
             logger.error(f"Failed to read interactions log: {exc}")
             return []
 
         summaries = []
-        for line in lines[-limit:]:
+        for line in lines:
             try:
                 record = json.loads(line)
             except json.JSONDecodeError:
                 continue
-            steps = record.get("steps", [])
+            # Records written before totals were stored are counted here
+            if "total_events" in record:
+                total_events = record["total_events"]
+                total_reactions = record.get("total_reactions", 0)
+            else:
+                total_events, total_reactions = _step_totals(record.get("steps", []))
             summaries.append(
                 {
                     "saved_at": record.get("saved_at"),
                     "location": record.get("location"),
                     "button_count": record.get("button_count"),
-                    "total_events": sum(len(step.get("events", [])) for step in steps),
-                    "total_reactions": sum(
-                        len(step.get("reactions", [])) for step in steps
-                    ),
+                    "total_events": total_events,
+                    "total_reactions": total_reactions,
                 }
             )
-        return summaries
+        self._recent_cache = (cache_key, summaries)
+        return list(summaries)
 
     def _require_active_session(self) -> Dict[str, Any]:
         if self._session is None:
@@ -314,7 +337,7 @@ class InteractionDiscoveryService:
                     {
                         "timestamp": timestamp,
                         "arbitration_id": f"0x{msg.arbitration_id:08X}",
-                        "data_hex": bytes(msg.data).hex().upper(),
+                        "data_hex": msg.data.hex().upper(),
                     }
                 )
 
@@ -396,11 +419,14 @@ class InteractionDiscoveryService:
             session["saved_path"] = None
             return
 
+        total_events, total_reactions = _step_totals(session["steps"])
         record = {
             "saved_at": time.time(),
             "location": session["location"],
             "button_count": session["button_count"],
             "started_at": session["started_at"],
+            "total_events": total_events,
+            "total_reactions": total_reactions,
             "steps": [
                 {
                     "key": step["key"],
@@ -446,3 +472,12 @@ def _yaml_quote(value: str) -> str:
     """Render a double-quoted YAML scalar, escaping backslashes and quotes."""
     escaped = str(value or "").replace("\\", "\\\\").replace('"', '\\"')
     return f'"{escaped}"'
+
+
+def _step_totals(steps: List[Dict[str, Any]]) -> Tuple[int, int]:
+    """Return (events, reactions) recorded across all steps of a session."""
+    total_events = total_reactions = 0
+    for step in steps:
+        total_events += len(step.get("events", ()))
+        total_reactions += len(step.get("reactions", ()))
+    return total_events, total_reactions
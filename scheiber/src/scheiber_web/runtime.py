@@ -12,6 +12,7 @@ from typing import Callable, List, Optional
 import can
 from can_mqtt_bridge import MQTTBridge
 
+from scheiber.bloc9 import OFF_COMMANDS, ON_COMMANDS
 from scheiber.discovery import build_bloc9_address_byte
 
 
@@ -160,17 +161,13 @@ class BridgeRuntimeController:
 
             can_id = 0x02360600 | build_bloc9_address_byte(bus_id, segment_id)
 
+            # Full OFF/ON payloads are shared with Bloc9Device, prebuilt once
             if not on or (brightness is not None and brightness <= 2):
-                mode = 0x00
-                brightness_byte = 0x00
+                data = OFF_COMMANDS[switch_nr]
             elif brightness is None or brightness >= 253:
-                mode = 0x01
-                brightness_byte = 0x00
+                data = ON_COMMANDS[switch_nr]
             else:
-                mode = 0x11
-                brightness_byte = brightness
-
-            data = bytes([switch_nr, mode, 0x00, brightness_byte])
+                data = bytes((switch_nr, 0x11, 0x00, brightness))
             self._bridge.system.can_bus.send_message(can_id, data)
             return can_id
 
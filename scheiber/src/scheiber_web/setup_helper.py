@@ -93,8 +93,10 @@ class SetupHelperService:
             return self.snapshot()
 
     def snapshot(self) -> Dict[str, Any]:
+        # One clock reading per snapshot keeps phase and countdown consistent
+        now = time.time()
         with self._lock:
-            self._advance_run_if_needed()
+            self._advance_run_if_needed(now)
             if self._session is None:
                 return self._empty_snapshot()
 
@@ -115,15 +117,16 @@ class SetupHelperService:
             }
 
             if active_run is not None:
-                payload["phase"] = self._phase_for_run(active_run)
-                payload["instruction"] = self._instruction_for_run(active_run)
+                phase = self._phase_for_run(active_run, now)
+                payload["phase"] = phase
+                payload["instruction"] = self._instruction_for_phase(phase)
                 payload["active_run"] = {
                     "action": active_run["action"],
                     "started_at": active_run["started_at"],
                     "press_at": active_run["press_at"],
                     "release_at": active_run["release_at"],
                     "capture_end_at": active_run["capture_end_at"],
-                    "countdown": self._countdown_for_run(active_run),
+                    "countdown": self._countdown_for_run(active_run, phase, now),
                     "captured_message_count": len(active_run["captured_messages"]),
                 }
 
@@ -176,7 +179,7 @@ class SetupHelperService:
                 entry["outputs"] = observation.get("outputs")
             active_run["captured_messages"].append(entry)
 
-    def _advance_run_if_needed(self) -> None:
+    def _advance_run_if_needed(self, now: float) -> None:
         if self._session is None:
             return
 
@@ -184,7 +187,7 @@ class SetupHelperService:
         if active_run is None:
             return
 
-        if time.time() < active_run["capture_end_at"]:
+        if now < active_run["capture_end_at"]:
             return
 
         completed = self._analyze_run(active_run)
@@ -274,13 +277,14 @@ class SetupHelperService:
                 evidence["pulse_hits"] += 1
 
             output_meta = current or baseline or {}
+            route_slug, _, output_name = ref.partition(":")
             changed_outputs.append(
                 {
                     "output_ref": ref,
                     "bus_id": output_meta.get("bus_id"),
                     "segment_id": output_meta.get("segment_id"),
-                    "route_slug": output_meta.get("route_slug", ref.split(":")[0]),
-                    "output_name": output_meta.get("output_name", ref.split(":")[1]),
+                    "route_slug": output_meta.get("route_slug", route_slug),
+                    "output_name": output_meta.get("output_name", output_name),
                     "baseline": baseline_sample,
                     "current": current_sample,
                     "message_count": len(series),
@@ -394,8 +398,7 @@ class SetupHelperService:
             )
         return recommendations
 
-    def _phase_for_run(self, run: Dict[str, Any]) -> str:
-        now = time.time()
+    def _phase_for_run(self, run: Dict[str, Any], now: float) -> str:
         if now < run["press_at"]:
             return "countdown"
         if run["action"] == "hold" and now < run["release_at"]:
@@ -404,8 +407,7 @@ class SetupHelperService:
             return "release" if run["action"] == "hold" else "capture"
         return "analysis"
 
-    def _instruction_for_run(self, run: Dict[str, Any]) -> str:
-        phase = self._phase_for_run(run)
+    def _instruction_for_phase(self, phase: str) -> str:
         if phase == "countdown":
             return "Get ready. Follow the countdown and press the button at NOW."
         if phase == "holding":
@@ -416,12 +418,13 @@ class SetupHelperService:
             return "Press and release the button now."
         return "Analyzing captured traffic."
 
-    def _countdown_for_run(self, run: Dict[str, Any]) -> Optional[int]:
-        phase = self._phase_for_run(run)
+    def _countdown_for_run(
+        self, run: Dict[str, Any], phase: str, now: float
+    ) -> Optional[int]:
         if phase == "countdown":
-            return max(0, int(math.ceil(run["press_at"] - time.time())))
+            return max(0, int(math.ceil(run["press_at"] - now)))
         if phase == "holding":
-            return max(0, int(math.ceil(run["release_at"] - time.time())))
+            return max(0, int(math.ceil(run["release_at"] - now)))
         return None
 
     def _output_ref(self, bus_id: int, segment_id: int, output_name: str) -> str:
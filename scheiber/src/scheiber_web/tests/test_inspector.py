@@ -111,3 +111,20 @@ def test_snapshot_marks_source_selector_ac_measurements():
 
     assert entry["known_kind"] == "source_selector_ac_measurement"
     assert entry["known_messages"] == ["SourceSelector #3_2 AC measurement"]
+
+
+def test_detail_reports_changed_bits_between_frames():
+    inspector = CanInspector(FakeRuntimeController())
+    inspector.start()
+
+    for data in (bytes([0b0000_0101, 0xFF]), bytes([0b1000_0100, 0xFF])):
+        inspector._handle_message(
+            can.Message(arbitration_id=0x12345678, data=data, is_extended_id=True)
+        )
+
+    first, second = inspector.detail(0x12345678)["bit_diff"]
+    assert first["changed_bit_positions"] == [0, 7]
+    assert first["prev_bits"] == "00000101"
+    assert first["curr_bits"] == "10000100"
+    assert second["changed"] is False
+    assert second["changed_bit_positions"] == []
@@ -236,6 +236,7 @@ def test_finish_writes_a_jsonl_record_and_recent_sessions_reads_it_back(tmp_path
     assert len(record["steps"]) == 2
     assert len(record["steps"][0]["events"]) == 1
     assert len(record["steps"][1]["events"]) == 1
+    assert record["total_events"] == 2
 
     recent = service.recent_sessions()
     assert len(recent) == 1
@@ -243,6 +244,28 @@ def test_finish_writes_a_jsonl_record_and_recent_sessions_reads_it_back(tmp_path
     assert recent[0]["total_events"] == 2
 
 
+def test_recent_sessions_counts_records_saved_without_totals(tmp_path):
+    log_path = tmp_path / "interactions_log.jsonl"
+    record = {
+        "saved_at": 1.0,
+        "location": "galley",
+        "button_count": 2,
+        "steps": [
+            {"events": [{}, {}], "reactions": [{}]},
+            {"events": [{}], "reactions": []},
+        ],
+    }
+    log_path.write_text(json.dumps(record) + "\n", encoding="utf-8")
+    service = InteractionDiscoveryService(
+        FakeRuntimeController(), log_file_path=str(log_path)
+    )
+
+    recent = service.recent_sessions()
+
+    assert recent[0]["total_events"] == 3
+    assert recent[0]["total_reactions"] == 1
+
+
 def test_finish_without_log_file_configured_does_not_raise(tmp_path):
     service = InteractionDiscoveryService(FakeRuntimeController())
     service.start("crew cabin", 2)
@@ -272,6 +295,35 @@ def test_finish_appends_multiple_sessions(tmp_path):
     assert [entry["location"] for entry in recent] == ["bow salon door", "crew cabin"]
 
 
+def test_recent_sessions_rereads_log_only_after_it_changes(tmp_path, monkeypatch):
+    log_path = tmp_path / "interactions_log.jsonl"
+    service = InteractionDiscoveryService(
+        FakeRuntimeController(), log_file_path=str(log_path)
+    )
+    service.start("bow salon door", 2)
+    service.finish()
+    assert len(service.recent_sessions()) == 1
+
+    opened = []
+    real_open = open
+
+    def tracking_open(*args, **kwargs):
+        opened.append(args)
+        return real_open(*args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", tracking_open)
+
+    assert len(service.recent_sessions()) == 1
+    assert opened == []
+
+    service.start("crew cabin", 4)
+    service.finish()
+    assert [entry["location"] for entry in service.recent_sessions()] == [
+        "bow salon door",
+        "crew cabin",
+    ]
+
+
 def test_stop_marks_running_session_as_stopped_without_saving(tmp_path):
     log_path = tmp_path / "interactions_log.jsonl"
     service = InteractionDiscoveryService(
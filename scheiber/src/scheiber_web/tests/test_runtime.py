@@ -45,6 +45,18 @@ def test_send_bloc9_command_uses_segment_id():
     ]
 
 
+def test_send_bloc9_command_encodes_off_and_dimmed_payloads():
+    controller = make_controller()
+
+    controller.send_bloc9_command(bus_id=3, switch_nr=4, on=False)
+    controller.send_bloc9_command(bus_id=3, switch_nr=4, on=True, brightness=128)
+
+    assert controller._bridge.system.can_bus.messages == [
+        (0x02360698, bytes([0x04, 0x00, 0x00, 0x00])),
+        (0x02360698, bytes([0x04, 0x11, 0x00, 0x80])),
+    ]
+
+
 def test_send_bloc9_command_rejects_read_only_runtime():
     controller = make_controller(read_only=True)
 
@@ -22,7 +22,7 @@ from collections import defaultdict
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 import can
-from can_decoder import find_device_and_matcher
+from can_decoder import extract_property_value, find_device_and_matcher
 
 
 class Message0x02040588Analyzer:
@@ -288,8 +288,6 @@ class Message0x02040588Analyzer:
 
                 if device_key == "bloc9" and matcher:
                     # Decode the message
-                    from can_decoder import extract_property_value
-
                     properties = {}
                     for prop_name, prop_config in matcher.get("properties", {}).items():
                         if prop_config:
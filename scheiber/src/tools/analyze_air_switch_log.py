@@ -31,6 +31,7 @@ add-on's default data directory).
 
 from __future__ import annotations
 
+import datetime
 import json
 import sys
 from collections import Counter, defaultdict
@@ -55,8 +56,6 @@ def load_sessions(path: Path) -> List[Dict[str, Any]]:
 def format_timestamp(epoch: float | None) -> str:
     if not epoch:
         return "unknown time"
-    import datetime
-
     return datetime.datetime.fromtimestamp(epoch).strftime("%Y-%m-%d %H:%M:%S")
 
 